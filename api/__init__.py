@@ -0,0 +1,19 @@
+import importlib
+
+# Resolved on first access: the worker proxy (api.workers) does not run an
+# agent and must not import one.
+_EXPORTS = {
+    "create_app": "api.app",
+}
+
+__all__ = [
+    "create_app"
+]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'api' has no attribute {name!r}")
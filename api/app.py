@@ -0,0 +1,168 @@
+import json
+import uuid
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Optional, Set
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from config.settings import settings
+from core.agent_manager import Agent_Manager
+from core.metrics import metrics
+
+
+def _sse(event: Dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+
+def _error(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse({"status": "error", "message": message}, status_code=status_code)
+
+
+def create_app(manager: Optional[Agent_Manager] = None) -> Starlette:
+    """
+    Headless HTTP API for the agent. All requests share one event loop and one
+    Agent_Manager, so the checkpointer, caches, limiter and MCP sessions are
+    shared across users.
+
+        POST /threads                            -> {"thread_id"}
+        POST /threads/{thread_id}/messages       {"message"}    -> SSE stream
+        POST /threads/{thread_id}/approvals      {"approvals": {tool_call_id: bool}} | {"approve": bool} -> SSE stream
+        POST /threads/{thread_id}/semantic-false-hit  -> flags a cached first answer as wrong
+        GET  /threads/{thread_id}/messages       -> history + pending approval
+        GET  /health
+        GET  /metrics                            (METRICS_ENABLED) Prometheus text format
+    """
+    # One run at a time per thread; a second request for a busy thread gets 409.
+    # A handler claims the thread synchronously (no await between the check and
+    # the add) and the stream releases it when it ends, so idle threads leave no state.
+    busy_threads: Set[str] = set()
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        app.state.manager = manager or Agent_Manager()
+        await app.state.manager.initialize()
+        try:
+            yield
+        finally:
+            await app.state.manager.close()
+            await metrics.close()
+
+    def _claim(thread_id: str) -> bool:
+        if thread_id in busy_threads:
+            return False
+        busy_threads.add(thread_id)
+        return True
+
+    async def _stream(thread_id: str, events: AsyncIterator[Dict]) -> AsyncIterator[str]:
+        # The thread was claimed by the handler that created this stream
+        try:
+            try:
+                async for event in events:
+                    yield _sse(event)
+            except Exception as e:
+                yield _sse({"type": "error", "message": str(e)})
+            yield _sse({"type": "done", "thread_id": thread_id})
+        finally:
+            busy_threads.discard(thread_id)
+
+    class _ThreadStream(StreamingResponse):
+        """Also releases the thread when the client is gone before the stream starts."""
+
+        def __init__(self, thread_id: str, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.thread_id = thread_id
+
+        async def __call__(self, scope, receive, send):
+            try:
+                await super().__call__(scope, receive, send)
+            finally:
+                busy_threads.discard(self.thread_id)
+
+    def _event_stream(thread_id: str, events: AsyncIterator[Dict]) -> StreamingResponse:
+        return _ThreadStream(
+            thread_id,
+            _stream(thread_id, events),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+
+    async def _json_body(request: Request) -> Optional[Dict]:
+        try:
+            body = await request.json()
+        except ValueError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    async def health(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "agent_ready": request.app.state.manager.is_initialised_agent})
+
+    async def create_thread(request: Request) -> JSONResponse:
+        return JSONResponse({"thread_id": str(uuid.uuid4())}, status_code=201)
+
+    async def send_message(request: Request):
+        thread_id = request.path_params["thread_id"]
+        body = await _json_body(request)
+        message = (body or {}).get("message")
+        if not isinstance(message, str) or not message.strip():
+            return _error(400, "Body must be JSON with a non-empty 'message'.")
+        if not _claim(thread_id):
+            return _error(409, f"Thread {thread_id} is already running.")
+
+        events = request.app.state.manager.stream_turn(message.strip(), thread_id)
+        return _event_stream(thread_id, events)
+
+    async def answer_approval(request: Request):
+        thread_id = request.path_params["thread_id"]
+        body = await _json_body(request) or {}
+        if isinstance(body.get("approvals"), dict):
+            approvals = {str(k): bool(v) for k, v in body["approvals"].items()}
+        elif isinstance(body.get("approve"), bool):
+            approvals = body["approve"]
+        else:
+            return _error(400, "Body must be JSON with 'approvals' ({tool_call_id: bool}) or 'approve' (bool).")
+        if not _claim(thread_id):
+            return _error(409, f"Thread {thread_id} is already running.")
+
+        # Checked while holding the thread, so a concurrent answer cannot resume it twice
+        manager = request.app.state.manager
+        try:
+            history = await manager.get_history(thread_id)
+        except BaseException:
+            busy_threads.discard(thread_id)
+            raise
+        if history["pending_approval"] is None:
+            busy_threads.discard(thread_id)
+            return _error(409, f"Thread {thread_id} has no pending tool approval.")
+
+        return _event_stream(thread_id, manager.resume_turn(thread_id, approvals))
+
+    async def report_false_hit(request: Request) -> JSONResponse:
+        thread_id = request.path_params["thread_id"]
+        if not request.app.state.manager.report_semantic_false_hit(thread_id):
+            return _error(404, f"Thread {thread_id} has no semantic cache answer to report.")
+        return JSONResponse({"status": "success", "thread_id": thread_id})
+
+    async def get_history(request: Request) -> JSONResponse:
+        history = await request.app.state.manager.get_history(request.path_params["thread_id"])
+        return JSONResponse(history)
+
+    async def get_metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+    routes = [
+        Route("/health", health, methods=["GET"]),
+        Route("/threads", create_thread, methods=["POST"]),
+        Route("/threads/{thread_id}/messages", send_message, methods=["POST"]),
+        Route("/threads/{thread_id}/messages", get_history, methods=["GET"]),
+        Route("/threads/{thread_id}/approvals", answer_approval, methods=["POST"]),
+        Route("/threads/{thread_id}/semantic-false-hit", report_false_hit, methods=["POST"]),
+    ]
+    if settings.METRICS_ENABLED:
+        routes.append(Route("/metrics", get_metrics, methods=["GET"]))
+    return Starlette(routes=routes, lifespan=lifespan)
+
+
+app = create_app()
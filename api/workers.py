@@ -0,0 +1,194 @@
+import asyncio
+import hashlib
+import logging
+import os
+import subprocess
+import sys
+import uuid
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from starlette.applications import Starlette
+from starlette.background import BackgroundTask
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Hop-by-hop headers are never forwarded by a proxy
+_HOP_HEADERS = frozenset({
+    "connection", "keep-alive", "proxy-authenticate", "proxy-authorization",
+    "te", "trailers", "transfer-encoding", "upgrade", "host", "content-length",
+})
+
+
+def rendezvous_worker(thread_id: str, workers: List[str]) -> str:
+    """
+    Highest-random-weight hashing: a thread always maps to the same worker, and
+    when the worker count changes only the threads of added/removed workers move.
+    """
+    return max(
+        workers,
+        key=lambda worker: hashlib.blake2b(f"{worker}|{thread_id}".encode(), digest_size=8).digest()
+    )
+
+
+class WorkerPool:
+    """
+    Starts N single-process API workers (uvicorn api.app:app) on consecutive ports
+    and restarts any that exit. Workers share the SQLite checkpoint store; the
+    per-process LLM limits are split evenly so the pool as a whole stays under
+    LLM_RPM / LLM_TPM.
+    """
+
+    def __init__(self, count: int = None, host: str = None, base_port: int = None):
+        self.count = count or settings.API_WORKERS
+        self.host = host or settings.API_HOST
+        self.base_port = base_port or settings.API_PORT + 1
+        self.root = Path(__file__).resolve().parent.parent
+        self._processes: Dict[str, subprocess.Popen] = {}
+        self._supervisor: Optional[asyncio.Task] = None
+
+    @property
+    def workers(self) -> List[str]:
+        return [f"http://{self.host}:{self.base_port + i}" for i in range(self.count)]
+
+    def _environment(self, index: int) -> Dict[str, str]:
+        env = dict(os.environ)
+        # Every worker exposes its own /metrics listener
+        if settings.METRICS_PORT:
+            env["METRICS_PORT"] = str(settings.METRICS_PORT + 1 + index)
+        env["LLM_RPM"] = str(max(settings.LLM_RPM // self.count, 1)) if settings.LLM_RPM else "0"
+        env["LLM_TPM"] = str(max(settings.LLM_TPM // self.count, 1)) if settings.LLM_TPM else "0"
+        return env
+
+    def _spawn(self, index: int) -> subprocess.Popen:
+        return subprocess.Popen(
+            [
+                sys.executable, "-m", "uvicorn", "api.app:app",
+                "--host", self.host, "--port", str(self.base_port + index),
+            ],
+            cwd=self.root,
+            env=self._environment(index)
+        )
+
+    async def start(self, ready_timeout: float = 60.0):
+        for index, url in enumerate(self.workers):
+            self._processes[url] = self._spawn(index)
+        await self.wait_ready(ready_timeout)
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def wait_ready(self, timeout: float = 60.0, interval: float = 0.25):
+        """Polls every worker's /health until its agent is initialised (or the timeout)."""
+        waiting = set(self.workers)
+        deadline = asyncio.get_running_loop().time() + timeout
+        async with httpx.AsyncClient(timeout=interval * 4) as client:
+            while waiting and asyncio.get_running_loop().time() < deadline:
+                for url in list(waiting):
+                    try:
+                        response = await client.get(f"{url}/health")
+                        if response.json().get("agent_ready"):
+                            waiting.discard(url)
+                    except (httpx.HTTPError, ValueError):
+                        pass
+                if waiting:
+                    await asyncio.sleep(interval)
+        if waiting:
+            logger.warning("Workers not ready after %ss: %s", timeout, ", ".join(sorted(waiting)))
+
+    async def _supervise(self, interval: float = 2.0):
+        while True:
+            await asyncio.sleep(interval)
+            for index, url in enumerate(self.workers):
+                process = self._processes.get(url)
+                if process is not None and process.poll() is not None:
+                    logger.warning("Worker %s exited with %s, restarting", url, process.returncode)
+                    self._processes[url] = self._spawn(index)
+
+    def route(self, thread_id: str) -> str:
+        return rendezvous_worker(thread_id, self.workers)
+
+    async def stop(self, grace: float = 10.0):
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        for process in self._processes.values():
+            process.terminate()
+        for process in self._processes.values():
+            try:
+                await asyncio.to_thread(process.wait, grace)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        self._processes.clear()
+
+
+def create_proxy_app(pool: Optional[WorkerPool] = None) -> Starlette:
+    """
+    Front process for multi-worker mode: creates thread ids itself and forwards
+    every /threads/{thread_id}/... request (streams included) to the worker that
+    owns the thread, so its caches and pending interrupts stay in one process.
+    """
+    pool = pool or WorkerPool()
+    client: Optional[httpx.AsyncClient] = None
+
+    @asynccontextmanager
+    async def lifespan(app: Starlette):
+        nonlocal client
+        # Requests are only proxied once the workers answer /health
+        await pool.start()
+        client = httpx.AsyncClient(timeout=httpx.Timeout(settings.HTTP_TIMEOUT, read=None))
+        try:
+            yield
+        finally:
+            await client.aclose()
+            await pool.stop()
+
+    async def create_thread(request: Request) -> JSONResponse:
+        return JSONResponse({"thread_id": str(uuid.uuid4())}, status_code=201)
+
+    async def health(request: Request) -> JSONResponse:
+        workers = {}
+        for url in pool.workers:
+            try:
+                response = await client.get(f"{url}/health")
+                workers[url] = response.json()
+            except httpx.HTTPError as e:
+                workers[url] = {"status": "error", "message": str(e)}
+        ok = all(w.get("status") == "ok" for w in workers.values())
+        return JSONResponse({"status": "ok" if ok else "degraded", "workers": workers})
+
+    async def forward(request: Request):
+        worker = pool.route(request.path_params["thread_id"])
+        headers = {k: v for k, v in request.headers.items() if k.lower() not in _HOP_HEADERS}
+        upstream = client.build_request(
+            request.method,
+            f"{worker}{request.url.path}",
+            params=request.query_params,
+            headers=headers,
+            content=await request.body()
+        )
+        try:
+            response = await client.send(upstream, stream=True)
+        except httpx.HTTPError as e:
+            return JSONResponse(
+                {"status": "error", "message": f"Worker {worker} unavailable: {e}"}, status_code=503
+            )
+
+        return StreamingResponse(
+            response.aiter_raw(),
+            status_code=response.status_code,
+            headers={k: v for k, v in response.headers.items() if k.lower() not in _HOP_HEADERS},
+            background=BackgroundTask(response.aclose)
+        )
+
+    routes = [
+        Route("/health", health, methods=["GET"]),
+        Route("/threads", create_thread, methods=["POST"]),
+        Route("/threads/{thread_id}/{rest:path}", forward, methods=["GET", "POST"]),
+    ]
+    return Starlette(routes=routes, lifespan=lifespan)
@@ -0,0 +1,16 @@
+import argparse
+import uvicorn
+from config.settings import settings
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve the agent over HTTP")
+    parser.add_argument("--workers", type=int, default=settings.API_WORKERS,
+                        help="Worker processes; >1 starts a sticky-routing front proxy")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from api.workers import WorkerPool, create_proxy_app
+        proxy = create_proxy_app(WorkerPool(count=args.workers))
+        uvicorn.run(proxy, host=settings.API_HOST, port=settings.API_PORT)
+    else:
+        uvicorn.run("api.app:app", host=settings.API_HOST, port=settings.API_PORT)
@@ -8,6 +8,7 @@ from langchain_core.messages import AIMessage, ToolMessage, HumanMessage
 from langgraph.types import Command
 
 from core.agent_manager import Agent_Manager
+from core.tracing import tracer
 
 # ── Page config ────────────────────────────────────────────────────
 st.set_page_config(
@@ -55,8 +56,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-DANGEROUS_TOOLS = {"delete_repository", "create_repository"}
-
 # ══════════════════════════════════════════════════════════════════
 # ONE persistent event loop in a background thread
 # ══════════════════════════════════════════════════════════════════
@@ -284,72 +283,58 @@ def _parse_node(node: str, output: dict) -> list:
     return events
 
 
-async def _stream_response(thread_id: str, user_text: str, agent):
-    config = {"configurable": {"thread_id": thread_id}}
-    events = []
-
-    async for update in agent.astream(
-        {"messages": [("user", user_text)]}, config, stream_mode="updates"
-    ):
-        for node, output in update.items():
-            events += _parse_node(node, output)
-
-    state = await agent.aget_state(config)
-    if state.next and "tools" in state.next:
-        last = state.values["messages"][-1]
-        for tc in getattr(last, "tool_calls", []):
-            name, args, tid = tc["name"], tc["args"], tc["id"]
-            if name == "list_repositories" and args.get("limit", 0) > 10:
-                args["limit"] = 10
-            if name in DANGEROUS_TOOLS:
-                events.append({
-                    "type": "confirm_required",
-                    "tool_name": name,
-                    "tool_args": args,
-                    "tool_call_id": tid,
-                })
-                return events
-        async for update in agent.astream(
-            Command(resume=True), config, stream_mode="updates"
-        ):
+async def _run_graph(agent, config, graph_input, events):
+    """
+    Streams the graph until it finishes or pauses. Safe tools run straight
+    through; the tools node only interrupts for dangerous calls, which end the
+    run with a confirm_required event.
+    """
+    with tracer.span("turn", kind="turn", thread_id=config["configurable"]["thread_id"]):
+        async for update in agent.astream(graph_input, config, stream_mode="updates"):
             for node, output in update.items():
-                events += _parse_node(node, output)
-
+                if node == "__interrupt__":
+                    request = output[0].value
+                    events.append({
+                        "type": "confirm_required",
+                        "tool_calls": [
+                            {"tool_name": tc["name"], "tool_args": tc["args"], "tool_call_id": tc["id"]}
+                            for tc in request["tool_calls"]
+                        ],
+                    })
+                else:
+                    events += _parse_node(node, output)
     return events
 
 
-async def _resume_confirm(thread_id, allowed, tool_call_id, tool_name, agent):
+async def _stream_response(thread_id: str, user_text: str, manager):
     config = {"configurable": {"thread_id": thread_id}}
-    events = []
+    # First turns go through the semantic cache, like the CLI and the HTTP API
+    is_first_turn, cached_answer = await manager._semantic_lookup(user_text, config)
+    if cached_answer is not None:
+        return [{"type": "ai", "content": cached_answer, "cached": True}]
+
+    events = await _run_graph(manager.agent, config, {"messages": [("user", user_text)]}, [])
+    if is_first_turn:
+        await manager._semantic_store(user_text, config)
+    return events
 
-    if not allowed:
-        reject = ToolMessage(
-            tool_call_id=tool_call_id,
-            name=tool_name,
-            content=(
-                f"USER DENIED: The human user rejected the {tool_name} action. "
-                "Acknowledge this and stop."
-            ),
-        )
-        await agent.aupdate_state(config, {"messages": [reject]}, as_node="tools")
-        resume_input = None
-    else:
-        resume_input = Command(resume=True)
-
-    async for update in agent.astream(resume_input, config, stream_mode="updates"):
-        for node, output in update.items():
-            events += _parse_node(node, output)
 
-    return events
+async def _resume_confirm(thread_id, allowed, tool_calls, agent):
+    config = {"configurable": {"thread_id": thread_id}}
+    # Denied calls are answered with a "USER DENIED" ToolMessage by the tools node
+    approvals = {tc["tool_call_id"]: allowed for tc in tool_calls}
+    return await _run_graph(agent, config, Command(resume=approvals), [])
 
 
 def stream_response(thread_id, user_text):
-    agent = st.session_state.manager.agent
-    return run_async(_stream_response(thread_id, user_text, agent))
+    return run_async(_stream_response(thread_id, user_text, st.session_state.manager))
 
-def resume_confirm(thread_id, allowed, tool_call_id, tool_name):
+def report_false_hit(thread_id) -> bool:
+    return st.session_state.manager.report_semantic_false_hit(thread_id)
+
+def resume_confirm(thread_id, allowed, tool_calls):
     agent = st.session_state.manager.agent
-    return run_async(_resume_confirm(thread_id, allowed, tool_call_id, tool_name, agent))
+    return run_async(_resume_confirm(thread_id, allowed, tool_calls, agent))
 
 # ══════════════════════════════════════════════════════════════════
 # Render helpers
@@ -363,6 +348,17 @@ def render_event(event: dict):
     elif t == "ai":
         with st.chat_message("assistant", avatar="🤖"):
             st.markdown(event["content"])
+            # Answers served from the semantic cache can be flagged as wrong,
+            # which evicts the cached entry so the question is answered afresh next time
+            if event.get("cached"):
+                st.caption("⚡ Answered from the semantic cache")
+                if st.button("👎 Wrong answer", key=f"false_hit_{id(event)}"):
+                    report_false_hit(st.session_state["thread_id"])
+                    event["cached"] = False
+                    st.session_state["session_history"].append(
+                        {"type": "system", "content": "Thanks — the cached answer was removed."}
+                    )
+                    st.rerun()
     elif t == "tool_call":
         st.markdown(f"""
 <div class="tool-box">
@@ -434,40 +430,49 @@ for event in st.session_state["session_history"]:
     render_event(event)
 
 # ── Pending HITL confirm ───────────────────────────────────────────
+def apply_resume_events(events: list):
+    """Record resumed events; a later step may ask for another confirmation."""
+    st.session_state["pending_confirm"] = None
+    for e in events:
+        if e["type"] == "confirm_required":
+            st.session_state["pending_confirm"] = {"tool_calls": e["tool_calls"]}
+        else:
+            st.session_state["session_history"].append(e)
+
 if st.session_state["pending_confirm"]:
     pc = st.session_state["pending_confirm"]
-    st.markdown(f"""
-<div class="security-box">
-  <div class="sec-title">⚠ Security Check — Approval Required</div>
+    calls_html = "".join(
+        f"""
   <p style="color:#cdd9e5; margin: 8px 0">
     Agent wants to run
-    <code style="color:#f85149; font-size:14px">{pc['tool_name']}</code>
+    <code style="color:#f85149; font-size:14px">{tc['tool_name']}</code>
   </p>
-  <pre style="color:#8b949e; font-size:12px">{json.dumps(pc['tool_args'], indent=2)}</pre>
+  <pre style="color:#8b949e; font-size:12px">{json.dumps(tc['tool_args'], indent=2)}</pre>"""
+        for tc in pc["tool_calls"]
+    )
+    st.markdown(f"""
+<div class="security-box">
+  <div class="sec-title">⚠ Security Check — Approval Required</div>{calls_html}
 </div>""", unsafe_allow_html=True)
 
     col1, col2, _ = st.columns([1, 1, 5])
     with col1:
         if st.button("✅ Allow", type="primary", use_container_width=True):
             with st.spinner("Resuming agent…"):
-                events = resume_confirm(thread_id, True, pc["tool_call_id"], pc["tool_name"])
+                events = resume_confirm(thread_id, True, pc["tool_calls"])
             st.session_state["session_history"].append(
                 {"type": "system", "content": "✅ Action approved."}
             )
-            for e in events:
-                st.session_state["session_history"].append(e)
-            st.session_state["pending_confirm"] = None
+            apply_resume_events(events)
             st.rerun()
     with col2:
         if st.button("❌ Deny", use_container_width=True):
             with st.spinner("Informing agent…"):
-                events = resume_confirm(thread_id, False, pc["tool_call_id"], pc["tool_name"])
+                events = resume_confirm(thread_id, False, pc["tool_calls"])
             st.session_state["session_history"].append(
                 {"type": "system", "content": "❌ Action denied by user."}
             )
-            for e in events:
-                st.session_state["session_history"].append(e)
-            st.session_state["pending_confirm"] = None
+            apply_resume_events(events)
             st.rerun()
     st.stop()
 
@@ -504,10 +509,6 @@ if st.session_state.get("_pending_input"):
             st.session_state["thread_titles"][thread_id] = title
 
     if confirm_event:
-        st.session_state["pending_confirm"] = {
-            "tool_name": confirm_event["tool_name"],
-            "tool_args": confirm_event["tool_args"],
-            "tool_call_id": confirm_event["tool_call_id"],
-        }
+        st.session_state["pending_confirm"] = {"tool_calls": confirm_event["tool_calls"]}
 
     st.rerun()
\ No newline at end of file
@@ -0,0 +1,161 @@
+"""
+Runs many prompts through the agent without a human in the loop.
+
+    python batch.py prompts.jsonl results.jsonl --concurrency 8 --policy deny
+
+Each input line is {"id": ..., "prompt": "..."} (id defaults to the line number).
+Every prompt gets its own thread. Dangerous tool calls are approved or denied
+according to --policy. Results are appended to the output file as they finish:
+{"id", "thread_id", "status", "answer", "tool_calls", "approvals", "latency_s"}.
+With --resume, ids that already finished with status "ok" are skipped; failed
+ones are run again.
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Set
+
+from config.settings import settings
+from core.agent_manager import Agent_Manager
+from core.metrics import metrics
+
+
+def load_items(path: Path) -> List[Dict]:
+    items = []
+    with path.open(encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            prompt = record.get("prompt") or record.get("message")
+            if not prompt:
+                raise ValueError(f"{path}:{line_number} has no 'prompt'")
+            items.append({"id": str(record.get("id", line_number)), "prompt": prompt})
+    return items
+
+
+def completed_ids(path: Path) -> Set[str]:
+    """Ids with an "ok" result. Lines that do not parse (e.g. cut off by a crash) are skipped."""
+    if not path.exists():
+        return set()
+    done = set()
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict) and record.get("status") == "ok" and "id" in record:
+                done.add(str(record["id"]))
+    return done
+
+
+def _ends_mid_line(path: Path) -> bool:
+    if not path.exists() or path.stat().st_size == 0:
+        return False
+    with path.open("rb") as f:
+        f.seek(-1, 2)
+        return f.read(1) != b"\n"
+
+
+async def run_item(manager: Agent_Manager, item: Dict, run_id: str, approve: bool, timeout: float) -> Dict:
+    thread_id = f"batch-{run_id}-{item['id']}"
+    result = {"id": item["id"], "thread_id": thread_id, "status": "ok", "answer": None,
+              "tool_calls": [], "approvals": 0}
+    start = time.perf_counter()
+
+    async def drive():
+        events = manager.stream_turn(item["prompt"], thread_id)
+        while events is not None:
+            pending = None
+            async for event in events:
+                if event["type"] == "message":
+                    result["answer"] = event["content"]
+                elif event["type"] == "tool_call":
+                    result["tool_calls"].append(event["name"])
+                elif event["type"] == "approval_required":
+                    pending = event
+            # Policy answers every approval request; denied calls are reported to the model
+            events = None
+            if pending is not None:
+                result["approvals"] += len(pending["tool_calls"])
+                events = manager.resume_turn(thread_id, approve)
+
+    try:
+        await asyncio.wait_for(drive(), timeout=timeout or None)
+    except asyncio.TimeoutError:
+        result.update(status="error", error=f"timed out after {timeout}s")
+    except Exception as e:
+        result.update(status="error", error=str(e))
+
+    result["latency_s"] = round(time.perf_counter() - start, 3)
+    return result
+
+
+async def main(input_path: Path, output_path: Path, concurrency: int, approve: bool, timeout: float, resume: bool):
+    items = load_items(input_path)
+    if resume:
+        done = completed_ids(output_path)
+        items = [item for item in items if item["id"] not in done]
+
+    manager = Agent_Manager()
+    await manager.initialize()
+
+    queue: asyncio.Queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    run_id = uuid.uuid4().hex[:8]
+    latencies: List[float] = []
+    errors = 0
+    started = time.perf_counter()
+
+    truncated = resume and _ends_mid_line(output_path)
+    with output_path.open("a" if resume else "w", encoding="utf-8") as out:
+        if truncated:
+            # Keep the next result off the partial line a crash left behind
+            out.write("\n")
+
+        async def worker():
+            nonlocal errors
+            while not queue.empty():
+                item = queue.get_nowait()
+                result = await run_item(manager, item, run_id, approve, timeout)
+                # Written as soon as it finishes, so an interrupted run keeps its results
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+                out.flush()
+                latencies.append(result["latency_s"])
+                errors += result["status"] != "ok"
+                print(f"[{len(latencies)}/{len(items)}] {item['id']}: {result['status']} in {result['latency_s']}s")
+
+        await asyncio.gather(*(worker() for _ in range(max(concurrency, 1))))
+
+    await manager.close()
+    await metrics.close()
+
+    if latencies:
+        ordered = sorted(latencies)
+        print(
+            f"\n{len(ordered)} prompts in {time.perf_counter() - started:.1f}s, {errors} errors | "
+            f"latency p50 {ordered[len(ordered) // 2]:.2f}s, "
+            f"p95 {ordered[max(int(len(ordered) * 0.95) - 1, 0)]:.2f}s, "
+            f"mean {statistics.fmean(ordered):.2f}s"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", type=Path, help="JSONL file with prompts")
+    parser.add_argument("output", type=Path, help="JSONL file for results")
+    parser.add_argument("--concurrency", type=int, default=settings.BATCH_CONCURRENCY)
+    parser.add_argument("--policy", choices=["deny", "approve"], default=settings.BATCH_TOOL_POLICY,
+                        help="Answer for dangerous tool calls")
+    parser.add_argument("--timeout", type=float, default=settings.BATCH_ITEM_TIMEOUT,
+                        help="Seconds per prompt (0 = no limit)")
+    parser.add_argument("--resume", action="store_true", help="Skip ids that already succeeded in the output file")
+    args = parser.parse_args()
+    asyncio.run(main(args.input, args.output, args.concurrency, args.policy == "approve", args.timeout, args.resume))
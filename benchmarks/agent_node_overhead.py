@@ -0,0 +1,93 @@
+"""
+Micro-benchmark: per-step overhead of the agent node, excluding network time.
+
+The LLM is a zero-latency ScriptedChatModel, so everything measured is work done
+on our side: tool routing, cache-key checks, prompt formatting, the runnable
+sequence and message conversion.
+
+    python -m benchmarks.agent_node_overhead --iterations 2000 --history 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from benchmarks.fakes import FakeClientManager, ScriptedChatModel
+from core.agent_manager import Agent_Manager
+from core.database_manager import Database_Manager
+
+
+def _history(turns: int) -> list:
+    messages = []
+    for i in range(turns):
+        messages.append(HumanMessage(content=f"Question number {i} about the weather in city {i}?"))
+        messages.append(AIMessage(content=f"Answer number {i}: it is sunny and 20°C in city {i}."))
+    messages.append(HumanMessage(content="And what about Tokyo?"))
+    return messages
+
+
+async def _timed(label: str, iterations: int, call) -> dict:
+    for _ in range(min(100, iterations)):
+        await call()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        samples.append((time.perf_counter() - start) * 1e6)
+
+    samples.sort()
+    return {
+        "label": label,
+        "mean_us": statistics.fmean(samples),
+        "p50_us": samples[len(samples) // 2],
+        "p95_us": samples[int(len(samples) * 0.95) - 1],
+    }
+
+
+async def main(iterations: int, history: int):
+    llm = ScriptedChatModel(script=[AIMessage(content="ok")])
+    with tempfile.TemporaryDirectory() as folder:
+        manager = Agent_Manager(
+            database_manager=Database_Manager(db_folder=folder),
+            client_manager=FakeClientManager(),
+            llm=llm,
+            fast_llm=llm
+        )
+        await manager.initialize()
+        state = {"messages": _history(history)}
+        prompt_messages = (await manager.prompt.ainvoke(state)).to_messages()
+
+        results = [
+            # Floor: the fake model alone on pre-formatted messages
+            await _timed("model only", iterations,
+                         lambda: manager.llm_with_tools.ainvoke(prompt_messages)),
+            # What _call_model used to do: build the RunnableSequence on every step
+            await _timed("chain rebuilt per call", iterations,
+                         lambda: (manager.prompt | manager.llm_with_tools).ainvoke(state)),
+            # The node as the graph runs it (precompiled chain)
+            await _timed("agent node", iterations,
+                         lambda: manager._call_model(state)),
+        ]
+        await manager.close()
+
+    floor = results[0]["mean_us"]
+    print(f"{'':<26}{'mean µs':>10}{'p50 µs':>10}{'p95 µs':>10}{'overhead µs':>14}")
+    for row in results:
+        print(f"{row['label']:<26}{row['mean_us']:>10.1f}{row['p50_us']:>10.1f}"
+              f"{row['p95_us']:>10.1f}{row['mean_us'] - floor:>14.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--history", type=int, default=10, help="Previous turns in the thread")
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.history))
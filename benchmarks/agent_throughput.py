@@ -0,0 +1,206 @@
+"""
+Offline throughput benchmark: full agent turns at 1..N concurrent threads.
+
+The LLM is a ScriptedChatModel following a tool-call pattern (see
+benchmarks.fakes.PATTERNS) and the tools are in-process fakes, or a local fake
+MCP server over stdio with --mcp. Nothing touches the network, so runs are
+repeatable and can be compared across commits.
+
+Reported per concurrency level: turns/sec, turn latency, per-node latency,
+checkpoint operations and time per turn, database size and (with --memory)
+peak traced allocations.
+
+    python -m benchmarks.agent_throughput --max-threads 16 --turns 10 --pattern parallel \\
+        --llm-latency 0.05 --tool-latency 0.01 --json results.json
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.fakes import PATTERNS, FakeClientManager, FakeMCPClientManager, ScriptedChatModel, pattern_step
+from core.agent_manager import Agent_Manager
+from core.database_manager import Database_Manager
+
+CHECKPOINT_METHODS = ("aget_tuple", "aput", "aput_writes")
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(int(len(ordered) * fraction) - 1, 0)] if ordered else 0.0
+
+
+class TimedDatabaseManager(Database_Manager):
+    """Database_Manager whose checkpointer records the time of every read / write."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.timings: Dict[str, List[float]] = defaultdict(list)
+
+    async def checkpoint_initialization(self):
+        saver = await super().checkpoint_initialization()
+        for name in CHECKPOINT_METHODS:
+            setattr(saver, name, self._timed(name, getattr(saver, name)))
+        return saver
+
+    def _timed(self, name: str, method):
+        async def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.timings[name].append(time.perf_counter() - start)
+        return wrapper
+
+
+class TimedAgentManager(Agent_Manager):
+    """Agent_Manager that records how long each graph node takes."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.node_timings: Dict[str, List[float]] = defaultdict(list)
+
+    async def _call_model(self, state, config=None):
+        start = time.perf_counter()
+        try:
+            return await super()._call_model(state, config)
+        finally:
+            self.node_timings["agent"].append(time.perf_counter() - start)
+
+    async def _call_tools(self, state, config):
+        start = time.perf_counter()
+        try:
+            return await super()._call_tools(state, config)
+        finally:
+            self.node_timings["tools"].append(time.perf_counter() - start)
+
+
+async def _turn(manager: Agent_Manager, thread_id: str, prompt: str) -> float:
+    start = time.perf_counter()
+    events = manager.stream_turn(prompt, thread_id)
+    while events is not None:
+        pending = None
+        async for event in events:
+            if event["type"] == "approval_required":
+                pending = event
+        # Approvals are answered immediately so the dangerous pattern measures the resume path
+        events = manager.resume_turn(thread_id, True) if pending else None
+    return time.perf_counter() - start
+
+
+async def run_level(args, threads: int) -> Dict:
+    with tempfile.TemporaryDirectory() as folder:
+        database = TimedDatabaseManager(db_folder=folder)
+        client = (
+            FakeMCPClientManager(tool_latency=args.tool_latency)
+            if args.mcp else FakeClientManager(tool_latency=args.tool_latency)
+        )
+        llm = ScriptedChatModel(
+            script=[pattern_step(args.pattern)],
+            latency=args.llm_latency,
+            tail_latency=args.tail_latency,
+            tail_every=args.tail_every
+        )
+        manager = TimedAgentManager(database_manager=database, client_manager=client, llm=llm, fast_llm=llm)
+        await manager.initialize()
+
+        if args.memory:
+            tracemalloc.reset_peak()
+
+        async def conversation(index: int) -> List[float]:
+            return [
+                await _turn(manager, f"bench-{threads}-{index}", f"Question {turn} from thread {index}?")
+                for turn in range(args.turns)
+            ]
+
+        started = time.perf_counter()
+        per_thread = await asyncio.gather(*(conversation(i) for i in range(threads)))
+        elapsed = time.perf_counter() - started
+
+        peak_mb = tracemalloc.get_traced_memory()[1] / 2**20 if args.memory else None
+        db_kb = sum(f.stat().st_size for f in Path(folder).iterdir()) / 1024
+        await manager.close()
+
+    turns = [latency for thread in per_thread for latency in thread]
+    checkpoint_ops = sum(len(samples) for samples in database.timings.values())
+    checkpoint_seconds = sum(sum(samples) for samples in database.timings.values())
+    return {
+        "threads": threads,
+        "turns": len(turns),
+        "turns_per_sec": round(len(turns) / elapsed, 2),
+        "turn_p50_ms": round(_percentile(turns, 0.5) * 1000, 2),
+        "turn_p95_ms": round(_percentile(turns, 0.95) * 1000, 2),
+        "nodes": {
+            node: {
+                "count": len(samples),
+                "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+                "p95_ms": round(_percentile(samples, 0.95) * 1000, 3),
+            }
+            for node, samples in manager.node_timings.items()
+        },
+        "checkpoint": {
+            "ops_per_turn": round(checkpoint_ops / len(turns), 2),
+            "ms_per_turn": round(checkpoint_seconds * 1000 / len(turns), 3),
+            "by_method_ms": {
+                name: round(statistics.fmean(samples) * 1000, 3)
+                for name, samples in database.timings.items() if samples
+            },
+        },
+        "db_kb": round(db_kb, 1),
+        "peak_mb": round(peak_mb, 2) if peak_mb is not None else None,
+    }
+
+
+def _levels(max_threads: int) -> List[int]:
+    levels, n = [], 1
+    while n < max_threads:
+        levels.append(n)
+        n *= 2
+    return levels + [max_threads]
+
+
+async def main(args):
+    if args.memory:
+        tracemalloc.start()
+
+    results = [await run_level(args, threads) for threads in _levels(args.max_threads)]
+
+    print(f"pattern={args.pattern} llm={args.llm_latency * 1000:.0f}ms tool={args.tool_latency * 1000:.0f}ms "
+          f"transport={'mcp-stdio' if args.mcp else 'in-process'}")
+    print(f"{'threads':>8}{'turns/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'agent ms':>10}"
+          f"{'tools ms':>10}{'ckpt ops':>10}{'ckpt ms':>10}{'db KB':>9}{'peak MB':>9}")
+    for row in results:
+        nodes = row["nodes"]
+        print(
+            f"{row['threads']:>8}{row['turns_per_sec']:>10.1f}{row['turn_p50_ms']:>10.1f}{row['turn_p95_ms']:>10.1f}"
+            f"{nodes.get('agent', {}).get('mean_ms', 0):>10.2f}{nodes.get('tools', {}).get('mean_ms', 0):>10.2f}"
+            f"{row['checkpoint']['ops_per_turn']:>10.1f}{row['checkpoint']['ms_per_turn']:>10.2f}"
+            f"{row['db_kb']:>9.0f}{row['peak_mb'] if row['peak_mb'] is not None else '-':>9}"
+        )
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-threads", type=int, default=8, help="Concurrency levels 1, 2, 4, ... up to this")
+    parser.add_argument("--turns", type=int, default=10, help="Turns per thread")
+    parser.add_argument("--pattern", choices=sorted(PATTERNS), default="tool")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds per model call")
+    parser.add_argument("--tail-latency", type=float, default=0.0, help="Seconds for the slow outlier calls")
+    parser.add_argument("--tail-every", type=int, default=0, help="Every Nth model call is an outlier")
+    parser.add_argument("--tool-latency", type=float, default=0.0, help="Seconds per tool call")
+    parser.add_argument("--mcp", action="store_true", help="Serve tools from a local fake MCP server over stdio")
+    parser.add_argument("--memory", action="store_true", help="Track peak allocations (slows the run)")
+    parser.add_argument("--json", help="Write the results to this file")
+    asyncio.run(main(parser.parse_args()))
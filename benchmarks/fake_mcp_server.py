@@ -0,0 +1,26 @@
+"""
+Local stand-in for the chatbot / GitHub MCP servers: same tool names, canned
+answers, optional FAKE_TOOL_LATENCY seconds per call. Spawned over stdio by
+benchmarks.fakes.FakeMCPClientManager.
+"""
+import os
+import sys
+from pathlib import Path
+
+parent_dir = Path(__file__).resolve().parent.parent
+if str(parent_dir) not in sys.path:
+    sys.path.insert(0, str(parent_dir))
+
+from core.server_manager import ServerManager
+from benchmarks.fakes import TOOL_FUNCTIONS, with_latency
+
+latency = float(os.getenv("FAKE_TOOL_LATENCY", "0"))
+
+manager = ServerManager(server_name="Fake Tools")
+mcp = manager.server_implementation(instructions="Offline fake tools for benchmarks.")
+
+for name, function in TOOL_FUNCTIONS.items():
+    mcp.tool(name=name)(with_latency(function, latency))
+
+if __name__ == "__main__":
+    mcp.run()
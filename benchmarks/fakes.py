@@ -0,0 +1,217 @@
+import asyncio
+import inspect
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.tools import StructuredTool
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from client.client_manager import ClientManager
+
+ScriptStep = Union[AIMessage, Callable[[Sequence[BaseMessage]], AIMessage]]
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Offline stand-in for ChatGroq: replays a script of AIMessages (or callables
+    that build one from the prompt) in a loop, optionally after a latency.
+    Every `tail_every`-th call takes `tail_latency` instead, to model the slow
+    outliers that dominate p99. bind_tools converts the tools like a real
+    provider would, so binding cost is still part of what the benchmarks measure.
+    """
+
+    script: List[Any]
+    latency: float = 0.0
+    tail_latency: float = 0.0
+    tail_every: int = 0
+    position: int = 0
+    calls: int = 0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _next_message(self, messages: Sequence[BaseMessage]) -> AIMessage:
+        step = self.script[self.position % len(self.script)]
+        self.position += 1
+        message = step(messages) if callable(step) else step
+        # Fresh ids so repeated script entries are appended, not merged, by add_messages
+        return message.model_copy(update={
+            "id": None,
+            "tool_calls": [{**tc, "id": f"call_{uuid.uuid4().hex[:24]}"} for tc in message.tool_calls],
+        })
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._next_message(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        self.calls += 1
+        slow = self.tail_every and self.calls % self.tail_every == 0
+        delay = self.tail_latency if slow else self.latency
+        if delay:
+            await asyncio.sleep(delay)
+        return self._generate(messages, stop=stop, **kwargs)
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+
+async def _fake_get_weather(city: str) -> str:
+    """Fetches the current weather for a given city."""
+    return json.dumps({"status": "success", "city": city, "temperature": "21°C", "conditions": "clear sky"})
+
+
+async def _fake_search_web_tavily(query: str) -> str:
+    """Searches the web using Tavily. Use this for real-time information."""
+    return json.dumps({"status": "success", "query": query, "results": [
+        {"title": f"Result for {query}", "url": "https://example.com", "snippet": "Lorem ipsum."}
+    ]})
+
+
+async def _fake_list_repositories(limit: int = 20) -> dict:
+    """List repositories for a user."""
+    return {"status": "success", "count": 1, "repos": [{"name": "user/demo", "stars": 1}]}
+
+
+async def _fake_delete_repository(repo_name: str) -> dict:
+    """Delete a GitHub repository permanently."""
+    return {"status": "success", "deleted": repo_name}
+
+
+TOOL_FUNCTIONS = {
+    "get_weather": _fake_get_weather,
+    "search_web_tavily": _fake_search_web_tavily,
+    "list_repositories": _fake_list_repositories,
+    "delete_repository": _fake_delete_repository,
+}
+
+
+def with_latency(function: Callable, latency: float) -> Callable:
+    """Same tool, but each call first waits `latency` seconds (the upstream API)."""
+    if not latency:
+        return function
+
+    async def delayed(*args, **kwargs):
+        await asyncio.sleep(latency)
+        return await function(*args, **kwargs)
+
+    delayed.__name__ = function.__name__
+    delayed.__doc__ = function.__doc__
+    delayed.__signature__ = inspect.signature(function)
+    return delayed
+
+
+def fake_tools(latency: float = 0.0) -> List[StructuredTool]:
+    return [
+        StructuredTool.from_function(coroutine=with_latency(function, latency), name=name)
+        for name, function in TOOL_FUNCTIONS.items()
+    ]
+
+
+# Tool-call patterns for one user turn: each entry is one model step's tool calls
+PATTERNS: Dict[str, List[List[Dict]]] = {
+    "answer": [],
+    "tool": [[{"name": "get_weather", "args": {"city": "Tokyo"}}]],
+    "parallel": [[
+        {"name": "get_weather", "args": {"city": "Tokyo"}},
+        {"name": "search_web_tavily", "args": {"query": "Tokyo events"}},
+    ]],
+    "chain": [
+        [{"name": "get_weather", "args": {"city": "Tokyo"}}],
+        [{"name": "search_web_tavily", "args": {"query": "Tokyo events"}}],
+    ],
+    "dangerous": [[{"name": "delete_repository", "args": {"repo_name": "user/demo"}}]],
+}
+
+
+def pattern_step(pattern: str) -> Callable[[Sequence[BaseMessage]], AIMessage]:
+    """
+    Script step that follows PATTERNS[pattern] for every turn. The step is picked
+    from the conversation itself (tool steps taken since the last user message),
+    so concurrent threads sharing one model each get the full pattern.
+    """
+    plan = PATTERNS[pattern]
+
+    def step(messages: Sequence[BaseMessage]) -> AIMessage:
+        taken = 0
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                break
+            if isinstance(message, AIMessage) and message.tool_calls:
+                taken += 1
+        if taken < len(plan):
+            return AIMessage(content="", tool_calls=[{**tc, "id": "call"} for tc in plan[taken]])
+        return AIMessage(content=f"Done after {taken} tool step(s).")
+
+    return step
+
+
+class FakeClientManager:
+    """Drop-in for ClientManager that serves in-process tools instead of MCP servers."""
+
+    def __init__(self, tools: Optional[List[Any]] = None, tool_latency: float = 0.0):
+        self._tools = tools
+        self.tool_latency = tool_latency
+
+    @property
+    def is_initialised(self) -> bool:
+        return self._tools is not None
+
+    async def get_client_tools(self) -> List[Any]:
+        if self._tools is None:
+            self._tools = fake_tools(self.tool_latency)
+        return self._tools
+
+    async def close(self):
+        pass
+
+
+class FakeMCPClientManager(ClientManager):
+    """
+    ClientManager pointed at benchmarks/fake_mcp_server.py, so tool calls pay the
+    real MCP stdio transport (process spawn, JSON-RPC, serialization) without any
+    upstream API.
+    """
+
+    def __init__(self, tool_latency: float = 0.0):
+        super().__init__()
+        self.tool_latency = tool_latency
+
+    def client_initialization(self):
+        from langchain_mcp_adapters.client import MultiServerMCPClient
+
+        self._serverState = {
+            "Fake Tools": {
+                "transport": "stdio",
+                "command": sys.executable,
+                "args": [str(Path(__file__).resolve().parent / "fake_mcp_server.py")],
+                # The parent's environment (settings, PATH) plus what the fake server needs
+                "env": {
+                    **os.environ,
+                    "PYTHONPATH": str(self.base_dir),
+                    "FAKE_TOOL_LATENCY": str(self.tool_latency),
+                },
+            }
+        }
+        self._client = MultiServerMCPClient(self._serverState)
+        return self._client
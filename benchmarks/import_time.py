@@ -0,0 +1,101 @@
+"""
+Import-time profile of the project's entry points.
+
+Each target is imported in a fresh interpreter with `python -X importtime`, so
+the numbers are cold-start costs as paid by a new API worker or by every MCP
+server spawn. Reported per target: process wall time, total import time and
+the slowest top-level imports (cumulative, i.e. including what they pull in).
+
+    python -m benchmarks.import_time                        # default targets
+    python -m benchmarks.import_time core.agent_manager --top 15 --json imports.json
+"""
+import argparse
+import json
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+DEFAULT_TARGETS = (
+    "config.settings",
+    "core.agent_manager",
+    "api.app",
+    "api.workers",
+    "server.chatbot_server",
+    "server.github_mcp_server",
+)
+
+# "import time:       123 |        456 |     package.module"
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """-X importtime lines as {module, self_us, cumulative_us, depth}."""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append({
+                "module": module,
+                "self_us": int(self_us),
+                "cumulative_us": int(cumulative_us),
+                # One leading space for top-level imports, two more per nesting level
+                "depth": (len(indent) - 1) // 2,
+            })
+    return entries
+
+
+def profile(target: str, top: int) -> Dict:
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    wall_ms = (time.perf_counter() - start) * 1000
+    entries = parse_importtime(process.stderr)
+
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else "failed"
+        return {"target": target, "error": error}
+
+    top_level = [entry for entry in entries if entry["depth"] == 0]
+    return {
+        "target": target,
+        "wall_ms": round(wall_ms, 1),
+        "import_ms": round(sum(entry["self_us"] for entry in entries) / 1000, 1),
+        "modules": len(entries),
+        "slowest": [
+            {"module": entry["module"], "cumulative_ms": round(entry["cumulative_us"] / 1000, 1)}
+            for entry in sorted(top_level, key=lambda e: e["cumulative_us"], reverse=True)[:top]
+        ],
+    }
+
+
+def main(args):
+    results = [profile(target, args.top) for target in args.targets or DEFAULT_TARGETS]
+
+    for result in results:
+        if "error" in result:
+            print(f"{result['target']}: {result['error']}\n")
+            continue
+        print(f"{result['target']}: {result['import_ms']:.1f} ms importing {result['modules']} modules "
+              f"(process {result['wall_ms']:.1f} ms)")
+        for entry in result["slowest"]:
+            print(f"    {entry['cumulative_ms']:>9.1f} ms  {entry['module']}")
+        print()
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("targets", nargs="*", help="Modules to import (default: the entry points)")
+    parser.add_argument("--top", type=int, default=10, help="Slowest top-level imports to list")
+    parser.add_argument("--json", help="Write the results to this file")
+    main(parser.parse_args())
@@ -1,5 +1,19 @@
-from client.client_manager import ClientManager
+import importlib
+
+# Resolved on first access: the MCP servers import the HTTP managers from this
+# package and must not load the MCP client adapters along with them.
+_EXPORTS = {
+    "ClientManager": "client.client_manager",
+}
 
 __all__ = [
     "ClientManager"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'client' has no attribute {name!r}")
@@ -1,14 +1,36 @@
+from __future__ import annotations
 
-from langchain_mcp_adapters.client import MultiServerMCPClient
+import asyncio
+import logging
+from contextlib import AsyncExitStack
 from pathlib import Path
-from typing import Dict, List, Any , Optional
+from typing import TYPE_CHECKING, Dict, List, Any , Optional
 from config.settings import settings
+from core.tracing import tracer
+
+if TYPE_CHECKING:
+    from langchain_mcp_adapters.client import MultiServerMCPClient
+    from mcp import ClientSession
+
+logger = logging.getLogger(__name__)
+
 class ClientManager:
-    def __init__(self):
+    """
+    MCP client for the tool servers. With MCP_PERSISTENT_SESSIONS (default) every
+    server is started once and its stdio session is kept open until close(), so
+    server-side state - pooled HTTP clients, tool caches, the repository index
+    refresh loop - lives as long as the agent. Without it, listing the tools and
+    every tool call start a fresh server process.
+    """
+
+    def __init__(self, persistent: Optional[bool] = None):
         self.base_dir: Path = Path(__file__).parent.parent
         self.server_dir : str = self.base_dir /settings.SERVER_FOLDER_NAME
         self._client: Optional[MultiServerMCPClient] = None
         self._serverState: Dict = None
+        self.persistent = settings.MCP_PERSISTENT_SESSIONS if persistent is None else persistent
+        self._session_tasks: Dict[str, asyncio.Task] = {}
+        self._closing: Optional[asyncio.Event] = None
 
     @property
     def is_initialised(self) -> bool:
@@ -19,6 +41,8 @@ class ClientManager:
         return self._client
     
     def client_initialization(self) -> MultiServerMCPClient:
+        # Imported on use: the adapters (and the mcp SDK) are only needed by the agent
+        from langchain_mcp_adapters.client import MultiServerMCPClient
         # Using the exact dictionary structure you provided
         self._serverState = {
             settings.WEB_SERVER_NAME: {
@@ -55,10 +79,61 @@ class ClientManager:
         self._client = MultiServerMCPClient(self._serverState)
         return self._client
     
+    async def _open_session(self, server_name: str) -> ClientSession:
+        """
+        Starts the server and returns its session, held open by a dedicated task:
+        the stdio transport's task group must be entered and left in the same task.
+        """
+        if self._closing is None:
+            self._closing = asyncio.Event()
+        ready: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        async def hold():
+            try:
+                async with AsyncExitStack() as stack:
+                    with tracer.span("mcp.connect", kind="mcp", server=server_name, spawn=True):
+                        session = await stack.enter_async_context(self._client.session(server_name))
+                    ready.set_result(session)
+                    await self._closing.wait()
+            except Exception as e:
+                if not ready.done():
+                    ready.set_exception(e)
+                else:
+                    logger.warning("MCP session to %s ended: %s", server_name, e)
+
+        self._session_tasks[server_name] = asyncio.create_task(hold())
+        return await ready
+
     async def get_client_tools(self) -> List[Any]:
         if not self.is_initialised:
             self.client_initialization()
 
-        tools = await self._client.get_tools()
-        return tools
+        async def server_tools(server_name: str) -> List[Any]:
+            with tracer.span("mcp.get_tools", kind="mcp", server=server_name,
+                             spawn=not self.persistent) as span:
+                if self.persistent:
+                    from langchain_mcp_adapters.tools import load_mcp_tools
+                    # Tools bound to the open session reuse the running server
+                    tools = await load_mcp_tools(await self._open_session(server_name))
+                else:
+                    # Each server is spawned over stdio to list its tools
+                    tools = await self._client.get_tools(server_name=server_name)
+                span.set(tools=len(tools))
+            # Tagged so tool spans (and metrics) know the server and whether a call spawns it
+            for tool in tools:
+                tool.metadata = {
+                    **(tool.metadata or {}), "mcp_server": server_name, "mcp_spawn": not self.persistent
+                }
+            return tools
+
+        per_server = await asyncio.gather(*(server_tools(name) for name in self._serverState))
+        return [tool for tools in per_server for tool in tools]
+
+    async def close(self):
+        """Ends the persistent sessions, which stops their server processes."""
+        if self._closing is not None:
+            self._closing.set()
+        await asyncio.gather(*self._session_tasks.values(), return_exceptions=True)
+        self._session_tasks.clear()
+        self._closing = None
     
\ No newline at end of file
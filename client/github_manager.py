@@ -1,19 +1,107 @@
 from github import Github, Auth
 from config.settings import settings
+from core.tracing import tracer
+from typing import Any, Dict, Optional, Tuple
+import httpx
+
+GITHUB_API_URL = "https://api.github.com"
+GITHUB_GRAPHQL_URL = f"{GITHUB_API_URL}/graphql"
+
+
+class GitHubGraphQLError(Exception):
+    """Raised when the GitHub GraphQL API returns errors for a query."""
+
 
 class GitHubMCPServer:
     def __init__(self):
         self._github_client: Github | None = None
+        self._graphql_client: Optional[httpx.AsyncClient] = None
 
-    def get_github_client(self) -> Github:
-        if self._github_client is not None:
-            return self._github_client
-
+    def _get_token(self) -> str:
         token = settings.GITHUB_TOKEN
         if not token:
             raise ValueError("GITHUB_TOKEN not set in environment")
+        return token
+
+    def get_github_client(self) -> Github:
+        if self._github_client is not None:
+            return self._github_client
 
-        self._github_client = Github(auth=Auth.Token(token))
+        self._github_client = Github(auth=Auth.Token(self._get_token()))
         return self._github_client
-    
-GithubObj = GitHubMCPServer()
\ No newline at end of file
+
+    def get_graphql_client(self) -> httpx.AsyncClient:
+        if self._graphql_client is not None:
+            return self._graphql_client
+
+        self._graphql_client = httpx.AsyncClient(
+            headers={
+                "Authorization": f"Bearer {self._get_token()}",
+                "Accept": "application/vnd.github+json",
+            },
+            timeout=30,
+        )
+        return self._graphql_client
+
+    async def graphql_query(
+        self,
+        query: str,
+        variables: Optional[Dict[str, Any]] = None,
+        allow_partial: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Runs a single GraphQL query against the GitHub API and returns its 'data' payload.
+
+        With allow_partial=True, field-level errors (e.g. one repository of a bulk
+        query not existing) are tolerated as long as some data came back; the
+        failing fields are simply null in the result.
+        """
+        client = self.get_graphql_client()
+        with tracer.span("http.github.graphql", kind="http") as span:
+            response = await client.post(
+                GITHUB_GRAPHQL_URL,
+                json={"query": query, "variables": variables or {}}
+            )
+            span.set(status_code=response.status_code)
+        response.raise_for_status()
+        payload = response.json()
+
+        data = payload.get("data")
+        if payload.get("errors") and not (allow_partial and data):
+            messages = "; ".join(err.get("message", str(err)) for err in payload["errors"])
+            raise GitHubGraphQLError(messages)
+
+        return data or {}
+
+    async def conditional_get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        etag: Optional[str] = None
+    ) -> Tuple[int, Optional[str], Any]:
+        """
+        REST GET with If-None-Match. A 304 answer does not count against the rate limit,
+        which makes it a cheap "did anything change?" probe.
+
+        Returns:
+            (status_code, etag, json body or None when not modified)
+        """
+        client = self.get_graphql_client()
+        headers = {"If-None-Match": etag} if etag else {}
+        with tracer.span("http.github.rest", kind="http", path=path) as span:
+            response = await client.get(f"{GITHUB_API_URL}{path}", params=params, headers=headers)
+            span.set(status_code=response.status_code)
+
+        if response.status_code == 304:
+            return 304, etag, None
+
+        response.raise_for_status()
+        return response.status_code, response.headers.get("ETag"), response.json()
+
+    async def close(self):
+        """Cleanup method for server shutdown."""
+        if self._graphql_client is not None:
+            await self._graphql_client.aclose()
+            self._graphql_client = None
+
+GithubObj = GitHubMCPServer()
@@ -0,0 +1,66 @@
+from config.settings import settings
+from core.tracing import tracer
+from typing import Any, Dict, Optional
+import httpx
+
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+
+
+class TavilyClientManager:
+    """
+    Owns one pooled keep-alive HTTP client for Tavily for the lifetime of the
+    web MCP server, instead of building a TavilySearch (and a fresh connection)
+    on every search.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def is_initialised(self) -> bool:
+        return self._client is not None
+
+    def client_initialization(self) -> httpx.AsyncClient:
+        api_key = settings.TAVILY_API_KEY
+        if not api_key:
+            raise ValueError("TAVILY_API_KEY not set in environment")
+
+        self._client = httpx.AsyncClient(
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=settings.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        return self._client
+
+    def get_client(self) -> httpx.AsyncClient:
+        if not self.is_initialised:
+            self.client_initialization()
+        return self._client
+
+    async def search(self, query: str, max_results: int, topic: str = "general") -> Dict[str, Any]:
+        """Raw Tavily search; returns the API payload ({'answer', 'results': [...], ...})."""
+        with tracer.span("http.tavily.search", kind="http", topic=topic) as span:
+            response = await self.get_client().post(
+                TAVILY_SEARCH_URL,
+                json={
+                    "query": query,
+                    "max_results": max_results,
+                    "topic": topic,
+                    "include_answer": settings.TAVILY_INCLUDE_ANSWER
+                }
+            )
+            span.set(status_code=response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self):
+        """Cleanup method for server shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+TavilyObj = TavilyClientManager()
@@ -0,0 +1,56 @@
+from config.settings import settings
+from core.tracing import tracer
+from typing import Any, Dict, Optional
+import httpx
+
+OPENWEATHER_BASE_URL = "https://api.openweathermap.org/data/2.5"
+
+
+class WeatherClientManager:
+    """
+    Owns one pooled keep-alive HTTP client for OpenWeatherMap for the lifetime of
+    the web MCP server, so lookups skip the connection setup and TLS handshake.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def is_initialised(self) -> bool:
+        return self._client is not None
+
+    def client_initialization(self) -> httpx.AsyncClient:
+        self._client = httpx.AsyncClient(
+            base_url=OPENWEATHER_BASE_URL,
+            timeout=settings.HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        return self._client
+
+    def get_client(self) -> httpx.AsyncClient:
+        if not self.is_initialised:
+            self.client_initialization()
+        return self._client
+
+    async def get(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET an OpenWeather endpoint (e.g. '/weather') with metric units and the API key."""
+        with tracer.span("http.openweather", kind="http", endpoint=endpoint) as span:
+            response = await self.get_client().get(
+                endpoint,
+                params={**params, "appid": settings.OPENWEATHER_API_KEY, "units": "metric"}
+            )
+            span.set(status_code=response.status_code)
+        response.raise_for_status()
+        return response.json()
+
+    async def close(self):
+        """Cleanup method for server shutdown."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+WeatherObj = WeatherClientManager()
@@ -11,14 +11,89 @@ class Settings:
     TAVILY_API_KEY:str =os.getenv('TAVILY_API_KEY')
     OPENWEATHER_API_KEY:str =os.getenv('OPENWEATHER_API_KEY')
     GITHUB_TOKEN:str = os.getenv('GITHUB_TOKEN')
-    LLM_MODEL:str =os.getenv('LLM_MODEL')
-    LLM_TEMPERATURE:float = float(os.getenv('LLM_TEMPERATURE'))
-    K_SEARCH:int= int(os.getenv('K_SEARCH'))
-    DB_FOLDER_NAME:str = os.getenv('DB_FOLDER_NAME')
-    SERVER_FOLDER_NAME:str = os.getenv('SERVER_FOLDER_NAME')
-    DATABASE_NAME:str = os.getenv('DATABASE_NAME')
-    WEB_SERVER_NAME:str = os.getenv('WEB_SERVER_NAME')
-    GITHUB_SERVER_NAME:str = os.getenv('GITHUB_SERVER_NAME')
+    LLM_MODEL:str =os.getenv('LLM_MODEL', 'llama-3.1-8b-instant')
+    LLM_TEMPERATURE:float = float(os.getenv('LLM_TEMPERATURE', '0.5'))
+    LLM_FAST_MODEL:str = os.getenv('LLM_FAST_MODEL', '')
+    MODEL_ROUTER_ENABLED:bool = os.getenv('MODEL_ROUTER_ENABLED', 'false').lower() == 'true'
+    MODEL_ROUTER_SHORT_WORDS:int = int(os.getenv('MODEL_ROUTER_SHORT_WORDS', '12'))
+    LLM_MAX_RETRIES:int = int(os.getenv('LLM_MAX_RETRIES', '2'))
+    LLM_RATE_LIMIT_ENABLED:bool = os.getenv('LLM_RATE_LIMIT_ENABLED', 'false').lower() == 'true'
+    LLM_RPM:int = int(os.getenv('LLM_RPM', '30'))
+    LLM_TPM:int = int(os.getenv('LLM_TPM', '6000'))
+    LLM_MAX_IN_FLIGHT:int = int(os.getenv('LLM_MAX_IN_FLIGHT', '4'))
+    LLM_RESERVED_OUTPUT_TOKENS:int = int(os.getenv('LLM_RESERVED_OUTPUT_TOKENS', '512'))
+    LLM_TIMEOUT_SECONDS:float = float(os.getenv('LLM_TIMEOUT_SECONDS', '60'))
+    LLM_HEDGE_ENABLED:bool = os.getenv('LLM_HEDGE_ENABLED', 'false').lower() == 'true'
+    LLM_HEDGE_PERCENTILE:float = float(os.getenv('LLM_HEDGE_PERCENTILE', '0.95'))
+    LLM_HEDGE_BUDGET:float = float(os.getenv('LLM_HEDGE_BUDGET', '0.05'))
+    LLM_HEDGE_MIN_SAMPLES:int = int(os.getenv('LLM_HEDGE_MIN_SAMPLES', '20'))
+    LLM_CACHE_ENABLED:bool = os.getenv('LLM_CACHE_ENABLED', 'false').lower() == 'true'
+    LLM_CACHE_FORCE:bool = os.getenv('LLM_CACHE_FORCE', 'false').lower() == 'true'
+    LLM_CACHE_TTL:int = int(os.getenv('LLM_CACHE_TTL', '3600'))
+    LLM_CACHE_MAX_SIZE:int = int(os.getenv('LLM_CACHE_MAX_SIZE', '512'))
+    LLM_CACHE_NAME:str = os.getenv('LLM_CACHE_NAME', 'llm_cache.db')
+    K_SEARCH:int= int(os.getenv('K_SEARCH', '5'))
+    DB_FOLDER_NAME:str = os.getenv('DB_FOLDER_NAME', 'database')
+    SERVER_FOLDER_NAME:str = os.getenv('SERVER_FOLDER_NAME', 'server')
+    DATABASE_NAME:str = os.getenv('DATABASE_NAME', 'chatbot.db')
+    WEB_SERVER_NAME:str = os.getenv('WEB_SERVER_NAME', 'Chatbot Core')
+    GITHUB_SERVER_NAME:str = os.getenv('GITHUB_SERVER_NAME', 'GitHub MCP Server')
+    MCP_PERSISTENT_SESSIONS:bool = os.getenv('MCP_PERSISTENT_SESSIONS', 'true').lower() == 'true'
+    API_HOST:str = os.getenv('API_HOST', '127.0.0.1')
+    API_PORT:int = int(os.getenv('API_PORT', '8000'))
+    API_WORKERS:int = int(os.getenv('API_WORKERS', '1'))
+    DB_BUSY_TIMEOUT_MS:int = int(os.getenv('DB_BUSY_TIMEOUT_MS', '5000'))
+    BATCH_CONCURRENCY:int = int(os.getenv('BATCH_CONCURRENCY', '8'))
+    BATCH_TOOL_POLICY:str = os.getenv('BATCH_TOOL_POLICY', 'deny')
+    BATCH_ITEM_TIMEOUT:float = float(os.getenv('BATCH_ITEM_TIMEOUT', '300'))
+    TRACING_ENABLED:bool = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACE_EXPORTER:str = os.getenv('TRACE_EXPORTER', 'file')
+    TRACE_FILE:str = os.getenv('TRACE_FILE', 'traces.jsonl')
+    TRACE_KEEP_TURNS:int = int(os.getenv('TRACE_KEEP_TURNS', '100'))
+    TOKEN_LEDGER_ENABLED:bool = os.getenv('TOKEN_LEDGER_ENABLED', 'true').lower() == 'true'
+    METRICS_ENABLED:bool = os.getenv('METRICS_ENABLED', 'false').lower() == 'true'
+    METRICS_HOST:str = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_PORT:int = int(os.getenv('METRICS_PORT', '9464'))
+    DANGEROUS_TOOLS:frozenset = frozenset(
+        name.strip() for name in os.getenv('DANGEROUS_TOOLS', 'delete_repository,create_repository').split(',')
+        if name.strip()
+    )
+    TOOL_MAX_CONCURRENCY:int = int(os.getenv('TOOL_MAX_CONCURRENCY', '4'))
+    TOOL_ROUTER_ENABLED:bool = os.getenv('TOOL_ROUTER_ENABLED', 'false').lower() == 'true'
+    TOOL_ROUTER_TOP_K:int = int(os.getenv('TOOL_ROUTER_TOP_K', '4'))
+    TOOL_ROUTER_ALWAYS_INCLUDE:frozenset = frozenset(
+        name.strip() for name in os.getenv('TOOL_ROUTER_ALWAYS_INCLUDE', '').split(',') if name.strip()
+    )
+    TOOL_ROUTER_FALLBACK:str = os.getenv('TOOL_ROUTER_FALLBACK', 'all')
+    SEMANTIC_CACHE_ENABLED:bool = os.getenv('SEMANTIC_CACHE_ENABLED', 'false').lower() == 'true'
+    SEMANTIC_CACHE_MODEL:str = os.getenv('SEMANTIC_CACHE_MODEL', 'BAAI/bge-small-en-v1.5')
+    SEMANTIC_CACHE_THRESHOLD:float = float(os.getenv('SEMANTIC_CACHE_THRESHOLD', '0.95'))
+    SEMANTIC_CACHE_TTL:int = int(os.getenv('SEMANTIC_CACHE_TTL', '86400'))
+    SEMANTIC_CACHE_MAX_ENTRIES:int = int(os.getenv('SEMANTIC_CACHE_MAX_ENTRIES', '5000'))
+    SEMANTIC_CACHE_NAME:str = os.getenv('SEMANTIC_CACHE_NAME', 'semantic_cache.db')
+    SEMANTIC_CACHE_TOOLS:frozenset = frozenset(
+        name.strip() for name in os.getenv('SEMANTIC_CACHE_TOOLS', '').split(',') if name.strip()
+    )
+    REPO_INDEX_NAME:str = os.getenv('REPO_INDEX_NAME', 'repo_index.db')
+    REPO_INDEX_REFRESH_SECONDS:int = int(os.getenv('REPO_INDEX_REFRESH_SECONDS', '300'))
+    REPO_INDEX_FULL_REFRESH_EVERY:int = int(os.getenv('REPO_INDEX_FULL_REFRESH_EVERY', '12'))
+    HTTP_TIMEOUT:float = float(os.getenv('HTTP_TIMEOUT', '15'))
+    HTTP_MAX_CONNECTIONS:int = int(os.getenv('HTTP_MAX_CONNECTIONS', '20'))
+    HTTP_MAX_KEEPALIVE:int = int(os.getenv('HTTP_MAX_KEEPALIVE', '10'))
+    HTTP_KEEPALIVE_EXPIRY:float = float(os.getenv('HTTP_KEEPALIVE_EXPIRY', '60'))
+    TAVILY_INCLUDE_ANSWER:bool = os.getenv('TAVILY_INCLUDE_ANSWER', 'false').lower() == 'true'
+    SEARCH_CACHE_TTL:int = int(os.getenv('SEARCH_CACHE_TTL', '300'))
+    SEARCH_CACHE_MAX_SIZE:int = int(os.getenv('SEARCH_CACHE_MAX_SIZE', '256'))
+    SEARCH_CACHE_NAME:str = os.getenv('SEARCH_CACHE_NAME', 'search_cache.db')
+    WEATHER_CACHE_TTL:int = int(os.getenv('WEATHER_CACHE_TTL', '600'))
+    WEATHER_CACHE_MAX_SIZE:int = int(os.getenv('WEATHER_CACHE_MAX_SIZE', '512'))
+    WEATHER_CACHE_NAME:str = os.getenv('WEATHER_CACHE_NAME', 'weather_cache.db')
+    WEATHER_BATCH_CONCURRENCY:int = int(os.getenv('WEATHER_BATCH_CONCURRENCY', '8'))
+    TOOL_OUTPUT_MAX_CHARS:int = int(os.getenv('TOOL_OUTPUT_MAX_CHARS', '6000'))
+    TOOL_OUTPUT_LIMITS:str = os.getenv('TOOL_OUTPUT_LIMITS', 'search_web_tavily=3000,get_weather=500')
+    SEARCH_SNIPPET_CHARS:int = int(os.getenv('SEARCH_SNIPPET_CHARS', '300'))
+    SEARCH_BATCH_CONCURRENCY:int = int(os.getenv('SEARCH_BATCH_CONCURRENCY', '4'))
+    SEARCH_BATCH_MAX_QUERIES:int = int(os.getenv('SEARCH_BATCH_MAX_QUERIES', '8'))
 
     def validate(self) -> bool:
 
@@ -1,9 +1,23 @@
-from extra.agent_manager import Agent_Manager  
-from core.database_manager import Database_Manager
-from core.server_manager import ServerManager
+import importlib
+
+# Exports are resolved on first access: importing a light core module (e.g.
+# core.tracing from client/) must not pull in the agent and, through it, client/.
+_EXPORTS = {
+    "Agent_Manager": "core.agent_manager",
+    "Database_Manager": "core.database_manager",
+    "ServerManager": "core.server_manager",
+}
 
 __all__= [
     "Agent_Manager",
     "Database_Manager",
     "ServerManager"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'core' has no attribute {name!r}")
@@ -1,16 +1,28 @@
-from typing import TypedDict, Annotated, List, Dict, Optional, Any
+import asyncio
+import time
+import uuid
+from typing import TypedDict, Annotated, AsyncIterator, List, Dict, Optional, Any, Tuple
 from langgraph.graph import StateGraph, START, END
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import tools_condition
 from langgraph.graph.message import add_messages
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+from langgraph.types import Command, interrupt
 
-from langchain_groq import ChatGroq
-from langchain_core.messages import BaseMessage, HumanMessage, AIMessage
-from langchain_core.runnables import Runnable
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import BaseMessage, HumanMessage, AIMessage, AIMessageChunk, ToolMessage
+from langchain_core.runnables import Runnable, RunnableConfig
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from config.settings import settings 
 from core.database_manager import Database_Manager
+from core.llm_cache_manager import LLMCacheManager
+from core.semantic_cache_manager import SemanticCacheManager
+from core.tool_router import ToolRouter
+from core.model_router import ModelRouter, ROUTE_FAST, ROUTE_STRONG
+from core.rate_limiter import LLMRateLimiter, estimate_tokens
+from core.hedging import Attempt, HedgedCaller
+from core.tracing import tracer
+from core.metrics import metrics
 from client.client_manager import ClientManager
 
 class ChatBotState(TypedDict):
@@ -21,19 +33,41 @@ class Agent_Manager:
                  model_name: str = None, 
                  model_temperature: float = None,
                  database_manager: Database_Manager = None,
-                 client_manager: ClientManager = None):
+                 client_manager: ClientManager = None,
+                 llm_cache: LLMCacheManager = None,
+                 semantic_cache: SemanticCacheManager = None,
+                 llm: BaseChatModel = None,
+                 fast_llm: BaseChatModel = None,
+                 model_router: ModelRouter = None,
+                 rate_limiter: LLMRateLimiter = None,
+                 hedged_caller: HedgedCaller = None):
         
         self.model_name = model_name or settings.LLM_MODEL
         self.model_temperature = model_temperature or settings.LLM_TEMPERATURE
         
         self.database_manager = database_manager or Database_Manager()
         self.client_manager = client_manager or ClientManager()
+        self.llm_cache = llm_cache or LLMCacheManager()
+        self.semantic_cache = semantic_cache or SemanticCacheManager()
+        # thread_id -> semantic cache entry served for its first turn
+        self._semantic_hits: Dict[str, int] = {}
         
-        self.llm = ChatGroq(
-            model=self.model_name,
-            temperature=self.model_temperature,
-            api_key=settings.GROQ_API_KEY
-        )
+        # `llm` lets benchmarks / offline runs swap in a different chat model
+        self.llm = llm or self._groq(self.model_name)
+
+        # Small model for simple turns; routing is off when none is configured
+        self.model_router = model_router or ModelRouter()
+        self.fast_model_name = settings.LLM_FAST_MODEL or None
+        if fast_llm is None and self.fast_model_name and self.model_router.enabled:
+            fast_llm = self._groq(self.fast_model_name)
+        self.fast_llm = fast_llm
+        if self.fast_llm is None:
+            self.model_router.enabled = False
+        # Shared by every thread: keeps calls under the provider's RPM / TPM limits
+        self.rate_limiter = rate_limiter or LLMRateLimiter()
+        # Per-call deadline + a duplicate request for calls slower than the recent p95
+        self.hedged_caller = hedged_caller or HedgedCaller()
+        self._llms = {ROUTE_STRONG: (self.llm, self.model_name), ROUTE_FAST: (self.fast_llm, self.fast_model_name)}
         
         self.prompt = ChatPromptTemplate.from_messages([
             ("system", (
@@ -44,75 +78,519 @@ class Agent_Manager:
             MessagesPlaceholder(variable_name="messages"),
         ])
         
+        self._prompt_fingerprint = self.prompt.pretty_repr()
+        self._tools_fingerprints: Dict[frozenset, List[dict]] = {}
+        # (route, tool subset) -> precompiled prompt | bound-LLM chain
+        self._chains: Dict[Tuple[str, frozenset], Runnable] = {}
+
+        self.dangerous_tools = settings.DANGEROUS_TOOLS
+        self._tools_by_name: Dict[str, Any] = {}
+        # thread_ids paused on a dangerous tool call in this process (exported as a metric);
+        # cleared on resume or when the thread gets a new message instead
+        self.pending_approvals: set = set()
+        # thread_id -> usage of the turn in progress, written to the ledger at its final answer
+        self._turn_usage: Dict[str, Dict] = {}
+
         self.checkpointer: Optional[AsyncSqliteSaver] = None
         self.llm_with_tools: Optional[Runnable] = None
+        self.tool_router: Optional[ToolRouter] = None
         self._agent: Optional[CompiledStateGraph] = None
 
+    def _groq(self, model_name: str) -> BaseChatModel:
+        # Imported on use: runs with their own chat model never load the Groq SDK
+        from langchain_groq import ChatGroq
+        return ChatGroq(
+            model=model_name,
+            temperature=self.model_temperature,
+            api_key=settings.GROQ_API_KEY,
+            max_retries=settings.LLM_MAX_RETRIES
+        )
+
     @property
     def is_initialised_agent(self) -> bool:
         return self._agent is not None
     
-    async def _call_model(self, state: ChatBotState) -> Dict:
+    def _tools_fingerprint(self, tool_names: frozenset) -> List[dict]:
+        if tool_names not in self._tools_fingerprints:
+            self._tools_fingerprints[tool_names] = self.llm_cache.tools_fingerprint(
+                self.tool_router.tools_for(tool_names)
+            )
+        return self._tools_fingerprints[tool_names]
+
+    def _chain_for(self, tool_names: frozenset, route: str = ROUTE_STRONG) -> Runnable:
+        """prompt | LLM-with-tools, built once per (route, tool subset) instead of on every step."""
+        chain = self._chains.get((route, tool_names))
+        if chain is None:
+            llm = self._llms[route][0]
+            chain = self.prompt | self.tool_router.bind(llm, tool_names, key=route)
+            self._chains[(route, tool_names)] = chain
+        return chain
+
+    def _usage_for(self, thread_id: str) -> Dict:
+        usage = self._turn_usage.get(thread_id)
+        if usage is None:
+            usage = self._turn_usage[thread_id] = {
+                "thread_id": thread_id, "models": {}, "final_model": None, "tool_calls": 0,
+                "tool_ms": 0.0, "active_ms": 0.0, "running_since": time.perf_counter(),
+            }
+        return usage
+
+    def _model_usage(self, thread_id: str, model: Optional[str]) -> Dict:
+        models = self._usage_for(thread_id)["models"]
+        usage = models.get(model)
+        if usage is None:
+            usage = models[model] = {
+                "input_tokens": 0, "output_tokens": 0, "context_tokens": 0, "llm_calls": 0,
+                "cache_hits": 0, "llm_ms": 0.0, "cancelled_input_tokens": 0,
+            }
+        return usage
+
+    def _pause_turn(self, thread_id: str):
+        """Stops the turn's clock while it waits for a human approval."""
+        usage = self._turn_usage.get(thread_id)
+        if usage is not None and usage["running_since"] is not None:
+            usage["active_ms"] += (time.perf_counter() - usage["running_since"]) * 1000
+            usage["running_since"] = None
+
+    def _resume_turn(self, thread_id: str):
+        usage = self._turn_usage.get(thread_id)
+        if usage is not None and usage["running_since"] is None:
+            usage["running_since"] = time.perf_counter()
+
+    async def _record_turn(self, thread_id: str, final_model: Optional[str]):
+        """Writes the finished turn of a thread to the token ledger, one row per model."""
+        self._pause_turn(thread_id)
+        usage = self._turn_usage.pop(thread_id, None)
+        if usage is None:
+            return
+        turn_id = uuid.uuid4().hex
+        entries = []
+        for model, model_usage in usage["models"].items():
+            entry = {
+                **model_usage, "turn_id": turn_id, "thread_id": thread_id, "model": model,
+                "llm_ms": round(model_usage["llm_ms"], 1), "tool_calls": 0,
+            }
+            # Turn-wide numbers go on the row of the model that answered
+            if model == final_model:
+                entry.update(
+                    tool_calls=usage["tool_calls"],
+                    latency_ms=round(usage["active_ms"], 1),
+                    tool_ms=round(usage["tool_ms"], 1)
+                )
+            entries.append(entry)
+        await self.database_manager.record_turn(entries)
+
+    async def _call_model(self, state: ChatBotState, config: RunnableConfig = None) -> Dict:
         """Node function to process messages."""
-        chain = self.prompt | self.llm_with_tools
-        response = await chain.ainvoke(state)
-        return {"messages": [response]}
+        # Only the tools relevant to this turn are sent to the model
+        tool_names = self.tool_router.select(state["messages"])
+        # Simple steps go to the fast model, planning steps to the strong one
+        route = self.model_router.route(state["messages"])
+        model_name = self._llms[route][1]
+
+        thread_id = (config or {}).get("configurable", {}).get("thread_id", "default")
+        if isinstance(state["messages"][-1], HumanMessage):
+            # A new user message: drop usage left by a turn that failed before its answer,
+            # and an approval the user walked away from instead of answering
+            self._turn_usage.pop(thread_id, None)
+            self.pending_approvals.discard(thread_id)
+
+        with tracer.span("node.agent", kind="node", route=route, tools=len(tool_names)) as node_span:
+            # Exact-match cache: identical prompt + model params + tool set -> same answer
+            cache_key = None
+            if self.llm_cache.is_active(self.model_temperature):
+                cache_key = self.llm_cache.make_key(
+                    self._prompt_fingerprint,
+                    state["messages"],
+                    model_name,
+                    self.model_temperature,
+                    self._tools_fingerprint(tool_names)
+                )
+                cached = self.llm_cache.lookup(cache_key)
+                node_span.set(llm_cache_hit=cached is not None)
+                if cached is not None:
+                    self._model_usage(thread_id, str(model_name))["cache_hits"] += 1
+                    if not cached.tool_calls:
+                        await self._record_turn(thread_id, str(model_name))
+                    return {"messages": [cached]}
+
+            prompt_tokens = estimate_tokens(state["messages"])
+            estimated = prompt_tokens + settings.LLM_RESERVED_OUTPUT_TOKENS
+            chain = self._chain_for(tool_names, route)
+
+            async def attempt(hedge: Attempt) -> AIMessage:
+                # A hedge is a separate request, so it waits for its own limiter slot
+                async with self.rate_limiter.slot(thread_id, estimated) as permit:
+                    with tracer.span("llm", kind="llm", model=model_name, route=route,
+                                     hedge=hedge.hedge) as llm_span:
+                        # The limiter wait is not part of the model's latency
+                        hedge.start()
+                        try:
+                            result = await chain.ainvoke(state)
+                        except asyncio.CancelledError:
+                            # A losing hedge or a deadline hit: the prompt was already sent
+                            spent = self._model_usage(thread_id, str(model_name))
+                            spent["cancelled_input_tokens"] += prompt_tokens
+                            raise
+                        self.model_router.record(route, hedge.elapsed())
+                        usage = result.usage_metadata or {}
+                        llm_span.set(
+                            input_tokens=usage.get("input_tokens"),
+                            output_tokens=usage.get("output_tokens"),
+                            tool_calls=len(result.tool_calls)
+                        )
+                    permit.settle(usage.get("total_tokens"))
+                    return result
+
+            started = time.perf_counter()
+            # Two racing attempts would interleave their tokens in a streamed run, and
+            # a duplicate only adds to the backlog while requests are already queueing
+            streamed = bool((config or {}).get("configurable", {}).get("streamed"))
+            response = await self.hedged_caller.call(
+                attempt, key=route, hedge=not streamed and self.rate_limiter.queued == 0
+            )
+
+            # The provider's usage metadata feeds the per-turn ledger
+            usage = response.usage_metadata or {}
+            turn = self._model_usage(thread_id, str(model_name))
+            turn["llm_calls"] += 1
+            turn["input_tokens"] += usage.get("input_tokens") or 0
+            turn["output_tokens"] += usage.get("output_tokens") or 0
+            # Prompt size of the latest step ~ how large the thread's context has grown
+            turn["context_tokens"] = max(turn["context_tokens"], usage.get("input_tokens") or 0)
+            turn["llm_ms"] += (time.perf_counter() - started) * 1000
+
+            if cache_key is not None:
+                self.llm_cache.store(cache_key, response)
+            if not response.tool_calls:
+                await self._record_turn(thread_id, str(model_name))
+            return {"messages": [response]}
+
+    @staticmethod
+    def denial_message(tool_call: Dict) -> ToolMessage:
+        return ToolMessage(
+            tool_call_id=tool_call["id"],
+            name=tool_call["name"],
+            content=(
+                f"USER DENIED: The human user has explicitly rejected the {tool_call['name']} action "
+                "for security reasons. Acknowledge this and stop."
+            ),
+            status="error"
+        )
+
+    async def _run_tool_call(self, tool_call: Dict, config: RunnableConfig) -> ToolMessage:
+        tool = self._tools_by_name.get(tool_call["name"])
+        if tool is None:
+            return ToolMessage(
+                tool_call_id=tool_call["id"],
+                name=tool_call["name"],
+                content=f"Error: {tool_call['name']} is not a valid tool.",
+                status="error"
+            )
+        # GUARDRAIL: Limit repository lists to keep the output short
+        limit = tool_call["args"].get("limit")
+        if tool_call["name"] == "list_repositories" and isinstance(limit, int) and limit > 10:
+            tool_call = {**tool_call, "args": {**tool_call["args"], "limit": 10}}
+
+        metadata = tool.metadata or {}
+        with tracer.span(f"tool.{tool_call['name']}", kind="tool", tool=tool_call["name"],
+                         server=metadata.get("mcp_server"), spawn=metadata.get("mcp_spawn", False)) as span:
+            try:
+                # Invoking a tool with a ToolCall returns a ready ToolMessage
+                message = await tool.ainvoke({**tool_call, "type": "tool_call"}, config)
+            except Exception as e:
+                message = ToolMessage(
+                    tool_call_id=tool_call["id"],
+                    name=tool_call["name"],
+                    content=f"Error: {e}",
+                    status="error"
+                )
+            span.set(status=message.status, output_chars=len(str(message.content)))
+            return message
+
+    @staticmethod
+    def _approval_request(tool_calls: List[Dict]) -> Dict:
+        return {
+            "type": "tool_approval",
+            "tool_calls": [
+                {"name": tc["name"], "args": tc["args"], "id": tc["id"]} for tc in tool_calls
+            ],
+        }
+
+    async def _call_tools(self, state: ChatBotState, config: RunnableConfig) -> Dict:
+        """
+        Node function that executes the tool calls of the last AI message.
+
+        Only steps that call a dangerous tool pause the graph: the node raises a
+        LangGraph interrupt listing those calls and is re-run once the caller
+        resumes with Command(resume={tool_call_id: bool}) (or a single bool for all
+        of them). Steps with safe tools only run straight through. Approvals can
+        also be given up front in config["configurable"]["tool_approvals"].
+
+        Independent calls run concurrently (at most TOOL_MAX_CONCURRENCY at once) and
+        results are returned in the order the model asked for them. A dangerous
+        call without an approval is denied.
+        """
+        tool_calls = state["messages"][-1].tool_calls
+        approvals = dict(config.get("configurable", {}).get("tool_approvals") or {})
+
+        # Ask before running anything: on resume the whole node runs again
+        undecided = [
+            tc for tc in tool_calls if tc["name"] in self.dangerous_tools and tc["id"] not in approvals
+        ]
+        if undecided:
+            thread_id = config.get("configurable", {}).get("thread_id")
+            self.pending_approvals.add(thread_id)
+            # Time spent waiting for the human is not part of the turn's latency
+            self._pause_turn(thread_id)
+            decision = interrupt(self._approval_request(undecided))
+            self._resume_turn(thread_id)
+            self.pending_approvals.discard(thread_id)
+            if isinstance(decision, dict):
+                approvals.update(decision)
+            else:
+                approvals.update({tc["id"]: bool(decision) for tc in undecided})
+
+        semaphore = asyncio.Semaphore(settings.TOOL_MAX_CONCURRENCY)
+
+        async def run(tool_call: Dict) -> ToolMessage:
+            if tool_call["name"] in self.dangerous_tools and not approvals.get(tool_call["id"]):
+                return self.denial_message(tool_call)
+            async with semaphore:
+                return await self._run_tool_call(tool_call, config)
+
+        # The span starts after the approval check, so a pause is not recorded as a failure
+        started = time.perf_counter()
+        with tracer.span("node.tools", kind="node", calls=len(tool_calls)):
+            results = await asyncio.gather(*(run(tool_call) for tool_call in tool_calls))
+
+        turn = self._usage_for(config.get("configurable", {}).get("thread_id", "default"))
+        turn["tool_calls"] += len(tool_calls)
+        turn["tool_ms"] += (time.perf_counter() - started) * 1000
+        return {"messages": list(results)}
 
     async def initialize(self) -> CompiledStateGraph:
-        """Initialize DB, Fetch MCP Tools, and Compile Graph with Breakpoints."""
-        # 1. Setup DB Checkpointer
-        self.checkpointer = await self.database_manager.connection()
-        
-        # 2. Get tools from MCP Client
-        tools = await self.client_manager.get_client_tools()
+        """Initialize DB, Fetch MCP Tools, and Compile Graph."""
+        # 1. Setup DB Checkpointer, load the semantic cache model / index (if on) and
+        # 2. get tools from MCP Client - independent, so the MCP server spawns overlap
+        # with the embedding model load instead of running one after the other
+        self.checkpointer, _, tools = await asyncio.gather(
+            self.database_manager.connection(),
+            self.semantic_cache.initialize(),
+            self.client_manager.get_client_tools()
+        )
         
-        # 3. Bind tools to LLM
-        self.llm_with_tools = self.llm.bind_tools(tools)
+        # 3. Bind tools to LLM (per-turn subsets are bound lazily by the router)
+        self.tool_router = ToolRouter(tools)
+        self.llm_with_tools = self.tool_router.bind(self.llm, self.tool_router.all_names, key=ROUTE_STRONG)
+        self._chains = {}
+        self._chain_for(self.tool_router.all_names)
+        self._tools_by_name = {tool.name: tool for tool in tools}
         
         # 4. Build Graph
         workflow = StateGraph(ChatBotState)
         workflow.add_node("agent", self._call_model)
-        workflow.add_node("tools", ToolNode(tools))
+        workflow.add_node("tools", self._call_tools)
 
         workflow.add_edge(START, "agent")
         workflow.add_conditional_edges("agent", tools_condition)
         workflow.add_edge("tools", "agent")
         
-        # 5. Compile with interrupt_before for HITL
-        self._agent = workflow.compile(
-            checkpointer=self.checkpointer,
-            interrupt_before=["tools"]
-        )
+        # 5. Compile; HITL interrupts come from the tools node, only for dangerous tools
+        self._agent = workflow.compile(checkpointer=self.checkpointer)
+
+        # 6. Metrics endpoint (fed by tracer spans, gauges read at scrape time)
+        if settings.METRICS_ENABLED:
+            metrics.attach()
+            metrics.bind_agent(self)
+            await metrics.serve()
         
         return self._agent
 
+    async def close(self):
+        """Shutdown: stops the MCP servers held open by the client and closes the database."""
+        await self.client_manager.close()
+        await self.database_manager.close_connection()
+
     @property
     def agent(self) -> CompiledStateGraph:
         if not self._agent:
             raise RuntimeError("Agent not initialized. Call 'await manager.initialize()' first.")
         return self._agent
     
+    async def _semantic_lookup(self, user_input: str, config: Dict) -> Tuple[bool, Optional[str]]:
+        """
+        Returns (is_first_turn, cached_answer). On a hit the question and answer are
+        written into the thread so its history looks like a normal turn.
+        """
+        if not self.semantic_cache.enabled:
+            return False, None
+
+        state = await self.agent.aget_state(config)
+        if state.values.get("messages"):
+            return False, None
+
+        hit = await self.semantic_cache.lookup(user_input)
+        if hit is None:
+            return True, None
+
+        await self.agent.aupdate_state(
+            config,
+            {"messages": [HumanMessage(content=user_input), AIMessage(content=hit["answer"])]},
+            as_node="agent"
+        )
+        self._semantic_hits[config["configurable"]["thread_id"]] = hit["id"]
+        # Served without a model call: a zero-token turn (model NULL) in the ledger
+        self._model_usage(config["configurable"]["thread_id"], None)["cache_hits"] += 1
+        await self._record_turn(config["configurable"]["thread_id"], None)
+        return True, hit["answer"]
+
+    async def _semantic_store(self, user_input: str, config: Dict):
+        """Caches a finished first turn unless it was interrupted or called a non-cacheable tool."""
+        state = await self.agent.aget_state(config)
+        messages = state.values.get("messages", [])
+        if state.next or not messages:
+            return
+
+        last = messages[-1]
+        if not isinstance(last, AIMessage) or last.tool_calls or not last.content:
+            return
+
+        tools_called = [
+            tc["name"] for m in messages if isinstance(m, AIMessage) for tc in m.tool_calls
+        ]
+        await self.semantic_cache.store(user_input, last.content, tools_called)
+
+    def report_semantic_false_hit(self, thread_id: str) -> bool:
+        """
+        Flags the cached first answer served to this thread as wrong and evicts it.
+        Returns False when the thread was not answered from the semantic cache.
+        """
+        entry_id = self._semantic_hits.pop(thread_id, None)
+        if entry_id is None:
+            return False
+        self.semantic_cache.report_false_hit(entry_id)
+        return True
+
     async def get_response(self, user_input: str, thread_id: str = "default") -> str:
         """
         Processes a single user message and returns the final text answer.
         """
         config = {"configurable": {"thread_id": thread_id}}
-        
-        input_data = {"messages": [HumanMessage(content=user_input)]}
 
-        final_state = await self.agent.ainvoke(input_data, config=config)
-        return final_state["messages"][-1].content
+        with tracer.span("turn", kind="turn", thread_id=thread_id):
+            is_first_turn, cached_answer = await self._semantic_lookup(user_input, config)
+            if cached_answer is not None:
+                return cached_answer
+
+            input_data = {"messages": [HumanMessage(content=user_input)]}
+
+            final_state = await self.agent.ainvoke(input_data, config=config)
+
+            if is_first_turn:
+                await self._semantic_store(user_input, config)
+            return final_state["messages"][-1].content
     
     async def get_streaming_response(self, user_input: str, thread_id: str):
         """Streams response and handles the state transition."""
-        config = {"configurable": {"thread_id": thread_id}}
-        input_data = {"messages": [HumanMessage(content=user_input)]}
+        config = {"configurable": {"thread_id": thread_id, "streamed": True}}
+
+        with tracer.span("turn", kind="turn", thread_id=thread_id):
+            is_first_turn, cached_answer = await self._semantic_lookup(user_input, config)
+            if cached_answer is not None:
+                yield cached_answer
+                return
+
+            input_data = {"messages": [HumanMessage(content=user_input)]}
 
-        # We use astream to yield updates
-        async for message, metadata in self.agent.astream(
-            input_data, 
-            config=config, 
-            stream_mode="messages"
+            # We use astream to yield updates
+            async for message, metadata in self.agent.astream(
+                input_data, 
+                config=config, 
+                stream_mode="messages"
+            ):
+                if isinstance(message, AIMessage) and message.content:
+                    yield message.content
+
+            if is_first_turn:
+                await self._semantic_store(user_input, config)
+
+    async def stream_events(self, graph_input: Any, thread_id: str) -> AsyncIterator[Dict]:
+        """
+        Runs the graph (a new input or a Command(resume=...)) and yields plain dict
+        events: 'token' chunks of the answer, 'tool_call' / 'tool_result' steps, the
+        final 'message' of each model step and 'approval_required' when the graph
+        pauses for dangerous tools.
+        """
+        config = {"configurable": {"thread_id": thread_id, "streamed": True}}
+        async for mode, chunk in self.agent.astream(
+            graph_input, config=config, stream_mode=["messages", "updates"]
         ):
-            if isinstance(message, AIMessage) and message.content:
-                yield message.content
\ No newline at end of file
+            if mode == "messages":
+                message, metadata = chunk
+                if (isinstance(message, AIMessageChunk) and message.content
+                        and metadata.get("langgraph_node") == "agent"):
+                    yield {"type": "token", "content": message.content}
+                continue
+
+            for node, output in chunk.items():
+                if node == "__interrupt__":
+                    yield {"type": "approval_required", "tool_calls": output[0].value["tool_calls"]}
+                elif node == "agent":
+                    for message in output["messages"]:
+                        if message.content:
+                            yield {"type": "message", "content": message.content}
+                        for tc in message.tool_calls:
+                            yield {"type": "tool_call", "name": tc["name"], "args": tc["args"], "id": tc["id"]}
+                elif node == "tools":
+                    for message in output["messages"]:
+                        yield {
+                            "type": "tool_result",
+                            "name": message.name,
+                            "id": message.tool_call_id,
+                            "status": message.status,
+                            "content": message.content,
+                        }
+
+    async def stream_turn(self, user_input: str, thread_id: str) -> AsyncIterator[Dict]:
+        """stream_events for a new user message, going through the semantic cache."""
+        config = {"configurable": {"thread_id": thread_id}}
+
+        with tracer.span("turn", kind="turn", thread_id=thread_id):
+            is_first_turn, cached_answer = await self._semantic_lookup(user_input, config)
+            if cached_answer is not None:
+                yield {"type": "message", "content": cached_answer, "cached": True}
+                return
+
+            async for event in self.stream_events({"messages": [HumanMessage(content=user_input)]}, thread_id):
+                yield event
+
+            if is_first_turn:
+                await self._semantic_store(user_input, config)
+
+    async def resume_turn(self, thread_id: str, approvals: Any) -> AsyncIterator[Dict]:
+        """Answers a pending approval ({tool_call_id: bool} or one bool) and keeps streaming."""
+        with tracer.span("turn.resume", kind="turn", thread_id=thread_id):
+            async for event in self.stream_events(Command(resume=approvals), thread_id):
+                yield event
+
+    async def get_history(self, thread_id: str) -> Dict:
+        """Messages of a thread plus the approval request it is waiting on, if any."""
+        state = await self.agent.aget_state({"configurable": {"thread_id": thread_id}})
+        messages = []
+        for message in state.values.get("messages", []):
+            entry = {"type": message.type, "content": message.content}
+            if isinstance(message, AIMessage) and message.tool_calls:
+                entry["tool_calls"] = [
+                    {"name": tc["name"], "args": tc["args"], "id": tc["id"]} for tc in message.tool_calls
+                ]
+            if isinstance(message, ToolMessage):
+                entry.update({"name": message.name, "tool_call_id": message.tool_call_id})
+            messages.append(entry)
+
+        pending = [item.value for task in state.tasks for item in task.interrupts]
+        return {
+            "thread_id": thread_id,
+            "messages": messages,
+            "pending_approval": pending[0] if pending else None,
+        }
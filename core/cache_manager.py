@@ -0,0 +1,191 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from config.settings import settings
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    In-memory LRU cache with per-entry TTL, single-flight deduplication and an
+    optional SQLite tier for persistence across process restarts.
+
+    - get_or_set(key, factory): concurrent callers asking for the same missing key
+      share one call to `factory` instead of each doing the upstream request.
+    - Exceptions from `factory` are propagated to every waiter and never cached.
+    - Persisted values must be JSON serialisable.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        ttl: float,
+        max_size: int,
+        persist_name: Optional[str] = None,
+        db_folder: Optional[str] = None
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._inflight: Dict[str, Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+        self._persist_path: Optional[Path] = None
+        self._disk: Optional[sqlite3.Connection] = None
+        if persist_name:
+            folder = Path(__file__).resolve().parent.parent / (db_folder or settings.DB_FOLDER_NAME)
+            folder.mkdir(exist_ok=True)
+            self._persist_path = folder / persist_name
+
+    @property
+    def is_persistent(self) -> bool:
+        return self._persist_path is not None
+
+    def _disk_conn(self) -> sqlite3.Connection:
+        if self._disk is None:
+            self._disk = sqlite3.connect(self._persist_path, check_same_thread=False)
+            # Every API worker opens the same file
+            self._disk.execute("PRAGMA journal_mode=WAL")
+            self._disk.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+            self._disk.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries "
+                "(key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._disk.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (time.time(),))
+            self._disk.commit()
+        return self._disk
+
+    def get(self, key: str, default: Any = None) -> Any:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+
+            if self.is_persistent:
+                row = self._disk_conn().execute(
+                    "SELECT value, expires_at FROM cache_entries WHERE key = ? AND expires_at > ?",
+                    (key, now)
+                ).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._store_memory(key, value, row[1])
+                    self.hits += 1
+                    return value
+
+            self.misses += 1
+            return default
+
+    def _store_memory(self, key: str, value: Any, expires_at: float):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store_memory(key, value, expires_at)
+            if self.is_persistent:
+                disk = self._disk_conn()
+                disk.execute(
+                    "INSERT OR REPLACE INTO cache_entries(key, value, expires_at) VALUES (?, ?, ?)",
+                    (key, json.dumps(value), expires_at)
+                )
+                disk.commit()
+
+    def invalidate(self, key: str):
+        with self._lock:
+            self._entries.pop(key, None)
+            if self.is_persistent:
+                disk = self._disk_conn()
+                disk.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                disk.commit()
+
+    async def get_or_set(self, key: str, factory: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Any:
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            inflight = self._inflight.get(key)
+            # Futures are bound to their loop, so only share within the same loop
+            if inflight is not None and inflight[0] is loop:
+                future = inflight[1]
+                owner = False
+                self.coalesced += 1
+            else:
+                future = loop.create_future()
+                self._inflight[key] = (loop, future)
+                owner = True
+
+        if not owner:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # The owner was cancelled, not us: take over the upstream call
+                if future.cancelled():
+                    return await self.get_or_set(key, factory, ttl)
+                raise
+
+        try:
+            value = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so a failure nobody else awaited doesn't log a warning
+                future.exception()
+            raise
+        else:
+            self.set(key, value, ttl)
+            future.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                if self._inflight.get(key, (None, None))[1] is future:
+                    del self._inflight[key]
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self.is_persistent:
+                disk = self._disk_conn()
+                disk.execute("DELETE FROM cache_entries")
+                disk.commit()
+
+    def close(self):
+        with self._lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
@@ -1,8 +1,62 @@
 import aiosqlite
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 from config.settings import settings
+from core.tracing import tracer
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional
+
+# One row per model used in a finished turn (user message -> final answer, approvals
+# included); the rows of a turn share its turn_id. tool_calls, latency_ms (active time,
+# approval pauses left out) and tool_ms describe the whole turn, so they are only set on
+# the row of the model that gave the final answer.
+LEDGER_SCHEMA = """
+CREATE TABLE IF NOT EXISTS turn_ledger (
+    id             INTEGER PRIMARY KEY,
+    created_at     TEXT NOT NULL,
+    thread_id      TEXT NOT NULL,
+    model          TEXT,
+    input_tokens   INTEGER NOT NULL DEFAULT 0,
+    output_tokens  INTEGER NOT NULL DEFAULT 0,
+    context_tokens INTEGER NOT NULL DEFAULT 0,
+    llm_calls      INTEGER NOT NULL DEFAULT 0,
+    cache_hits     INTEGER NOT NULL DEFAULT 0,
+    tool_calls     INTEGER NOT NULL DEFAULT 0,
+    latency_ms     REAL,
+    llm_ms         REAL,
+    tool_ms        REAL,
+    turn_id        TEXT,
+    cancelled_input_tokens INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_turn_ledger_thread ON turn_ledger(thread_id);
+CREATE INDEX IF NOT EXISTS idx_turn_ledger_created_at ON turn_ledger(created_at);
+"""
+
+# Added after the first release; ALTERed into existing ledgers
+_LEDGER_ADDED_COLUMNS = {
+    "turn_id": "TEXT",
+    "cancelled_input_tokens": "INTEGER NOT NULL DEFAULT 0",
+}
+
+LEDGER_COLUMNS = (
+    "turn_id", "thread_id", "model", "input_tokens", "output_tokens", "context_tokens",
+    "llm_calls", "cache_hits", "tool_calls", "latency_ms", "llm_ms", "tool_ms",
+    "cancelled_input_tokens"
+)
+
+# Rows written before turn_id existed count as one turn each
+_LEDGER_AGGREGATES = """
+    COUNT(DISTINCT COALESCE(turn_id, id)) AS turns,
+    SUM(input_tokens) AS input_tokens,
+    SUM(output_tokens) AS output_tokens,
+    SUM(cancelled_input_tokens) AS cancelled_input_tokens,
+    MAX(context_tokens) AS max_context_tokens,
+    SUM(llm_calls) AS llm_calls,
+    SUM(cache_hits) AS cache_hits,
+    SUM(tool_calls) AS tool_calls,
+    ROUND(AVG(latency_ms), 1) AS avg_latency_ms,
+    ROUND(AVG(llm_ms), 1) AS avg_llm_ms
+"""
 
 class Database_Manager:
     def __init__(self, database_name: str = None, db_folder: str = None):
@@ -11,6 +65,8 @@ class Database_Manager:
         self._database_path: Optional[Path] = None
         self._conn: Optional[aiosqlite.Connection] = None
         self._checkpointer: Optional[AsyncSqliteSaver] = None
+        self.ledger_enabled = settings.TOKEN_LEDGER_ENABLED
+        self._ledger_ready = False
 
     @property
     def is_initialised_conn(self) -> bool:
@@ -41,11 +97,28 @@ class Database_Manager:
         database_folder.mkdir(exist_ok=True)
         self._database_path = database_folder / self.database_name
         self._conn = await aiosqlite.connect(database=self._database_path, check_same_thread=False)
+        # WAL lets several worker processes share the checkpoint file: readers never
+        # block the writer, and writers wait on each other instead of failing
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute("PRAGMA synchronous=NORMAL")
+        await self._conn.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
         return self._conn
 
+    async def ledger_initialization(self):
+        await self._conn.executescript(LEDGER_SCHEMA)
+        async with self._conn.execute("PRAGMA table_info(turn_ledger)") as cursor:
+            existing = {row[1] for row in await cursor.fetchall()}
+        for column, definition in _LEDGER_ADDED_COLUMNS.items():
+            if column not in existing:
+                await self._conn.execute(f"ALTER TABLE turn_ledger ADD COLUMN {column} {definition}")
+        await self._conn.commit()
+        self._ledger_ready = True
+
     async def checkpoint_initialization(self):
 
         self._checkpointer = AsyncSqliteSaver(conn=self._conn)
+        # Checkpoint reads / writes show up as 'db' spans in the turn breakdown
+        tracer.instrument(self._checkpointer, ("aget_tuple", "aput", "aput_writes"), kind="db")
 
         return self._checkpointer
     
@@ -54,11 +127,93 @@ class Database_Manager:
             await self.database_initialization()
         if not self.is_initialised:
             await self.checkpoint_initialization()
+        if self.ledger_enabled and not self._ledger_ready:
+            await self.ledger_initialization()
             
         return self._checkpointer
+
+    async def record_turn(self, entries: List[Dict]):
+        """Appends the rows of one turn (one per model, keys from LEDGER_COLUMNS) to the token ledger."""
+        if not (self.ledger_enabled and self._ledger_ready) or not entries:
+            return
+        created_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        await self._conn.executemany(
+            f"INSERT INTO turn_ledger (created_at, {', '.join(LEDGER_COLUMNS)}) "
+            f"VALUES (?, {', '.join('?' for _ in LEDGER_COLUMNS)})",
+            [(created_at, *(entry.get(c) for c in LEDGER_COLUMNS)) for entry in entries]
+        )
+        await self._conn.commit()
+
+    async def _ledger_query(self, query: str, params: tuple = ()) -> List[Dict]:
+        if not self._ledger_ready:
+            return []
+        async with self._conn.execute(query, params) as cursor:
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in await cursor.fetchall()]
+
+    async def ledger_by_thread(self, limit: int = 20) -> List[Dict]:
+        """Threads with the largest context first: where trimming would pay off."""
+        return await self._ledger_query(
+            f"SELECT thread_id, {_LEDGER_AGGREGATES}, MAX(created_at) AS last_turn_at "
+            "FROM turn_ledger GROUP BY thread_id ORDER BY max_context_tokens DESC LIMIT ?",
+            (limit,)
+        )
+
+    async def ledger_by_day(self, days: int = 30) -> List[Dict]:
+        return await self._ledger_query(
+            f"SELECT substr(created_at, 1, 10) AS day, {_LEDGER_AGGREGATES} "
+            "FROM turn_ledger GROUP BY day ORDER BY day DESC LIMIT ?",
+            (days,)
+        )
+
+    async def ledger_by_model(self) -> List[Dict]:
+        return await self._ledger_query(
+            f"SELECT model, {_LEDGER_AGGREGATES} FROM turn_ledger GROUP BY model ORDER BY input_tokens DESC"
+        )
+
+    async def thread_ledger(self, thread_id: str) -> List[Dict]:
+        """Every turn of one thread in order (a row per model), to see how its context grows."""
+        return await self._ledger_query(
+            f"SELECT created_at, {', '.join(LEDGER_COLUMNS)} FROM turn_ledger WHERE thread_id = ? ORDER BY id",
+            (thread_id,)
+        )
     
     async def close_connection(self):
         """Cleanup method for production shutdown."""
         if self._conn:
             await self._conn.close()
-            self._conn = None
\ No newline at end of file
+            self._conn = None
+            self._ledger_ready = False
+
+
+async def _print_ledger(by: str, thread_id: Optional[str]):
+    manager = Database_Manager()
+    await manager.database_initialization()
+    await manager.ledger_initialization()
+    if thread_id:
+        rows = await manager.thread_ledger(thread_id)
+    else:
+        rows = await {"thread": manager.ledger_by_thread, "day": manager.ledger_by_day,
+                      "model": manager.ledger_by_model}[by]()
+    await manager.close_connection()
+
+    if not rows:
+        print("(no turns recorded)")
+        return
+    columns = list(rows[0])
+    widths = [max(len(c), *(len(str(row[c])) for row in rows)) for c in columns]
+    print("  ".join(c.rjust(w) for c, w in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(str(row[c]).rjust(w) for c, w in zip(columns, widths)))
+
+
+if __name__ == "__main__":
+    # python -m core.database_manager [--by thread|day|model] [--thread THREAD_ID]
+    import argparse
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="Token / latency ledger report")
+    parser.add_argument("--by", choices=["thread", "day", "model"], default="thread")
+    parser.add_argument("--thread", help="Per-turn rows of one thread")
+    args = parser.parse_args()
+    asyncio.run(_print_ledger(args.by, args.thread))
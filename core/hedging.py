@@ -0,0 +1,172 @@
+import asyncio
+import time
+from collections import deque
+from typing import Awaitable, Callable, Dict, Optional, TypeVar
+
+from config.settings import settings
+
+T = TypeVar("T")
+
+
+class Attempt:
+    """
+    Handed to the factory of every attempt. Latency is measured from start(),
+    so time spent queueing locally (e.g. for a rate-limiter slot) before the
+    request goes out does not count; an attempt that never calls start() is
+    timed from its creation.
+    """
+
+    __slots__ = ("hedge", "_created", "_started")
+
+    def __init__(self, hedge: bool):
+        self.hedge = hedge
+        self._created = time.perf_counter()
+        self._started: Optional[float] = None
+
+    def start(self):
+        self._started = time.perf_counter()
+
+    @property
+    def started(self) -> bool:
+        return self._started is not None
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - (self._created if self._started is None else self._started)
+
+
+class HedgedCaller:
+    """
+    Bounds the tail latency of LLM calls.
+
+    Every call gets a deadline (LLM_TIMEOUT_SECONDS). When hedging is on and a
+    call is still running after the recent p95 latency for its key, a duplicate is
+    fired; the first successful response wins and the other one is cancelled.
+    Hedges are capped at LLM_HEDGE_BUDGET of all calls so a slow provider is not
+    hit with twice the traffic.
+
+    The percentile is fed by winners and by attempts cut off while in flight
+    (cancelled losers, deadline hits) with the time they had run so far, so a
+    slow tail keeps pushing the hedge delay up instead of disappearing from it.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        enabled: Optional[bool] = None,
+        percentile: Optional[float] = None,
+        budget: Optional[float] = None,
+        min_samples: Optional[int] = None,
+        window: int = 500
+    ):
+        self.timeout = settings.LLM_TIMEOUT_SECONDS if timeout is None else timeout
+        self.enabled = settings.LLM_HEDGE_ENABLED if enabled is None else enabled
+        self.percentile = settings.LLM_HEDGE_PERCENTILE if percentile is None else percentile
+        self.budget = settings.LLM_HEDGE_BUDGET if budget is None else budget
+        self.min_samples = settings.LLM_HEDGE_MIN_SAMPLES if min_samples is None else min_samples
+        self._window = window
+        self._latencies: Dict[str, deque] = {}
+
+        # Instrumentation
+        self.calls = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.budget_denied = 0
+        self.timeouts = 0
+
+    def hedge_delay(self, key: str) -> Optional[float]:
+        """Recent latency percentile for `key`, or None while there is too little data."""
+        samples = self._latencies.get(key)
+        if not self.enabled or not samples or len(samples) < self.min_samples:
+            return None
+        ordered = sorted(samples)
+        return ordered[min(int(len(ordered) * self.percentile), len(ordered) - 1)]
+
+    def _record(self, key: str, seconds: float):
+        self._latencies.setdefault(key, deque(maxlen=self._window)).append(seconds)
+
+    def _budget_allows(self) -> bool:
+        if self.hedges + 1 <= self.budget * self.calls:
+            return True
+        self.budget_denied += 1
+        return False
+
+    async def _race(self, factory: Callable[[Attempt], Awaitable[T]], key: str, hedge: bool) -> T:
+        attempts = {}
+
+        def launch(is_hedge: bool) -> asyncio.Future:
+            attempt = Attempt(is_hedge)
+            task = asyncio.ensure_future(factory(attempt))
+            attempts[task] = attempt
+            return task
+
+        primary = launch(False)
+        pending = {primary}
+        try:
+            delay = self.hedge_delay(key)
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and not hedge:
+                    self.hedges_skipped += 1
+                elif not done and self._budget_allows():
+                    self.hedges += 1
+                    pending.add(launch(True))
+
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    self._record(key, attempts[task].elapsed())
+                    if task is not primary:
+                        self.hedge_wins += 1
+                    return task.result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+                # Censored sample: the attempt took at least this long
+                if attempts[task].started:
+                    self._record(key, attempts[task].elapsed())
+
+    async def call(
+        self,
+        factory: Callable[[Attempt], Awaitable[T]],
+        key: str = "default",
+        hedge: bool = True
+    ) -> T:
+        """
+        Runs factory(attempt) - and possibly a second one - under the deadline.
+        factory must start a fresh, side-effect free request each time it is called
+        and should call attempt.start() right before the request goes out.
+        hedge=False keeps the deadline but never fires a duplicate (e.g. when the
+        output is streamed, or while requests are already queueing).
+        """
+        self.calls += 1
+        try:
+            async with asyncio.timeout(self.timeout or None) as deadline:
+                return await self._race(factory, key, hedge)
+        except TimeoutError:
+            if not deadline.expired():
+                raise
+            self.timeouts += 1
+            raise TimeoutError(f"LLM call exceeded the {self.timeout}s deadline") from None
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "enabled": self.enabled,
+            "calls": self.calls,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedges_skipped": self.hedges_skipped,
+            "budget_denied": self.budget_denied,
+            "timeouts": self.timeouts,
+            "hedge_ratio": round(self.hedges / self.calls, 4) if self.calls else 0.0,
+            "hedge_delay_ms": {
+                key: round(delay * 1000, 1)
+                for key in self._latencies
+                if (delay := self.hedge_delay(key)) is not None
+            },
+        }
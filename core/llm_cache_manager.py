@@ -0,0 +1,96 @@
+import hashlib
+import json
+import uuid
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, message_to_dict, messages_from_dict
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+from config.settings import settings
+from core.cache_manager import TTLCache
+
+
+class LLMCacheManager:
+    """
+    Exact-match cache for model responses.
+
+    The key is a hash of everything that determines the completion: the prompt
+    template, the conversation (content, roles, tool calls - but not the random
+    message / tool-call ids), the model name, the temperature and the schemas of
+    the bound tools. Entries live in an in-memory LRU backed by an SQLite tier.
+
+    Sampling at temperature > 0 is not deterministic, so the cache is bypassed
+    there unless LLM_CACHE_FORCE is set.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, force: Optional[bool] = None):
+        self.enabled = settings.LLM_CACHE_ENABLED if enabled is None else enabled
+        self.force = settings.LLM_CACHE_FORCE if force is None else force
+        self._cache: Optional[TTLCache] = None
+
+    @property
+    def cache(self) -> TTLCache:
+        # Created lazily so a disabled cache never touches the database folder
+        if self._cache is None:
+            self._cache = TTLCache(
+                name="llm",
+                ttl=settings.LLM_CACHE_TTL,
+                max_size=settings.LLM_CACHE_MAX_SIZE,
+                persist_name=settings.LLM_CACHE_NAME or None
+            )
+        return self._cache
+
+    def is_active(self, temperature: float) -> bool:
+        return self.enabled and (not temperature or self.force)
+
+    @staticmethod
+    def tools_fingerprint(tools: Sequence[Any]) -> List[dict]:
+        return [convert_to_openai_tool(tool) for tool in tools]
+
+    @staticmethod
+    def _message_fingerprint(message: BaseMessage) -> dict:
+        fingerprint = {"type": message.type, "content": message.content}
+        if getattr(message, "name", None):
+            fingerprint["name"] = message.name
+        if getattr(message, "tool_calls", None):
+            fingerprint["tool_calls"] = [(tc["name"], tc["args"]) for tc in message.tool_calls]
+        return fingerprint
+
+    def make_key(
+        self,
+        prompt_fingerprint: str,
+        messages: Sequence[BaseMessage],
+        model_name: str,
+        temperature: float,
+        tools: List[dict]
+    ) -> str:
+        payload = {
+            "prompt": prompt_fingerprint,
+            "messages": [self._message_fingerprint(m) for m in messages],
+            "model": model_name,
+            "temperature": temperature,
+            "tools": tools,
+        }
+        serialized = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str) -> Optional[AIMessage]:
+        stored = self.cache.get(key)
+        if stored is None:
+            return None
+
+        message = messages_from_dict([stored])[0]
+        # Fresh ids: add_messages would otherwise treat a repeated answer in the same
+        # thread as an update of the earlier message instead of a new one
+        message.id = None
+        if getattr(message, "tool_calls", None):
+            message.tool_calls = [
+                {**tc, "id": f"call_{uuid.uuid4().hex[:24]}"} for tc in message.tool_calls
+            ]
+        return message
+
+    def store(self, key: str, message: AIMessage):
+        self.cache.set(key, message_to_dict(message))
+
+    def stats(self) -> dict:
+        return self.cache.stats() if self._cache is not None else {"name": "llm", "enabled": self.enabled}
@@ -0,0 +1,293 @@
+"""
+Prometheus-style runtime metrics for the agent process.
+
+Most series are fed by tracer spans (see core.tracing), so the hot path needs
+no extra calls; gauges such as cache hit ratios and the database size are read
+from the live objects at scrape time. Exposed as text format on
+http://METRICS_HOST:METRICS_PORT/metrics (and on /metrics of the HTTP API).
+"""
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config.settings import settings
+from core.tracing import Span, tracer
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+# A scraper that connects but never sends its request must not hold the connection open
+READ_TIMEOUT = 5.0
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def set_total(self, value: float, *labels: str):
+        """For totals kept by a live object and copied in at scrape time."""
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.label_names, k)} {v}" for k, v in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, amount: float = 1.0, *labels: str):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> List[str]:
+        with self._lock:
+            return [f"{self.name}{_labels(self.label_names, k)} {v}" for k, v in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(buckets)
+        # labels -> [count per bucket..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, *labels: str):
+        with self._lock:
+            row = self._values.setdefault(labels, [0.0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    row[i] += 1
+            row[-2] += 1
+            row[-1] += value
+
+    def render(self) -> List[str]:
+        lines = []
+        with self._lock:
+            for labels, row in self._values.items():
+                for bound, count in zip(self.buckets, row):
+                    le = 'le="%s"' % bound
+                    lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {count}")
+                le = 'le="+Inf"'
+                lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {row[-2]}")
+                lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {row[-2]}")
+                lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {row[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], None]] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._attached = False
+        self._agent_collector: Optional[Callable[[], None]] = None
+
+        self.turns_in_flight = self.gauge("agent_turns_in_flight", "Turns currently running")
+        self.turns = self.counter("agent_turns_total", "Finished turns", ["status"])
+        self.turn_latency = self.histogram("agent_turn_duration_seconds", "Wall time of a graph run")
+        self.llm_latency = self.histogram("llm_request_duration_seconds", "LLM call latency", ["model", "route"])
+        self.llm_tokens = self.counter("llm_tokens_total", "Tokens sent to / received from the LLM",
+                                       ["model", "direction"])
+        self.tool_calls = self.counter("tool_calls_total", "Tool calls", ["tool", "status"])
+        self.tool_latency = self.histogram("tool_call_duration_seconds", "Tool call latency", ["tool"])
+        self.mcp_spawns = self.counter("mcp_server_spawns_total", "MCP server processes started", ["server"])
+        self.checkpoint_latency = self.histogram("checkpoint_operation_duration_seconds",
+                                                 "Checkpointer read / write latency", ["operation"])
+        self.db_size = self.gauge("checkpoint_db_size_bytes", "Checkpoint database size incl. WAL")
+        self.cache_hit_ratio = self.gauge("cache_hit_ratio", "Hit ratio per cache", ["cache"])
+        self.cache_entries = self.gauge("cache_entries", "Entries per cache", ["cache"])
+        self.pending_approvals = self.gauge("pending_tool_approvals",
+                                            "Threads waiting for a tool approval in this process")
+        self.llm_queue_wait = self.gauge("llm_limiter_wait_p95_seconds", "p95 wait for an LLM limiter slot")
+        self.llm_hedges = self.counter("llm_hedges_total", "Hedged LLM requests", ["outcome"])
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def gauge(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def _register(self, metric: _Metric):
+        self._metrics.append(metric)
+        return metric
+
+    def add_collector(self, collector: Callable[[], None]):
+        """collector() runs before every scrape to refresh gauges from live objects."""
+        self._collectors.append(collector)
+
+    # Span hooks ---------------------------------------------------------------
+
+    def _on_start(self, span: Span):
+        if span.kind == "turn":
+            self.turns_in_flight.inc(1)
+
+    def _on_finish(self, span: Span):
+        seconds = span.duration_ms / 1000
+        attributes = span.attributes
+        if span.kind == "turn":
+            self.turns_in_flight.inc(-1)
+            self.turns.inc(1, "error" if span.status == "ERROR" else "ok")
+            self.turn_latency.observe(seconds)
+        elif span.kind == "llm":
+            model = str(attributes.get("model"))
+            self.llm_latency.observe(seconds, model, str(attributes.get("route")))
+            for direction in ("input", "output"):
+                tokens = attributes.get(f"{direction}_tokens")
+                if tokens:
+                    self.llm_tokens.inc(tokens, model, direction)
+        elif span.kind == "tool":
+            tool = str(attributes.get("tool"))
+            status = "error" if span.status == "ERROR" else str(attributes.get("status", "success"))
+            self.tool_calls.inc(1, tool, status)
+            self.tool_latency.observe(seconds, tool)
+            # Without a persistent session every MCP tool call starts its server
+            if attributes.get("server") and attributes.get("spawn"):
+                self.mcp_spawns.inc(1, str(attributes["server"]))
+        elif span.kind == "mcp" and attributes.get("server") and attributes.get("spawn"):
+            self.mcp_spawns.inc(1, str(attributes["server"]))
+        elif span.kind == "db":
+            self.checkpoint_latency.observe(seconds, span.name.split(".", 1)[-1])
+
+    def attach(self):
+        if not self._attached:
+            tracer.add_listener(self._on_finish, on_start=self._on_start)
+            self._attached = True
+
+    def bind_agent(self, manager) -> None:
+        """Scrape-time gauges read from an initialised Agent_Manager (the latest one bound)."""
+
+        def collect():
+            path = manager.database_manager.database_path
+            if path is not None:
+                files: Iterable[Path] = (Path(f"{path}{suffix}") for suffix in ("", "-wal", "-shm"))
+                self.db_size.set(sum(f.stat().st_size for f in files if f.exists()))
+
+            caches = {"llm": manager.llm_cache.stats(), "semantic": manager.semantic_cache.stats()}
+            for name, stats in caches.items():
+                if "hit_ratio" in stats:
+                    self.cache_hit_ratio.set(stats["hit_ratio"], name)
+                self.cache_entries.set(stats.get("size", stats.get("entries", 0)), name)
+
+            self.pending_approvals.set(len(manager.pending_approvals))
+            self.llm_queue_wait.set(manager.rate_limiter.stats()["wait_p95_ms"] / 1000)
+            hedges = manager.hedged_caller.stats()
+            self.llm_hedges.set_total(hedges["hedges"], "fired")
+            self.llm_hedges.set_total(hedges["hedge_wins"], "won")
+            self.llm_hedges.set_total(hedges["hedges_skipped"], "skipped")
+
+        if self._agent_collector in self._collectors:
+            self._collectors.remove(self._agent_collector)
+        self._agent_collector = collect
+        self.add_collector(collect)
+
+    def render(self) -> str:
+        for collector in self._collectors:
+            try:
+                collector()
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+        lines: List[str] = []
+        for metric in self._metrics:
+            samples = metric.render()
+            if samples:
+                lines += metric.header() + samples
+        return "\n".join(lines) + "\n"
+
+    # Standalone endpoint -----------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            async with asyncio.timeout(READ_TIMEOUT):
+                request_line = (await reader.readline()).decode("latin-1").split()
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+        except (TimeoutError, ConnectionError):
+            writer.close()
+            return
+        try:
+            if len(request_line) >= 2 and request_line[1].split("?")[0] == "/metrics":
+                status, body = "200 OK", self.render().encode()
+            else:
+                status, body = "404 Not Found", b"not found\n"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: text/plain; version=0.0.4\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode() + body
+            )
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = None, port: int = None):
+        """Starts the /metrics endpoint on the running loop (once per process)."""
+        port = settings.METRICS_PORT if port is None else port
+        if self._server is not None or not port:
+            return
+        try:
+            self._server = await asyncio.start_server(self._handle, host or settings.METRICS_HOST, port)
+        except OSError as e:
+            logger.warning("Metrics endpoint not started on port %s: %s", port, e)
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+metrics = MetricsRegistry()
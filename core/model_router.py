@@ -0,0 +1,129 @@
+import re
+import statistics
+from collections import deque
+from typing import Callable, Dict, List, Optional, Sequence
+
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+
+from config.settings import settings
+
+ROUTE_FAST = "fast"
+ROUTE_STRONG = "strong"
+
+# A heuristic looks at the conversation and returns a route, or None to abstain
+Heuristic = Callable[[Sequence[BaseMessage]], Optional[str]]
+
+_GREETING = re.compile(
+    r"^\s*(hi|hello|hey|yo|thanks|thank you|thx|ok|okay|cool|great|nice|bye|good (morning|evening|night))\b[\s!.?]*$",
+    re.IGNORECASE
+)
+
+# Words that usually mean the model has to plan several steps or act on GitHub
+_COMPLEX = re.compile(
+    r"\b(create|delete|remove|compare|analy[sz]e|plan|step|explain why|then|and also|each|all of)\b",
+    re.IGNORECASE
+)
+
+
+def _text(message: BaseMessage) -> str:
+    return message.content if isinstance(message.content, str) else str(message.content)
+
+
+def _last_human(messages: Sequence[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return _text(message)
+    return ""
+
+
+def tool_result_heuristic(messages: Sequence[BaseMessage]) -> Optional[str]:
+    """Summarizing tool output is easy work, unless a tool failed and needs re-planning."""
+    if not messages or not isinstance(messages[-1], ToolMessage):
+        return None
+    results = []
+    for message in reversed(messages):
+        if not isinstance(message, ToolMessage):
+            break
+        results.append(message)
+    return ROUTE_STRONG if any(m.status == "error" for m in results) else ROUTE_FAST
+
+
+def complex_request_heuristic(messages: Sequence[BaseMessage]) -> Optional[str]:
+    """Multi-step or destructive requests go to the strong model."""
+    text = _last_human(messages)
+    if _COMPLEX.search(text) or len(text.split()) > settings.MODEL_ROUTER_SHORT_WORDS * 3:
+        return ROUTE_STRONG
+    return None
+
+
+def greeting_heuristic(messages: Sequence[BaseMessage]) -> Optional[str]:
+    return ROUTE_FAST if _GREETING.match(_last_human(messages)) else None
+
+
+def short_followup_heuristic(messages: Sequence[BaseMessage]) -> Optional[str]:
+    """A short message in a thread that already has an answer is a follow-up."""
+    has_answer = any(isinstance(m, AIMessage) and m.content for m in messages)
+    if has_answer and len(_last_human(messages).split()) <= settings.MODEL_ROUTER_SHORT_WORDS:
+        return ROUTE_FAST
+    return None
+
+
+# The request check comes first: every step of a multi-step or destructive turn,
+# including the ones that read tool results, stays on the strong model
+DEFAULT_HEURISTICS: List[Heuristic] = [
+    complex_request_heuristic,
+    tool_result_heuristic,
+    greeting_heuristic,
+    short_followup_heuristic,
+]
+
+
+class ModelRouter:
+    """
+    Decides per agent step whether the fast or the strong model answers.
+
+    Heuristics are tried in order and the first one that returns a route wins;
+    when all abstain the default (strong) route is used. Pass your own list to
+    change the policy. Latency of every model call is recorded per route.
+    """
+
+    def __init__(
+        self,
+        heuristics: Optional[List[Heuristic]] = None,
+        enabled: Optional[bool] = None,
+        default: str = ROUTE_STRONG,
+        window: int = 500
+    ):
+        self.heuristics = list(DEFAULT_HEURISTICS if heuristics is None else heuristics)
+        self.enabled = settings.MODEL_ROUTER_ENABLED if enabled is None else enabled
+        self.default = default
+        self._latencies: Dict[str, deque] = {
+            ROUTE_FAST: deque(maxlen=window),
+            ROUTE_STRONG: deque(maxlen=window),
+        }
+        self._counts: Dict[str, int] = {ROUTE_FAST: 0, ROUTE_STRONG: 0}
+
+    def route(self, messages: Sequence[BaseMessage]) -> str:
+        if not self.enabled:
+            return ROUTE_STRONG
+        for heuristic in self.heuristics:
+            decision = heuristic(messages)
+            if decision is not None:
+                return decision
+        return self.default
+
+    def record(self, route: str, seconds: float):
+        self._counts[route] = self._counts.get(route, 0) + 1
+        self._latencies.setdefault(route, deque(maxlen=500)).append(seconds)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for route, samples in self._latencies.items():
+            ordered = sorted(samples)
+            report[route] = {
+                "calls": self._counts.get(route, 0),
+                "mean_ms": round(statistics.fmean(ordered) * 1000, 1) if ordered else None,
+                "p50_ms": round(ordered[len(ordered) // 2] * 1000, 1) if ordered else None,
+                "p95_ms": round(ordered[max(int(len(ordered) * 0.95) - 1, 0)] * 1000, 1) if ordered else None,
+            }
+        return report
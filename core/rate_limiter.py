@@ -0,0 +1,204 @@
+import asyncio
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, Optional, Sequence
+
+from langchain_core.messages import BaseMessage
+
+from config.settings import settings
+
+
+def estimate_tokens(messages: Sequence[BaseMessage], reserve: int = 0) -> int:
+    """Rough prompt size (~4 characters per token) plus the tokens reserved for the answer."""
+    chars = sum(len(m.content) if isinstance(m.content, str) else len(str(m.content)) for m in messages)
+    return chars // 4 + reserve
+
+
+class _TokenBucket:
+    """Refills continuously at capacity per minute; a capacity of 0 means unlimited."""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.level = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._updated = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` is available (0 if it is now)."""
+        if self.unlimited:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return 0.0 if self.level >= amount else (amount - self.level) / self.rate
+
+    def take(self, amount: float):
+        if not self.unlimited:
+            self._refill()
+            self.level -= min(amount, self.capacity)
+
+    def adjust(self, amount: float):
+        """Refund (positive) or charge (negative) once the real usage is known."""
+        if not self.unlimited:
+            self._refill()
+            self.level = min(self.capacity, self.level + amount)
+
+
+class _Waiter:
+    __slots__ = ("future", "tokens", "enqueued_at")
+
+    def __init__(self, future: asyncio.Future, tokens: int):
+        self.future = future
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+
+
+class Permit:
+    """Handed out by LLMRateLimiter.slot(); settle() books the real token usage."""
+
+    def __init__(self, limiter: "LLMRateLimiter", estimated_tokens: int):
+        self._limiter = limiter
+        self.estimated_tokens = estimated_tokens
+
+    def settle(self, used_tokens: Optional[int]):
+        if used_tokens is not None:
+            self._limiter._tokens.adjust(self.estimated_tokens - used_tokens)
+            self.estimated_tokens = used_tokens
+
+
+class LLMRateLimiter:
+    """
+    Shared client-side governor for LLM calls.
+
+    A call needs one request from the requests/min bucket, its estimated tokens
+    from the tokens/min bucket and a free in-flight slot. Callers wait in one FIFO
+    queue per conversation thread and the queues are served round-robin, so a busy
+    thread cannot starve the others. Staying under the provider limits keeps us
+    out of 429 retry storms, which is what blows up tail latency.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[int] = None,
+        tokens_per_minute: Optional[int] = None,
+        max_in_flight: Optional[int] = None,
+        enabled: Optional[bool] = None,
+        window: int = 1000
+    ):
+        self.enabled = settings.LLM_RATE_LIMIT_ENABLED if enabled is None else enabled
+        self._requests = _TokenBucket(settings.LLM_RPM if requests_per_minute is None else requests_per_minute)
+        self._tokens = _TokenBucket(settings.LLM_TPM if tokens_per_minute is None else tokens_per_minute)
+        self.max_in_flight = settings.LLM_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        # Instrumentation
+        self.granted = 0
+        self.throttled = 0
+        self._waits: deque = deque(maxlen=window)
+
+    @property
+    def queued(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def _dispatch(self):
+        """Grants waiting calls in round-robin order while capacity allows."""
+        self._timer = None
+        while self._queues:
+            if self.max_in_flight and self._in_flight >= self.max_in_flight:
+                return  # a release() will dispatch again
+
+            thread_id, queue = next(iter(self._queues.items()))
+            waiter = queue[0]
+            if waiter.future.done():
+                # Cancelled while queued
+                self._remove(thread_id, waiter)
+                continue
+            delay = max(self._requests.wait_time(1), self._tokens.wait_time(waiter.tokens))
+            if delay > 0:
+                self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+                return
+
+            queue.popleft()
+            # Served threads move to the back of the rotation
+            self._queues.pop(thread_id)
+            if queue:
+                self._queues[thread_id] = queue
+
+            self._requests.take(1)
+            self._tokens.take(waiter.tokens)
+            self._in_flight += 1
+            self.granted += 1
+            wait = time.monotonic() - waiter.enqueued_at
+            self._waits.append(wait)
+            if wait > 0.001:
+                self.throttled += 1
+            waiter.future.set_result(None)
+
+    def _remove(self, thread_id: str, waiter: _Waiter):
+        queue = self._queues.get(thread_id)
+        if queue is not None and waiter in queue:
+            queue.remove(waiter)
+            if not queue:
+                del self._queues[thread_id]
+
+    def _release(self):
+        self._in_flight -= 1
+        if self._timer is None:
+            self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, thread_id: str = "default", estimated_tokens: int = 0):
+        """
+        Waits for capacity, then holds an in-flight slot for the duration of the block.
+
+            async with limiter.slot(thread_id, tokens) as permit:
+                response = await llm.ainvoke(...)
+                permit.settle(actual_tokens)
+        """
+        permit = Permit(self, estimated_tokens)
+        if not self.enabled:
+            yield permit
+            return
+
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), estimated_tokens)
+        self._queues.setdefault(thread_id, deque()).append(waiter)
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                self._release()  # granted just before the cancellation landed
+            else:
+                self._remove(thread_id, waiter)
+            raise
+
+        try:
+            yield permit
+        finally:
+            self._release()
+
+    def stats(self) -> Dict[str, float]:
+        waits = sorted(self._waits)
+        return {
+            "enabled": self.enabled,
+            "granted": self.granted,
+            "throttled": self.throttled,
+            "queued": self.queued,
+            "in_flight": self._in_flight,
+            "wait_mean_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_p95_ms": round(waits[max(int(len(waits) * 0.95) - 1, 0)] * 1000, 1) if waits else 0.0,
+            "wait_max_ms": round(waits[-1] * 1000, 1) if waits else 0.0,
+        }
@@ -0,0 +1,391 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+try:
+    import fcntl
+except ImportError:  # Windows: every process refreshes on its own timer
+    fcntl = None
+
+import aiosqlite
+from config.settings import settings
+from client.github_manager import GithubObj
+from tools.github_graphql import build_selection, normalize_repository, MAX_PAGE_SIZE
+
+logger = logging.getLogger(__name__)
+
+INDEX_FIELDS: List[str] = [
+    "name", "description", "language", "languages", "stars", "forks", "private",
+    "archived", "fork", "url", "topics", "created_at", "updated_at", "pushed_at"
+]
+
+SORT_COLUMNS = {"stars", "forks", "name", "updated_at", "created_at", "pushed_at"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    full_name   TEXT PRIMARY KEY,
+    description TEXT,
+    language    TEXT,
+    languages   TEXT,
+    stars       INTEGER,
+    forks       INTEGER,
+    private     INTEGER,
+    archived    INTEGER,
+    fork        INTEGER,
+    url         TEXT,
+    topics      TEXT,
+    created_at  TEXT,
+    updated_at  TEXT,
+    pushed_at   TEXT,
+    synced_at   TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_repos_language ON repos(language COLLATE NOCASE);
+CREATE INDEX IF NOT EXISTS idx_repos_stars ON repos(stars);
+CREATE INDEX IF NOT EXISTS idx_repos_updated_at ON repos(updated_at);
+CREATE TABLE IF NOT EXISTS index_meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+REPOSITORIES_QUERY = (
+    "query($first: Int!, $after: String) { viewer { repositories("
+    "first: $first, after: $after, "
+    "affiliations: [OWNER, ORGANIZATION_MEMBER, COLLABORATOR], "
+    "ownerAffiliations: [OWNER, ORGANIZATION_MEMBER, COLLABORATOR], "
+    "orderBy: {field: UPDATED_AT, direction: DESC}) { "
+    "pageInfo { hasNextPage endCursor } nodes { " + build_selection(INDEX_FIELDS) + " } } } }"
+)
+
+
+class RepositoryIndexManager:
+    """
+    Local SQLite index of the authenticated user's repository metadata.
+
+    Refreshes are incremental: a conditional REST request (ETag) tells whether
+    anything changed at all, and the GraphQL listing is ordered by updatedAt so
+    paging stops as soon as it reaches repos older than the stored watermark.
+    A full sweep, which also prunes repos that were deleted or lost access to,
+    runs once REPO_INDEX_FULL_REFRESH_EVERY refresh intervals have passed since
+    the last one (its time is kept in the index, so restarts do not trigger one).
+    Every page is committed as it arrives, so a cancelled refresh keeps its progress.
+
+    With several API workers each one runs a GitHub MCP server on the same index
+    file; only the process holding the index's lock file refreshes on a timer.
+    """
+
+    def __init__(self, index_name: str = None, db_folder: str = None):
+        self.index_name = index_name or settings.REPO_INDEX_NAME
+        self.db_folder = db_folder or settings.DB_FOLDER_NAME
+        self.refresh_seconds = settings.REPO_INDEX_REFRESH_SECONDS
+        self.full_refresh_every = settings.REPO_INDEX_FULL_REFRESH_EVERY
+        self._index_path: Optional[Path] = None
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_requested = asyncio.Event()
+        self._background_task: Optional[asyncio.Task] = None
+        self._lock_file: Optional[TextIO] = None
+
+    @property
+    def is_initialised(self) -> bool:
+        return self._conn is not None
+
+    @property
+    def index_path(self):
+
+        return self._index_path
+
+    async def index_initialization(self) -> aiosqlite.Connection:
+        index_folder = Path(__file__).resolve().parent.parent / self.db_folder
+        index_folder.mkdir(exist_ok=True)
+        self._index_path = index_folder / self.index_name
+        self._conn = await aiosqlite.connect(database=self._index_path, check_same_thread=False)
+        self._conn.row_factory = aiosqlite.Row
+        # Shared by the GitHub MCP server of every worker
+        await self._conn.execute("PRAGMA journal_mode=WAL")
+        await self._conn.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+        await self._conn.executescript(SCHEMA)
+        await self._conn.commit()
+        return self._conn
+
+    async def connection(self) -> aiosqlite.Connection:
+        if not self.is_initialised:
+            await self.index_initialization()
+        return self._conn
+
+    async def _get_meta(self, key: str) -> Optional[str]:
+        conn = await self.connection()
+        async with conn.execute("SELECT value FROM index_meta WHERE key = ?", (key,)) as cursor:
+            row = await cursor.fetchone()
+        return row["value"] if row else None
+
+    async def _set_meta(self, key: str, value: str):
+        conn = await self.connection()
+        await conn.execute(
+            "INSERT INTO index_meta(key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    async def _upsert(self, repos: List[Dict[str, Any]], synced_at: str):
+        conn = await self.connection()
+        await conn.executemany(
+            """
+            INSERT INTO repos(full_name, description, language, languages, stars, forks, private,
+                              archived, fork, url, topics, created_at, updated_at, pushed_at, synced_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(full_name) DO UPDATE SET
+                description = excluded.description, language = excluded.language,
+                languages = excluded.languages, stars = excluded.stars, forks = excluded.forks,
+                private = excluded.private, archived = excluded.archived, fork = excluded.fork,
+                url = excluded.url, topics = excluded.topics, created_at = excluded.created_at,
+                updated_at = excluded.updated_at, pushed_at = excluded.pushed_at,
+                synced_at = excluded.synced_at
+            """,
+            [
+                (
+                    r["name"], r["description"], r["language"], json.dumps(r["languages"]),
+                    r["stars"], r["forks"], int(r["private"]), int(r["archived"]), int(r["fork"]),
+                    r["url"], json.dumps(r["topics"]), r["created_at"], r["updated_at"],
+                    r["pushed_at"], synced_at
+                )
+                for r in repos
+            ]
+        )
+
+    async def refresh(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Brings the index up to date. Returns a small summary of what changed.
+        """
+        async with self._refresh_lock:
+            await self.connection()
+            full = full or await self._full_sweep_due() or await self._get_meta("watermark") is None
+
+            # 1. Cheap change probe: 304 means nothing was updated since the last refresh
+            etag = await self._get_meta("etag")
+            status, new_etag, _ = await GithubObj.conditional_get(
+                "/user/repos",
+                params={"sort": "updated", "per_page": 1,
+                        "affiliation": "owner,collaborator,organization_member"},
+                etag=None if full else etag
+            )
+            if status == 304:
+                await self._set_meta("last_refresh", datetime.now(timezone.utc).isoformat())
+                await self._conn.commit()
+                return {"mode": "not_modified", "updated": 0, "pruned": 0}
+
+            # 2. Page through repos newest-updated first, stopping at the watermark
+            watermark = None if full else await self._get_meta("watermark")
+            synced_at = datetime.now(timezone.utc).isoformat()
+            newest = watermark
+            updated = 0
+            cursor = None
+            # Repos stored with updated_at == watermark: re-listed because of the >= below,
+            # so they are not counted again
+            known_at_watermark = await self._names_updated_at(watermark) if watermark else set()
+            while True:
+                data = await GithubObj.graphql_query(
+                    REPOSITORIES_QUERY, {"first": MAX_PAGE_SIZE, "after": cursor}
+                )
+                connection = data["viewer"]["repositories"]
+                page = [normalize_repository(node, INDEX_FIELDS) for node in connection["nodes"]]
+
+                # >=: a repo updated in the same second as the watermark is not skipped
+                fresh = [r for r in page if watermark is None or r["updated_at"] >= watermark]
+                if fresh:
+                    await self._upsert(fresh, synced_at)
+                    await self._conn.commit()
+                    updated += sum(
+                        1 for r in fresh
+                        if not (r["updated_at"] == watermark and r["name"] in known_at_watermark)
+                    )
+                    newest = max(newest or "", fresh[0]["updated_at"])
+
+                reached_watermark = len(fresh) < len(page)
+                if reached_watermark or not connection["pageInfo"]["hasNextPage"]:
+                    break
+                cursor = connection["pageInfo"]["endCursor"]
+
+            # 3. A full sweep saw every repo, so anything not touched is gone
+            pruned = 0
+            if full:
+                result = await self._conn.execute(
+                    "DELETE FROM repos WHERE synced_at <> ?", (synced_at,)
+                )
+                pruned = result.rowcount
+
+            if newest:
+                await self._set_meta("watermark", newest)
+            if new_etag:
+                await self._set_meta("etag", new_etag)
+            if full:
+                await self._set_meta("last_full_refresh", synced_at)
+            await self._set_meta("last_refresh", synced_at)
+            await self._conn.commit()
+
+            return {"mode": "full" if full else "incremental", "updated": updated, "pruned": pruned}
+
+    async def _full_sweep_due(self) -> bool:
+        last_full = await self._get_meta("last_full_refresh")
+        if last_full is None:
+            return True
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(last_full)
+        return age.total_seconds() >= self.refresh_seconds * max(self.full_refresh_every, 1)
+
+    async def _names_updated_at(self, updated_at: str) -> set:
+        conn = await self.connection()
+        async with conn.execute("SELECT full_name FROM repos WHERE updated_at = ?", (updated_at,)) as cursor:
+            return {row["full_name"] for row in await cursor.fetchall()}
+
+    def request_refresh(self):
+        """Wakes the background loop early, e.g. after a repository was created."""
+        self._refresh_requested.set()
+
+    async def remove(self, full_name: str):
+        conn = await self.connection()
+        await conn.execute("DELETE FROM repos WHERE full_name = ? COLLATE NOCASE", (full_name,))
+        await conn.commit()
+
+    def _owns_refresh(self) -> bool:
+        """Takes (or keeps) the exclusive lock that makes this process the refresher."""
+        if fcntl is None or self._lock_file is not None:
+            return True
+        lock_file = open(f"{self._index_path}.lock", "w")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def _release_refresh(self):
+        if self._lock_file is not None:
+            # Closing the file drops the lock; another process takes over on its next tick
+            self._lock_file.close()
+            self._lock_file = None
+
+    async def run_background_refresh(self):
+        """Refresh loop meant to run for the lifetime of the GitHub MCP server."""
+        await self.connection()
+        while True:
+            # Explicit requests (e.g. after creating a repo here) refresh in any process
+            if not (self._refresh_requested.is_set() or self._owns_refresh()):
+                await self._wait_for_request()
+                continue
+            try:
+                await self.refresh()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Repository index refresh failed: %s", e)
+            await self._wait_for_request()
+
+    async def _wait_for_request(self):
+        try:
+            await asyncio.wait_for(self._refresh_requested.wait(), timeout=self.refresh_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._refresh_requested.clear()
+
+    def start_background_refresh(self) -> asyncio.Task:
+        if self._background_task is None or self._background_task.done():
+            self._background_task = asyncio.create_task(self.run_background_refresh())
+        return self._background_task
+
+    async def search(
+        self,
+        query: Optional[str] = None,
+        language: Optional[str] = None,
+        min_stars: Optional[int] = None,
+        max_stars: Optional[int] = None,
+        topic: Optional[str] = None,
+        private: Optional[bool] = None,
+        include_archived: bool = True,
+        include_forks: bool = True,
+        sort_by: str = "stars",
+        descending: bool = True,
+        limit: int = 20
+    ) -> Dict[str, Any]:
+        if sort_by not in SORT_COLUMNS:
+            raise ValueError(f"sort_by must be one of: {', '.join(sorted(SORT_COLUMNS))}")
+
+        if await self._get_meta("last_refresh") is None:
+            await self.refresh()
+
+        clauses = []
+        params: List[Any] = []
+        if query:
+            clauses.append("(full_name LIKE ? OR description LIKE ? OR topics LIKE ?)")
+            params += [f"%{query}%"] * 3
+        if language:
+            clauses.append("(language = ? COLLATE NOCASE OR languages LIKE ?)")
+            params += [language, f'%"{language}"%']
+        if min_stars is not None:
+            clauses.append("stars >= ?")
+            params.append(min_stars)
+        if max_stars is not None:
+            clauses.append("stars <= ?")
+            params.append(max_stars)
+        if topic:
+            clauses.append("topics LIKE ?")
+            params.append(f'%"{topic.lower()}"%')
+        if private is not None:
+            clauses.append("private = ?")
+            params.append(int(private))
+        if not include_archived:
+            clauses.append("archived = 0")
+        if not include_forks:
+            clauses.append("fork = 0")
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        sort_column = "full_name" if sort_by == "name" else sort_by
+        order = f"ORDER BY {sort_column} {'DESC' if descending else 'ASC'}"
+
+        conn = await self.connection()
+        async with conn.execute(f"SELECT COUNT(*) AS n FROM repos {where}", params) as cursor:
+            total = (await cursor.fetchone())["n"]
+        async with conn.execute(f"SELECT * FROM repos {where} {order} LIMIT ?", params + [limit]) as cursor:
+            rows = await cursor.fetchall()
+
+        repos = [
+            {
+                "name": row["full_name"],
+                "description": row["description"] or "",
+                "language": row["language"] or "",
+                "languages": json.loads(row["languages"] or "[]"),
+                "stars": row["stars"],
+                "forks": row["forks"],
+                "private": bool(row["private"]),
+                "archived": bool(row["archived"]),
+                "fork": bool(row["fork"]),
+                "url": row["url"],
+                "topics": json.loads(row["topics"] or "[]"),
+                "updated_at": row["updated_at"],
+            }
+            for row in rows
+        ]
+        return {
+            "total_matches": total,
+            "repos": repos,
+            "index_updated_at": await self._get_meta("last_refresh")
+        }
+
+    async def close_connection(self):
+        """Cleanup method for server shutdown."""
+        if self._background_task is not None:
+            self._background_task.cancel()
+            try:
+                await self._background_task
+            except asyncio.CancelledError:
+                pass
+            self._background_task = None
+        self._release_refresh()
+        if self._conn:
+            await self._conn.close()
+            self._conn = None
+
+RepoIndex = RepositoryIndexManager()
@@ -0,0 +1,275 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+import sqlite3
+import statistics
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+from config.settings import settings
+
+# numpy is imported where it is used: with the cache off it never loads
+if TYPE_CHECKING:
+    import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Words that carry the 'what about': capitalised names after the first word,
+# numbers and identifiers such as owner/repo or snake_case names
+_ENTITY = re.compile(
+    r"\b\w[\w.-]*/[\w.-]+"              # owner/repo
+    r"|\b\w+_\w[\w_]*"                   # snake_case identifiers
+    r"|(?<!^)(?<![.!?]\s)\b[A-Z][\w'-]*" # capitalised words not starting a sentence
+    r"|\b\d[\d.,:]*\b"                   # numbers, dates, times
+)
+
+
+def entities(question: str) -> frozenset:
+    """Lower-cased entity-like tokens of a question; two questions must share them to match."""
+    return frozenset(match.lower().rstrip(".,:") for match in _ENTITY.findall(question.strip()))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS semantic_cache (
+    id         INTEGER PRIMARY KEY AUTOINCREMENT,
+    question   TEXT NOT NULL,
+    answer     TEXT NOT NULL,
+    embedding  BLOB NOT NULL,
+    created_at REAL NOT NULL,
+    hits       INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+class SemanticCacheManager:
+    """
+    Serves cached answers for first-turn questions that are semantically close to
+    one answered before.
+
+    Questions are embedded with a small local CPU model (fastembed) and compared by
+    cosine similarity against an in-memory matrix of normalised embeddings, which
+    is persisted in SQLite. Only answers whose tool calls are all in
+    SEMANTIC_CACHE_TOOLS are stored (live data such as weather or web search
+    would be served stale), questions that mention a dangerous action never hit
+    the cache, and a close match that names different entities ('London' vs
+    'Paris', repo names, numbers) is treated as a miss.
+    """
+
+    def __init__(self, enabled: Optional[bool] = None, cache_name: str = None, db_folder: str = None):
+        self.enabled = settings.SEMANTIC_CACHE_ENABLED if enabled is None else enabled
+        self.threshold = settings.SEMANTIC_CACHE_THRESHOLD
+        self.ttl = settings.SEMANTIC_CACHE_TTL
+        self.max_entries = settings.SEMANTIC_CACHE_MAX_ENTRIES
+        self.model_name = settings.SEMANTIC_CACHE_MODEL
+        self.cache_name = cache_name or settings.SEMANTIC_CACHE_NAME
+        self.cacheable_tools = settings.SEMANTIC_CACHE_TOOLS
+        self.db_folder = db_folder or settings.DB_FOLDER_NAME
+
+        # Verbs of dangerous tools ('delete_repository' -> 'delete') guard the lookup
+        verbs = {name.split("_")[0] for name in settings.DANGEROUS_TOOLS}
+        self._dangerous_pattern = re.compile(
+            r"\b(" + "|".join(map(re.escape, sorted(verbs))) + r")\w*\b", re.IGNORECASE
+        ) if verbs else None
+
+        self._model = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._ids: List[int] = []
+        self._answers: List[str] = []
+        self._entities: List[frozenset] = []
+        self._created: List[float] = []
+        self._matrix: Optional[np.ndarray] = None
+
+        # Instrumentation
+        self.lookups = 0
+        self.hits = 0
+        self.skipped = 0
+        self.entity_mismatches = 0
+        self.stores = 0
+        self.false_hits = 0
+        self.hit_similarities: deque = deque(maxlen=500)
+
+    @property
+    def is_initialised(self) -> bool:
+        return self._conn is not None
+
+    def _load_model(self):
+        if self._model is None:
+            try:
+                from fastembed import TextEmbedding
+            except ImportError as e:
+                raise RuntimeError(
+                    "Semantic cache needs the optional 'fastembed' package: pip install fastembed"
+                ) from e
+            self._model = TextEmbedding(model_name=self.model_name)
+        return self._model
+
+    def _embed(self, text: str) -> np.ndarray:
+        import numpy as np
+        vector = np.asarray(next(iter(self._load_model().embed([text]))), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _initialization(self):
+        import numpy as np
+        folder = Path(__file__).resolve().parent.parent / self.db_folder
+        folder.mkdir(exist_ok=True)
+        self._conn = sqlite3.connect(folder / self.cache_name, check_same_thread=False)
+        # Every API worker opens the same file
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(f"PRAGMA busy_timeout={int(settings.DB_BUSY_TIMEOUT_MS)}")
+        self._conn.executescript(SCHEMA)
+        self._conn.execute("DELETE FROM semantic_cache WHERE created_at <= ?", (time.time() - self.ttl,))
+        self._conn.commit()
+
+        rows = self._conn.execute(
+            "SELECT id, answer, embedding, created_at, question FROM semantic_cache ORDER BY id"
+        ).fetchall()
+        self._ids = [row[0] for row in rows]
+        self._answers = [row[1] for row in rows]
+        self._created = [row[3] for row in rows]
+        self._entities = [entities(row[4]) for row in rows]
+        self._matrix = (
+            np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows]) if rows else None
+        )
+
+    async def initialize(self):
+        """Loads the embedding model and the persisted index off the event loop."""
+        if not self.enabled or self.is_initialised:
+            return
+        try:
+            await asyncio.to_thread(self._load_model)
+            await asyncio.to_thread(self._initialization)
+        except RuntimeError as e:
+            logger.warning("%s - semantic cache disabled", e)
+            self.enabled = False
+
+    def is_eligible(self, question: str) -> bool:
+        """Questions that may lead to a dangerous action are never answered from cache."""
+        return not (self._dangerous_pattern and self._dangerous_pattern.search(question))
+
+    def is_cacheable(self, tools_called: Iterable[str]) -> bool:
+        """A turn is reusable only if every tool it called is allowlisted (and not dangerous)."""
+        called = set(tools_called)
+        return called <= self.cacheable_tools and not called & settings.DANGEROUS_TOOLS
+
+    def _nearest(self, vector: np.ndarray) -> Optional[Tuple[int, float]]:
+        import numpy as np
+        with self._lock:
+            if self._matrix is None:
+                return None
+            similarities = self._matrix @ vector
+            best = int(np.argmax(similarities))
+            if self._created[best] <= time.time() - self.ttl:
+                return None
+            return best, float(similarities[best])
+
+    async def lookup(self, question: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns {'id', 'answer', 'similarity'} for a close enough cached question, else None.
+        """
+        if not self.enabled:
+            return None
+        self.lookups += 1
+        if not self.is_eligible(question):
+            self.skipped += 1
+            return None
+
+        vector = await asyncio.to_thread(self._embed, question)
+        nearest = self._nearest(vector)
+        if nearest is None or nearest[1] < self.threshold:
+            return None
+
+        index, similarity = nearest
+        with self._lock:
+            if self._entities[index] != entities(question):
+                self.entity_mismatches += 1
+                return None
+            entry_id, answer = self._ids[index], self._answers[index]
+            self._conn.execute("UPDATE semantic_cache SET hits = hits + 1 WHERE id = ?", (entry_id,))
+            self._conn.commit()
+        self.hits += 1
+        self.hit_similarities.append(similarity)
+        return {"id": entry_id, "answer": answer, "similarity": similarity}
+
+    def _insert(self, question: str, answer: str, vector: np.ndarray):
+        import numpy as np
+        with self._lock:
+            now = time.time()
+            cursor = self._conn.execute(
+                "INSERT INTO semantic_cache(question, answer, embedding, created_at) VALUES (?, ?, ?, ?)",
+                (question, answer, vector.astype(np.float32).tobytes(), now)
+            )
+            self._conn.commit()
+            self._ids.append(cursor.lastrowid)
+            self._answers.append(answer)
+            self._entities.append(entities(question))
+            self._created.append(now)
+            row = vector.reshape(1, -1)
+            self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+
+            # Oldest entries go first once the index is full
+            overflow = len(self._ids) - self.max_entries
+            if overflow > 0:
+                self._conn.executemany(
+                    "DELETE FROM semantic_cache WHERE id = ?", [(i,) for i in self._ids[:overflow]]
+                )
+                self._conn.commit()
+                self._ids = self._ids[overflow:]
+                self._answers = self._answers[overflow:]
+                self._entities = self._entities[overflow:]
+                self._created = self._created[overflow:]
+                self._matrix = self._matrix[overflow:]
+
+    async def store(self, question: str, answer: str, tools_called: Iterable[str] = ()):
+        if not self.enabled or not answer:
+            return
+        if not self.is_eligible(question) or not self.is_cacheable(tools_called):
+            return
+
+        vector = await asyncio.to_thread(self._embed, question)
+        await asyncio.to_thread(self._insert, question, answer, vector)
+        self.stores += 1
+
+    def report_false_hit(self, entry_id: int):
+        """Called when a served answer turned out wrong; the entry is evicted."""
+        import numpy as np
+        self.false_hits += 1
+        with self._lock:
+            if entry_id not in self._ids:
+                return
+            index = self._ids.index(entry_id)
+            del self._ids[index]
+            del self._answers[index]
+            del self._entities[index]
+            del self._created[index]
+            self._matrix = np.delete(self._matrix, index, axis=0) if len(self._ids) else None
+            self._conn.execute("DELETE FROM semantic_cache WHERE id = ?", (entry_id,))
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._ids),
+            "lookups": self.lookups,
+            "hits": self.hits,
+            "skipped": self.skipped,
+            "entity_mismatches": self.entity_mismatches,
+            "stores": self.stores,
+            "false_hits": self.false_hits,
+            "hit_ratio": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+            "false_hit_ratio": round(self.false_hits / self.hits, 4) if self.hits else 0.0,
+            "mean_hit_similarity": (
+                round(statistics.fmean(self.hit_similarities), 4) if self.hit_similarities else None
+            ),
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,6 +1,6 @@
 from fastmcp import FastMCP 
 from config.settings import settings
-from typing import Optional
+from typing import Optional, Callable, Any
 
 class ServerManager:
     def __init__(self, server_name: Optional[str] = None):
@@ -17,11 +17,21 @@ class ServerManager:
     def is_initialised(self) -> bool:
         return self._server is not None
 
-    def server_implementation(self, instructions: str = "") -> FastMCP:
-        """Initializes the FastMCP server instance."""
+    def server_implementation(
+        self,
+        instructions: str = "",
+        lifespan: Optional[Callable[[FastMCP], Any]] = None
+    ) -> FastMCP:
+        """
+        Initializes the FastMCP server instance.
+        `lifespan` is an async context manager factory run around the server's lifetime
+        (start background work / open pooled clients on enter, clean up on exit).
+        """
+        kwargs = {"lifespan": lifespan} if lifespan else {}
         self._server = FastMCP(
             name=self.server_name, 
-            instructions=instructions
+            instructions=instructions,
+            **kwargs
         )
         return self._server
     
\ No newline at end of file
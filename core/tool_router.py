@@ -0,0 +1,133 @@
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence
+
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
+from langchain_core.runnables import Runnable
+
+from config.settings import settings
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do for from get given how i if in into is it its me my "
+    "of on or please show that the this to use using want what when which with you your "
+    "args returns dict list str none true false default e g eg".split()
+)
+
+# Everyday words users type -> vocabulary the tool descriptions use
+_SYNONYMS = {
+    "repo": "repository",
+    "github": "repository",
+    "forecast": "weather",
+    "temperature": "weather",
+    "rain": "weather",
+    "news": "web",
+    "latest": "web",
+    "google": "search",
+    "lookup": "search",
+    "find": "search",
+}
+
+
+def _stem(token: str) -> str:
+    for suffix in ("ies", "ing", "es", "s"):
+        if token.endswith(suffix) and len(token) - len(suffix) >= 3:
+            return token[: -len(suffix)] + ("y" if suffix == "ies" else "")
+    return token
+
+
+def _tokens(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower().replace("_", " "))
+    stems = (_stem(w) for w in words if w not in _STOPWORDS and len(w) > 1)
+    return [_SYNONYMS.get(stem, stem) for stem in stems]
+
+
+class ToolRouter:
+    """
+    Picks the tools worth sending to the model for a turn.
+
+    Every tool is indexed by the words of its name (weighted higher) and
+    description, with IDF weighting so words shared by many tools count less.
+    The latest user message is scored against the index and the top
+    TOOL_ROUTER_TOP_K matching tools are bound, plus any tool already used in the
+    current turn so multi-step calls keep working. Bound runnables are cached per
+    tool subset, so a subset is only bound once.
+    """
+
+    def __init__(self, tools: Sequence[Any], enabled: Optional[bool] = None):
+        self.tools = list(tools)
+        self.enabled = settings.TOOL_ROUTER_ENABLED if enabled is None else enabled
+        self.top_k = settings.TOOL_ROUTER_TOP_K
+        self.always_include = frozenset(settings.TOOL_ROUTER_ALWAYS_INCLUDE) & {t.name for t in self.tools}
+        self.fallback_all = settings.TOOL_ROUTER_FALLBACK == "all"
+        self.all_names: FrozenSet[str] = frozenset(t.name for t in self.tools)
+        self._bound: Dict[tuple, Runnable] = {}
+        self._index = self._build_index()
+
+    def _build_index(self) -> Dict[str, Dict[str, float]]:
+        documents: Dict[str, Counter] = {}
+        for tool in self.tools:
+            counts = Counter(_tokens(tool.description or ""))
+            for token in _tokens(tool.name):
+                counts[token] += 3
+            documents[tool.name] = counts
+
+        document_frequency = Counter(token for counts in documents.values() for token in counts)
+        total = len(documents)
+        return {
+            name: {
+                token: count * (math.log((1 + total) / (1 + document_frequency[token])) + 1)
+                for token, count in counts.items()
+            }
+            for name, counts in documents.items()
+        }
+
+    def score(self, text: str) -> Dict[str, float]:
+        query = set(_tokens(text))
+        return {
+            name: sum(weights.get(token, 0.0) for token in query)
+            for name, weights in self._index.items()
+        }
+
+    @staticmethod
+    def _current_turn(messages: Sequence[BaseMessage]):
+        """Latest user text and the tools the model already called since then."""
+        used = set()
+        for message in reversed(messages):
+            if isinstance(message, HumanMessage):
+                return message.content if isinstance(message.content, str) else str(message.content), used
+            if isinstance(message, AIMessage):
+                used.update(tc["name"] for tc in message.tool_calls)
+        return "", used
+
+    def select(self, messages: Sequence[BaseMessage]) -> FrozenSet[str]:
+        if not self.enabled:
+            return self.all_names
+
+        text, used = self._current_turn(messages)
+        scores = self.score(text)
+        ranked = sorted(
+            (name for name, value in scores.items() if value > 0),
+            key=lambda name: scores[name],
+            reverse=True
+        )[: self.top_k]
+
+        selected = frozenset(ranked) | (used & self.all_names) | self.always_include
+        if not selected and self.fallback_all:
+            return self.all_names
+        return selected
+
+    def tools_for(self, names: FrozenSet[str]) -> List[Any]:
+        # Keep the original registration order so equal subsets bind identically
+        return [tool for tool in self.tools if tool.name in names]
+
+    def bind(self, llm: BaseChatModel, names: FrozenSet[str], key: Any = None) -> Runnable:
+        """Bound model for a subset of tools, cached per (key, subset)."""
+        cache_key = (key, tuple(sorted(names)))
+        bound = self._bound.get(cache_key)
+        if bound is None:
+            tools = self.tools_for(names)
+            bound = llm.bind_tools(tools) if tools else llm
+            self._bound[cache_key] = bound
+        return bound
@@ -0,0 +1,258 @@
+"""
+Lightweight span tracing for the agent's hot path.
+
+    with tracer.span("llm", kind="llm", model="llama-3.1-8b-instant") as span:
+        ...
+        span.set(output_tokens=42)
+
+Spans nest through a contextvar (so they follow asyncio tasks), are exported as
+OpenTelemetry-shaped JSON lines to TRACE_FILE and, with TRACE_EXPORTER=otel and
+the opentelemetry package installed, mirrored to the OpenTelemetry SDK.
+
+Render the per-turn breakdown of a trace file:
+
+    python -m core.tracing database/traces.jsonl [trace_id]
+"""
+import contextvars
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from config.settings import settings
+
+
+class Span:
+    __slots__ = ("name", "kind", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "status")
+
+    def __init__(self, name: str, kind: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.kind = kind
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.status = "OK"
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.time_ns()) - self.start_ns) / 1e6
+
+    def to_otel(self) -> Dict:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_id or "",
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "attributes": self.attributes,
+            "status": {"code": self.status},
+            "resource": {"process.pid": os.getpid()},
+        }
+
+    @classmethod
+    def from_otel(cls, record: Dict) -> "Span":
+        span = cls(record["name"], record["kind"], record["traceId"], record["parentSpanId"] or None,
+                   record.get("attributes", {}))
+        span.span_id = record["spanId"]
+        span.start_ns = record["startTimeUnixNano"]
+        span.end_ns = record["endTimeUnixNano"]
+        span.status = record.get("status", {}).get("code", "OK")
+        return span
+
+
+class _NoopSpan:
+    """Returned when tracing is off, so call sites never need to check."""
+
+    def set(self, **attributes: Any):
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Tracer:
+    def __init__(self, enabled: Optional[bool] = None, exporter: Optional[str] = None,
+                 trace_file: Optional[str] = None, keep_traces: Optional[int] = None):
+        self.enabled = settings.TRACING_ENABLED if enabled is None else enabled
+        self.exporter = settings.TRACE_EXPORTER if exporter is None else exporter
+        self.trace_file = trace_file or settings.TRACE_FILE
+        self.keep_traces = keep_traces or settings.TRACE_KEEP_TURNS
+        self._traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+        self._listeners: List[Callable[[Span], None]] = []
+        self._start_listeners: List[Callable[[Span], None]] = []
+        self._lock = threading.Lock()
+        self._file = None
+        self._otel = None
+        self.last_trace_id: Optional[str] = None
+
+    def add_listener(self, callback: Callable[[Span], None],
+                     on_start: Optional[Callable[[Span], None]] = None):
+        """callback(span) runs for every finished span, on_start(span) as it opens (metrics hook in here)."""
+        self._listeners.append(callback)
+        if on_start is not None:
+            self._start_listeners.append(on_start)
+
+    @property
+    def active(self) -> bool:
+        return self.enabled or bool(self._listeners)
+
+    def _otel_tracer(self):
+        if self._otel is None:
+            try:
+                from opentelemetry import trace
+                self._otel = trace.get_tracer("langgraph-chatbot")
+            except ImportError:
+                self._otel = False
+        return self._otel
+
+    def _write(self, span: Span):
+        path = Path(self.trace_file)
+        if not path.is_absolute():
+            path = Path(__file__).resolve().parent.parent / settings.DB_FOLDER_NAME / path
+        with self._lock:
+            if self._file is None:
+                path.parent.mkdir(exist_ok=True)
+                self._file = path.open("a", encoding="utf-8")
+            self._file.write(json.dumps(span.to_otel(), default=str) + "\n")
+            if span.parent_id is None:
+                self._file.flush()
+
+    def _finish(self, span: Span):
+        span.end_ns = time.time_ns()
+        for listener in self._listeners:
+            listener(span)
+        if not self.enabled:
+            return
+
+        with self._lock:
+            spans = self._traces.setdefault(span.trace_id, [])
+            spans.append(span)
+            self._traces.move_to_end(span.trace_id)
+            while len(self._traces) > self.keep_traces:
+                self._traces.popitem(last=False)
+        if span.parent_id is None:
+            self.last_trace_id = span.trace_id
+        if self.exporter == "file":
+            self._write(span)
+
+    @contextmanager
+    def span(self, name: str, /, kind: str = "internal", **attributes: Any):
+        if not self.active:
+            yield _NOOP
+            return
+
+        parent = _current.get()
+        span = Span(name, kind, parent.trace_id if parent else secrets.token_hex(16),
+                    parent.span_id if parent else None, attributes)
+        for listener in self._start_listeners:
+            listener(span)
+        # set(previous) instead of reset(token): async generators may finish in another context
+        _current.set(span)
+        otel = self._otel_tracer() if self.enabled and self.exporter == "otel" else None
+        otel_span = otel.start_as_current_span(name, attributes={"kind": kind, **attributes}) if otel else None
+        if otel_span is not None:
+            otel_span.__enter__()
+        exc_info = (None, None, None)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "ERROR"
+            span.attributes["error"] = repr(e)
+            exc_info = sys.exc_info()
+            raise
+        finally:
+            _current.set(parent)
+            if otel_span is not None:
+                # The exception reaches OpenTelemetry too (error status + exception event)
+                otel_span.__exit__(*exc_info)
+            self._finish(span)
+
+    def instrument(self, obj: Any, methods: Iterable[str], kind: str):
+        """Wraps async methods of an instance so every call is a span (e.g. checkpoint I/O)."""
+        def wrap(name: str, method: Callable):
+            async def traced(*args, **kwargs):
+                with self.span(f"{kind}.{name}", kind=kind):
+                    return await method(*args, **kwargs)
+            return traced
+
+        for name in methods:
+            setattr(obj, name, wrap(name, getattr(obj, name)))
+
+    def spans(self, trace_id: Optional[str] = None) -> List[Span]:
+        with self._lock:
+            return list(self._traces.get(trace_id or self.last_trace_id, []))
+
+    def render(self, trace_id: Optional[str] = None) -> str:
+        return render_breakdown(self.spans(trace_id))
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def render_breakdown(spans: List[Span]) -> str:
+    """Span tree of one turn plus time per kind (self time, so nested spans are not counted twice)."""
+    if not spans:
+        return "(no spans)"
+
+    children: Dict[Optional[str], List[Span]] = defaultdict(list)
+    ids = {span.span_id for span in spans}
+    for span in sorted(spans, key=lambda s: s.start_ns):
+        children[span.parent_id if span.parent_id in ids else None].append(span)
+
+    roots = children[None]
+    total_ms = sum(root.duration_ms for root in roots) or 1.0
+    lines = [f"trace {spans[0].trace_id}  total {total_ms:.1f} ms"]
+    self_time: Dict[str, float] = defaultdict(float)
+
+    def walk(span: Span, depth: int):
+        nested_ms = sum(child.duration_ms for child in children[span.span_id])
+        self_time[span.kind] += max(span.duration_ms - nested_ms, 0.0)
+        detail = ", ".join(f"{k}={v}" for k, v in span.attributes.items() if k != "error")
+        flag = " !" if span.status == "ERROR" else ""
+        lines.append(f"{'  ' * depth}{span.name:<{40 - 2 * depth}} {span.duration_ms:>9.1f} ms{flag}  {detail}")
+        for child in children[span.span_id]:
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+
+    lines.append("")
+    # Concurrent spans (parallel tools) overlap, so shares can add up to more than 100%
+    lines.append(f"{'kind':<8}{'self ms':>10}{'share':>8}")
+    for kind, ms in sorted(self_time.items(), key=lambda item: item[1], reverse=True):
+        lines.append(f"{kind:<8}{ms:>10.1f}{ms / total_ms:>8.0%}")
+    return "\n".join(lines)
+
+
+tracer = Tracer()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        sys.exit("usage: python -m core.tracing TRACE_FILE [TRACE_ID]")
+    traces: "OrderedDict[str, List[Span]]" = OrderedDict()
+    with open(sys.argv[1], encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = Span.from_otel(json.loads(line))
+                traces.setdefault(span.trace_id, []).append(span)
+    wanted = sys.argv[2] if len(sys.argv) > 2 else next(reversed(traces), None)
+    print(render_breakdown(traces.get(wanted, [])))
@@ -1,7 +1,9 @@
 import asyncio
 from core.agent_manager import Agent_Manager
 from langgraph.types import Command
-from langchain_core.messages import ToolMessage
+from config.settings import settings
+from core.metrics import metrics
+from core.tracing import tracer
 
 async def main():
     manager = Agent_Manager()
@@ -16,70 +18,56 @@ async def main():
         if user_input.lower() in ["exit", "quit"]: break
         if not user_input: continue
 
-        # 1. Initial execution (AI thinking and deciding)
-        async for event in agent.astream({"messages": [("user", user_input)]}, config, stream_mode="updates"):
-            for node_name, output in event.items():
-                if node_name == "agent":
-                    msg = output["messages"][-1]
-                    if msg.content:
-                        print(f"AI: {msg.content}")
+        # 1. Run the graph; safe tools execute without stopping
+        graph_input = {"messages": [("user", user_input)]}
 
-        # 2. HITL (Human-In-The-Loop) Logic
-        state = await agent.aget_state(config)
-        
-        # This 'while' loop catches tool calls even if there are multiple in a row
-        while state.next and "tools" in state.next:
-            last_ai_msg = state.values["messages"][-1]
-            
-            for tool_call in last_ai_msg.tool_calls:
-                t_name = tool_call["name"]
-                t_args = tool_call["args"]
-                t_id = tool_call["id"]
+        # 2. HITL (Human-In-The-Loop): the graph only pauses for dangerous tools.
+        # This 'while' loop catches them even if there are several steps in a row
+        trace_ids = []
+        while graph_input is not None:
+            approval_request = None
+            # Human think-time is kept out of the trace: one span per graph run
+            with tracer.span("turn", kind="turn", thread_id=thread_id):
+                async for event in agent.astream(graph_input, config, stream_mode="updates"):
+                    for node_name, output in event.items():
+                        if node_name == "__interrupt__":
+                            approval_request = output[0].value
+                        elif node_name == "agent":
+                            msg = output["messages"][-1]
+                            if msg.content:
+                                print(f"AI: {msg.content}")
+                            for tool_call in msg.tool_calls:
+                                if tool_call["name"] not in settings.DANGEROUS_TOOLS:
+                                    print(f"🚀 Running {tool_call['name']}...")
+            trace_ids.append(tracer.last_trace_id)
 
-                # --- GUARDRAIL: Limit repository lists to keep terminal clean ---
-                if t_name == "list_repositories" and t_args.get("limit", 0) > 10:
-                    t_args["limit"] = 10
+            graph_input = None
+            if approval_request is None:
+                break
 
-                # --- SECURITY CHECK: Dangerous Actions ---
-                if t_name in ["delete_repository", "create_repository"]:
-                    print(f"\n🛑 [SECURITY CHECK]: AI wants to {t_name}")
-                    print(f"Details: {t_args}")
-                    confirm = input("Allow this? (y/n): ").lower()
+            # --- SECURITY CHECK: Dangerous Actions ---
+            approvals = {}
+            for tool_call in approval_request["tool_calls"]:
+                print(f"\n🛑 [SECURITY CHECK]: AI wants to {tool_call['name']}")
+                print(f"Details: {tool_call['args']}")
+                confirm = input("Allow this? (y/n): ").lower()
+                approvals[tool_call["id"]] = confirm == 'y'
 
-                    if confirm != 'y':
-                        # STEP 1: Create the "Injection" message to tell the AI it was denied
-                        reject_msg = ToolMessage(
-                            tool_call_id=t_id,
-                            name=t_name,
-                            content=f"USER DENIED: The human user has explicitly rejected the {t_name} action for security reasons. Acknowledge this and stop."
-                        )
-                        
-                        # STEP 2: Update the state ACTING AS the 'tools' node
-                        # This skips the real GitHub call and records the rejection
-                        await agent.aupdate_state(config, {"messages": [reject_msg]}, as_node="tools")
-                        
-                        print("System: Action blocked. Informing AI...")
-                        
-                        # STEP 3: Let the AI respond to the rejection
-                        async for update in agent.astream(None, config, stream_mode="updates"):
-                            if "agent" in update:
-                                final_msg = update["agent"]["messages"][-1]
-                                if final_msg.content:
-                                    print(f"AI: {final_msg.content}")
-                        break # Break out of the tool loop for this rejection
-                
-                # --- EXECUTION: If approved or safe tool ---
-                print(f"🚀 Running {t_name}...")
-                async for update in agent.astream(Command(resume=True), config, stream_mode="updates"):
-                    if "agent" in update:
-                        final_msg = update["agent"]["messages"][-1]
-                        if final_msg.content:
-                            print(f"AI: {final_msg.content}")
+                if not approvals[tool_call["id"]]:
+                    # The tools node answers denied calls with a "USER DENIED" message
+                    print("System: Action blocked. Informing AI...")
 
-            # Refresh state to see if the AI wants to do anything else
-            state = await agent.aget_state(config)
+            # --- EXECUTION: one resume runs all safe/approved calls of the step ---
+            graph_input = Command(resume=approvals)
 
-    await manager.database_manager.close_connection()
+        # One trace per graph run: the first one plus one per approval round
+        if tracer.enabled:
+            for trace_id in trace_ids:
+                print(tracer.render(trace_id))
+
+    await manager.close()
+    await metrics.close()
+    tracer.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
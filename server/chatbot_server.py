@@ -1,6 +1,7 @@
 
 import sys
 from pathlib import Path
+from contextlib import asynccontextmanager
 
 # Add parent directory to sys.path for modular imports
 parent_dir = Path(__file__).resolve().parent.parent
@@ -8,22 +9,46 @@ if str(parent_dir) not in sys.path:
     sys.path.insert(0, str(parent_dir))
 
 from core.server_manager import ServerManager
+from config.settings import settings
 from tools.search_tool import search_web_tavily
+from tools.batch_search import search_web_batch
 from tools.weather import get_weather
+from tools.batch_weather import get_weather_batch
+from client.tavily_manager import TavilyObj
+from client.weather_manager import WeatherObj
 
 # 1. Initialize Manager
 manager = ServerManager()
 
+
+@asynccontextmanager
+async def lifespan(server):
+    # Pooled keep-alive HTTP clients live as long as the server process, which the
+    # agent keeps running through its persistent MCP session (MCP_PERSISTENT_SESSIONS).
+    # A missing key is reported by the tool call itself rather than killing the server.
+    if settings.TAVILY_API_KEY:
+        TavilyObj.client_initialization()
+    WeatherObj.client_initialization()
+    try:
+        yield
+    finally:
+        await TavilyObj.close()
+        await WeatherObj.close()
+
+
 # 2. Create Server Instance
 # The 'instructions' help the LLM understand when to use this specific server
 mcp = manager.server_implementation(
-    instructions="Use these tools to fetch real-time weather and perform web searches."
+    instructions="Use these tools to fetch real-time weather and perform web searches.",
+    lifespan=lifespan
 )
 
 # 3. Tool Registration
 # FastMCP automatically handles 'async def' functions correctly
 mcp.tool(name="search_web_tavily")(search_web_tavily)
+mcp.tool(name="search_web_batch")(search_web_batch)
 mcp.tool(name="get_weather")(get_weather)
+mcp.tool(name="get_weather_batch")(get_weather_batch)
 
 if __name__ == "__main__":
     # run() starts the stdio transport by default, which is perfect for your ClientManager
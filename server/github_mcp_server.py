@@ -1,6 +1,7 @@
 
 import sys
 from pathlib import Path
+from contextlib import asynccontextmanager
 
 # Add parent directory to sys.path for modular imports
 parent_dir = Path(__file__).resolve().parent.parent
@@ -12,15 +13,32 @@ from config.settings import settings
 from tools.delete_repository import delete_repository
 from tools.create_repository import create_repository 
 from tools.list_repositories import list_repositories 
+from tools.describe_repositories import describe_repositories
+from tools.summarize_repositories import summarize_repositories
+from tools.search_repository_index import search_repository_index
+from core.repository_index_manager import RepoIndex
+from client.github_manager import GithubObj
 
 # 1. Initialize Manager
 manager = ServerManager(server_name=settings.GITHUB_SERVER_NAME)
 
 
+@asynccontextmanager
+async def lifespan(server):
+    # Keep the local repository index fresh while the server is alive
+    RepoIndex.start_background_refresh()
+    try:
+        yield
+    finally:
+        await RepoIndex.close_connection()
+        await GithubObj.close()
+
+
 # 2. Create Server Instance
 # The 'instructions' help the LLM understand when to use this specific server
 mcp = manager.server_implementation(
-    instructions="GitHub tools for AI agents - Create, Read, Delete repos & more"
+    instructions="GitHub tools for AI agents - Create, Read, Delete repos & more",
+    lifespan=lifespan
 )
 
 # 3. Tool Registration
@@ -28,6 +46,9 @@ mcp = manager.server_implementation(
 mcp.tool(name="delete_repository")(delete_repository)
 mcp.tool(name="create_repository")(create_repository)
 mcp.tool(name="list_repositories")(list_repositories)
+mcp.tool(name="describe_repositories")(describe_repositories)
+mcp.tool(name="summarize_repositories")(summarize_repositories)
+mcp.tool(name="search_repository_index")(search_repository_index)
     
 if __name__ == '__main__':
     mcp.run(transport='stdio')
@@ -0,0 +1,17 @@
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) in sys.path:
+    sys.path.remove(str(ROOT))
+sys.path.insert(0, str(ROOT))
+
+# pytest puts test/ first again for every test module; importing the package now keeps
+# `client` from resolving to the test/client.py script
+import client  # noqa: E402,F401
+
+# Settings are read at import time; the example file supplies every required value
+# without overriding a developer's real environment
+load_dotenv(ROOT / ".env.example")
@@ -0,0 +1,26 @@
+import asyncio
+
+from langchain_core.tools import tool
+
+from core.agent_manager import Agent_Manager
+
+
+def test_repository_lists_are_capped_at_ten():
+    @tool
+    def list_repositories(limit: int = 5) -> str:
+        """Lists repositories."""
+        return f"limit={limit}"
+
+    # Only the tool registry is needed to run a single call
+    manager = object.__new__(Agent_Manager)
+    manager._tools_by_name = {"list_repositories": list_repositories}
+
+    async def main():
+        call = {"name": "list_repositories", "args": {"limit": 50}, "id": "call-1"}
+        message = await manager._run_tool_call(call, {})
+        return call, message
+
+    call, message = asyncio.run(main())
+    assert message.content == "limit=10"
+    # The model's own tool call in the history is left untouched
+    assert call["args"]["limit"] == 50
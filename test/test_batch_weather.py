@@ -0,0 +1,33 @@
+import asyncio
+import json
+
+from tools import batch_weather
+
+
+def _row(city: str) -> dict:
+    return {"city": city, "country": "XX", "temperature": 10, "conditions": "clear", "humidity": 50}
+
+
+def test_duplicate_cities_are_fetched_once_and_mapped_back(monkeypatch):
+    names = []
+    id_batches = []
+
+    async def fake_by_name(city):
+        names.append(city)
+        return _row(city.title())
+
+    async def fake_by_ids(city_ids):
+        id_batches.append(list(city_ids))
+        return {2643743: _row("London")}
+
+    monkeypatch.setattr(batch_weather, "get_weather_data", fake_by_name)
+    monkeypatch.setattr(batch_weather, "get_weather_by_ids", fake_by_ids)
+
+    result = json.loads(asyncio.run(batch_weather.get_weather_batch(
+        ["Paris", " paris ", "New  York", 2643743, "2643743", 42, ""]
+    )))
+
+    assert names == ["paris", "new york"]
+    assert id_batches == [[2643743, 42]]
+    assert [row[0] for row in result["rows"]] == ["Paris", "Paris", "New York", "London", "London"]
+    assert result["errors"] == ["id 42: not found"]
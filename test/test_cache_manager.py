@@ -0,0 +1,83 @@
+import asyncio
+
+import pytest
+
+from core import cache_manager
+from core.cache_manager import TTLCache
+
+
+def test_get_or_set_coalesces_concurrent_misses():
+    cache = TTLCache("test", ttl=60, max_size=10)
+    calls = 0
+
+    async def factory():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_set("key", factory) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert calls == 1
+    assert cache.coalesced == 4
+
+
+def test_factory_errors_reach_every_waiter_and_are_not_cached():
+    cache = TTLCache("test", ttl=60, max_size=10)
+
+    async def failing():
+        await asyncio.sleep(0.01)
+        raise ValueError("upstream down")
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_set("key", failing) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, ValueError) for r in results)
+    assert cache.get("key") is None
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_manager.time, "time", lambda: now[0])
+    cache = TTLCache("test", ttl=10, max_size=10)
+
+    cache.set("key", "value")
+    now[0] += 9
+    assert cache.get("key") == "value"
+    now[0] += 2
+    assert cache.get("key") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_lru_eviction_keeps_recently_used():
+    cache = TTLCache("test", ttl=60, max_size=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_persistent_tier_survives_a_new_instance(tmp_path):
+    cache = TTLCache("test", ttl=60, max_size=10, persist_name="cache.db", db_folder=str(tmp_path))
+    cache.set("key", {"answer": 42})
+    cache.close()
+
+    reopened = TTLCache("test", ttl=60, max_size=10, persist_name="cache.db", db_folder=str(tmp_path))
+    assert reopened.get("key") == {"answer": 42}
+    reopened.close()
+
+
+@pytest.mark.parametrize("ttl", [0, -1])
+def test_non_positive_ttl_is_never_served(ttl):
+    cache = TTLCache("test", ttl=60, max_size=10)
+    cache.set("key", "value", ttl=ttl)
+    assert cache.get("key") is None
@@ -0,0 +1,64 @@
+import asyncio
+import os
+import sys
+import textwrap
+
+from client.client_manager import ClientManager
+
+# A one-tool server reporting its process id, so a test can see whether calls share it
+PID_SERVER = textwrap.dedent("""
+    import os
+    from fastmcp import FastMCP
+
+    mcp = FastMCP(name="pid")
+
+    @mcp.tool(name="server_pid")
+    def server_pid() -> int:
+        return os.getpid()
+
+    if __name__ == "__main__":
+        mcp.run(show_banner=False)
+""")
+
+
+class _PidClientManager(ClientManager):
+    def __init__(self, script: str, persistent: bool):
+        super().__init__(persistent=persistent)
+        self.script = script
+
+    def client_initialization(self):
+        from langchain_mcp_adapters.client import MultiServerMCPClient
+
+        self._serverState = {
+            "pid": {"transport": "stdio", "command": sys.executable, "args": [self.script], "env": dict(os.environ)}
+        }
+        self._client = MultiServerMCPClient(self._serverState)
+        return self._client
+
+
+def _pids(tmp_path, persistent: bool):
+    script = tmp_path / "pid_server.py"
+    script.write_text(PID_SERVER)
+
+    async def main():
+        manager = _PidClientManager(str(script), persistent)
+        (tool,) = await manager.get_client_tools()
+        try:
+            # MCP tools answer with content blocks; the text one holds the pid
+            return [(await tool.ainvoke({}))[0]["text"] for _ in range(2)], tool.metadata
+        finally:
+            await manager.close()
+
+    return asyncio.run(main())
+
+
+def test_persistent_session_reuses_one_server_process(tmp_path):
+    (first, second), metadata = _pids(tmp_path, persistent=True)
+    assert first == second
+    assert (metadata["mcp_server"], metadata["mcp_spawn"]) == ("pid", False)
+
+
+def test_without_persistent_sessions_every_call_spawns(tmp_path):
+    (first, second), metadata = _pids(tmp_path, persistent=False)
+    assert first != second
+    assert metadata["mcp_spawn"] is True
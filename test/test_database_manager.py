@@ -0,0 +1,93 @@
+import asyncio
+
+import aiosqlite
+
+from core.database_manager import Database_Manager
+
+
+def _row(turn_id: str, thread_id: str, model, **values):
+    row = {
+        "turn_id": turn_id, "thread_id": thread_id, "model": model, "input_tokens": 0,
+        "output_tokens": 0, "context_tokens": 0, "llm_calls": 0, "cache_hits": 0,
+        "tool_calls": 0, "llm_ms": 0.0, "cancelled_input_tokens": 0,
+    }
+    row.update(values)
+    return row
+
+
+async def _ledger(tmp_path) -> Database_Manager:
+    manager = Database_Manager("ledger.db", str(tmp_path))
+    manager.ledger_enabled = True
+    # database_initialization() places the file under the repo; use the temp dir instead
+    manager._conn = await aiosqlite.connect(tmp_path / "ledger.db")
+    await manager.ledger_initialization()
+    return manager
+
+
+def test_aggregates_count_turns_once_across_model_rows(tmp_path):
+    async def main():
+        manager = await _ledger(tmp_path)
+        # Turn 1 planned on the strong model and answered on the fast one
+        await manager.record_turn([
+            _row("t1", "a", "strong", input_tokens=100, output_tokens=10, context_tokens=100, llm_calls=1,
+                 cancelled_input_tokens=100),
+            _row("t1", "a", "fast", input_tokens=150, output_tokens=20, context_tokens=150, llm_calls=1,
+                 tool_calls=2, latency_ms=900.0, tool_ms=300.0),
+        ])
+        await manager.record_turn([
+            _row("t2", "a", "fast", input_tokens=50, output_tokens=5, context_tokens=50, llm_calls=1,
+                 latency_ms=100.0),
+        ])
+        await manager.record_turn([_row("t3", "b", None, cache_hits=1, latency_ms=1.0)])
+
+        by_thread = {row["thread_id"]: row for row in await manager.ledger_by_thread()}
+        by_model = {row["model"]: row for row in await manager.ledger_by_model()}
+        by_day = await manager.ledger_by_day()
+        thread_rows = await manager.thread_ledger("a")
+        await manager.close_connection()
+        return by_thread, by_model, by_day, thread_rows
+
+    by_thread, by_model, by_day, thread_rows = asyncio.run(main())
+
+    a = by_thread["a"]
+    assert (a["turns"], a["input_tokens"], a["output_tokens"]) == (2, 300, 35)
+    assert (a["max_context_tokens"], a["llm_calls"], a["tool_calls"]) == (150, 3, 2)
+    assert a["cancelled_input_tokens"] == 100
+    # Latency is a per-turn figure: rows without it do not drag the average down
+    assert a["avg_latency_ms"] == 500.0
+    assert list(by_thread) == ["a", "b"]
+
+    assert by_model["strong"]["turns"] == 1 and by_model["strong"]["input_tokens"] == 100
+    assert by_model["fast"]["turns"] == 2 and by_model["fast"]["input_tokens"] == 200
+    assert by_model[None]["cache_hits"] == 1
+
+    assert len(by_day) == 1 and by_day[0]["turns"] == 3
+    assert [row["model"] for row in thread_rows] == ["strong", "fast", "fast"]
+
+
+def test_old_ledger_gets_the_new_columns(tmp_path):
+    async def main():
+        conn = await aiosqlite.connect(tmp_path / "ledger.db")
+        await conn.execute(
+            "CREATE TABLE turn_ledger (id INTEGER PRIMARY KEY, created_at TEXT NOT NULL, thread_id TEXT NOT NULL, "
+            "model TEXT, input_tokens INTEGER NOT NULL DEFAULT 0, output_tokens INTEGER NOT NULL DEFAULT 0, "
+            "context_tokens INTEGER NOT NULL DEFAULT 0, llm_calls INTEGER NOT NULL DEFAULT 0, "
+            "cache_hits INTEGER NOT NULL DEFAULT 0, tool_calls INTEGER NOT NULL DEFAULT 0, "
+            "latency_ms REAL, llm_ms REAL, tool_ms REAL)"
+        )
+        # Two rows from before turn_id: each one counts as a turn
+        await conn.executemany(
+            "INSERT INTO turn_ledger (created_at, thread_id, model, input_tokens) VALUES (?, ?, ?, ?)",
+            [("2026-01-01T00:00:00+00:00", "a", "m", 10), ("2026-01-01T00:00:01+00:00", "a", "m", 20)]
+        )
+        await conn.commit()
+        await conn.close()
+
+        manager = await _ledger(tmp_path)
+        await manager.record_turn([_row("t1", "a", "m", input_tokens=5)])
+        rows = await manager.ledger_by_thread()
+        await manager.close_connection()
+        return rows
+
+    (row,) = asyncio.run(main())
+    assert (row["turns"], row["input_tokens"], row["cancelled_input_tokens"]) == (3, 35, 0)
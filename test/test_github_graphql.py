@@ -0,0 +1,25 @@
+from tools.github_graphql import REPOSITORY_FIELDS, normalize_repository
+
+
+def test_unlicensed_repository_gets_empty_strings():
+    fields = ["name", "license", "language", "default_branch", "description", "topics"]
+    for node in (
+        {"nameWithOwner": "me/a", "licenseInfo": None, "primaryLanguage": None, "defaultBranchRef": None},
+        {"nameWithOwner": "me/b", "licenseInfo": {"spdxId": None}, "primaryLanguage": {"name": None}},
+    ):
+        repo = normalize_repository(node, fields)
+        assert repo["license"] == ""
+        assert repo["language"] == ""
+        assert repo["default_branch"] == ""
+        assert repo["description"] == ""
+        assert repo["topics"] == []
+
+
+def test_licensed_repository_keeps_its_spdx_id():
+    node = {"nameWithOwner": "me/a", "licenseInfo": {"spdxId": "MIT"}}
+    assert normalize_repository(node, ["name", "license"]) == {"name": "me/a", "license": "MIT"}
+
+
+def test_every_field_normalizes_from_an_empty_node():
+    repo = normalize_repository({}, list(REPOSITORY_FIELDS))
+    assert None not in (value for key, value in repo.items() if key != "name")
@@ -0,0 +1,99 @@
+import asyncio
+from collections import deque
+
+import pytest
+
+from core.hedging import HedgedCaller
+
+
+def _caller(**overrides) -> HedgedCaller:
+    options = dict(timeout=5, enabled=True, percentile=0.5, budget=1.0, min_samples=3)
+    options.update(overrides)
+    return HedgedCaller(**options)
+
+
+def _factory(latencies, start=False):
+    """Attempt n sleeps latencies[n] seconds and answers with its index."""
+    calls = []
+
+    async def factory(attempt):
+        index = len(calls)
+        calls.append(attempt.hedge)
+        if start:
+            attempt.start()
+        await asyncio.sleep(latencies[index])
+        return index
+
+    return factory, calls
+
+
+def test_no_hedge_until_enough_samples():
+    caller = _caller()
+    factory, calls = _factory([0.05])
+    assert asyncio.run(caller.call(factory)) == 0
+    assert calls == [False]
+    assert caller.hedge_delay("default") is None
+
+
+def test_slow_primary_is_hedged_and_the_hedge_wins():
+    caller = _caller()
+    caller._latencies["default"] = deque([0.01, 0.01, 0.01])
+    factory, calls = _factory([1.0, 0.01])
+
+    result = asyncio.run(caller.call(factory))
+    assert result == 1
+    assert calls == [False, True]
+    assert (caller.hedges, caller.hedge_wins) == (1, 1)
+
+
+def test_cancelled_loser_is_recorded_as_a_censored_sample():
+    caller = _caller()
+    caller._latencies["default"] = deque([0.01, 0.01, 0.01])
+    factory, _ = _factory([1.0, 0.01], start=True)
+
+    asyncio.run(caller.call(factory))
+    samples = list(caller._latencies["default"])
+    # The hedge's own latency plus the primary's time in flight when it was cancelled
+    assert len(samples) == 5
+    assert max(samples) >= 0.01
+
+
+def test_time_before_start_is_not_counted():
+    caller = _caller()
+
+    async def factory(attempt):
+        await asyncio.sleep(0.1)  # e.g. waiting for a limiter slot
+        attempt.start()
+        return "ok"
+
+    asyncio.run(caller.call(factory))
+    assert caller._latencies["default"][0] < 0.05
+
+
+def test_hedge_false_keeps_a_single_attempt():
+    caller = _caller()
+    caller._latencies["default"] = deque([0.01, 0.01, 0.01])
+    factory, calls = _factory([0.1])
+
+    assert asyncio.run(caller.call(factory, hedge=False)) == 0
+    assert calls == [False]
+    assert (caller.hedges, caller.hedges_skipped) == (0, 1)
+
+
+def test_budget_caps_hedges():
+    caller = _caller(budget=0.0)
+    caller._latencies["default"] = deque([0.01, 0.01, 0.01])
+    factory, calls = _factory([0.05])
+
+    asyncio.run(caller.call(factory))
+    assert calls == [False]
+    assert caller.budget_denied == 1
+
+
+def test_deadline_raises_timeout():
+    caller = _caller(timeout=0.05, enabled=False)
+    factory, _ = _factory([1.0])
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(caller.call(factory))
+    assert caller.timeouts == 1
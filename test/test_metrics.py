@@ -0,0 +1,93 @@
+import asyncio
+
+from core.metrics import MetricsRegistry
+from core.tracing import Span
+
+
+def _finished(name: str, kind: str, duration_ms: float, status: str = "OK", **attributes) -> Span:
+    span = Span(name, kind, "t" * 32, None, attributes)
+    span.end_ns = span.start_ns + int(duration_ms * 1e6)
+    span.status = status
+    return span
+
+
+def test_counter_and_gauge_lines_with_escaped_labels():
+    registry = MetricsRegistry()
+    counter = registry.counter("things_total", "Things", ["name"])
+    counter.inc(2, 'a"b\\c')
+    counter.inc(1, 'a"b\\c')
+
+    text = registry.render()
+    assert "# HELP things_total Things\n# TYPE things_total counter\n" in text
+    assert 'things_total{name="a\\"b\\\\c"} 3.0' in text
+    # Metrics without samples are left out entirely
+    assert "agent_turns_total" not in text
+
+
+def test_histogram_buckets_are_cumulative():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("wait_seconds", "Wait", buckets=(0.1, 1.0))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    lines = registry.render().splitlines()
+    assert 'wait_seconds_bucket{le="0.1"} 1.0' in lines
+    assert 'wait_seconds_bucket{le="1.0"} 2.0' in lines
+    assert 'wait_seconds_bucket{le="+Inf"} 3.0' in lines
+    assert "wait_seconds_count 3.0" in lines
+    assert "wait_seconds_sum 5.55" in lines
+
+
+def test_spans_feed_turn_llm_and_tool_series():
+    registry = MetricsRegistry()
+    turn = _finished("turn", "turn", 120)
+    registry._on_start(turn)
+    assert "agent_turns_in_flight 1.0" in registry.render()
+
+    registry._on_finish(_finished("llm", "llm", 80, model="m", route="fast", input_tokens=10, output_tokens=3))
+    registry._on_finish(_finished("tool", "tool", 20, "ERROR", tool="get_weather"))
+    registry._on_finish(turn)
+
+    text = registry.render()
+    assert "agent_turns_in_flight 0.0" in text
+    assert 'agent_turns_total{status="ok"} 1.0' in text
+    assert 'llm_tokens_total{model="m",direction="input"} 10.0' in text
+    assert 'llm_request_duration_seconds_count{model="m",route="fast"} 1.0' in text
+    assert 'tool_calls_total{tool="get_weather",status="error"} 1.0' in text
+
+
+def test_failing_collector_does_not_break_the_scrape():
+    registry = MetricsRegistry()
+    registry.add_collector(lambda: 1 / 0)
+    registry.turns.inc(1, "ok")
+    assert 'agent_turns_total{status="ok"} 1.0' in registry.render()
+
+
+def test_endpoint_serves_metrics_and_drops_silent_clients(monkeypatch):
+    monkeypatch.setattr("core.metrics.READ_TIMEOUT", 0.1)
+    registry = MetricsRegistry()
+    registry.turns.inc(1, "ok")
+
+    async def main():
+        # serve() treats port 0 as "disabled", so bind an ephemeral port directly
+        registry._server = await asyncio.start_server(registry._handle, "127.0.0.1", 0)
+        port = registry._server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"GET /metrics HTTP/1.1\r\nHost: x\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+
+            # Connects and says nothing: closed after READ_TIMEOUT instead of hanging
+            silent_reader, silent_writer = await asyncio.open_connection("127.0.0.1", port)
+            leftover = await asyncio.wait_for(silent_reader.read(), timeout=2)
+            silent_writer.close()
+            return response, leftover
+        finally:
+            await registry.close()
+
+    response, leftover = asyncio.run(main())
+    assert response.startswith(b"HTTP/1.1 200 OK")
+    assert b'agent_turns_total{status="ok"} 1.0' in response
+    assert leftover == b""
@@ -0,0 +1,48 @@
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from core.model_router import ROUTE_FAST, ROUTE_STRONG, ModelRouter
+
+
+def _tool_step(request: str, status: str = "success"):
+    return [
+        HumanMessage(content=request),
+        AIMessage(content="", tool_calls=[{"name": "list_repositories", "args": {}, "id": "call-1"}]),
+        ToolMessage(content="[...]", tool_call_id="call-1", name="list_repositories", status=status),
+    ]
+
+
+def test_disabled_router_always_uses_strong_model():
+    router = ModelRouter(enabled=False)
+    assert router.route([HumanMessage(content="hi")]) == ROUTE_STRONG
+
+
+def test_greeting_goes_to_fast_model():
+    assert ModelRouter(enabled=True).route([HumanMessage(content="thanks!")]) == ROUTE_FAST
+
+
+def test_complex_request_stays_strong_after_tool_results():
+    router = ModelRouter(enabled=True)
+    messages = _tool_step("List my repos and then delete the archived ones")
+    assert router.route(messages) == ROUTE_STRONG
+
+
+def test_simple_request_summarizes_tool_results_on_fast_model():
+    router = ModelRouter(enabled=True)
+    assert router.route(_tool_step("List my repos")) == ROUTE_FAST
+
+
+def test_failed_tool_result_goes_back_to_strong_model():
+    router = ModelRouter(enabled=True)
+    assert router.route(_tool_step("List my repos", status="error")) == ROUTE_STRONG
+
+
+def test_first_heuristic_with_a_decision_wins():
+    router = ModelRouter(
+        heuristics=[lambda m: None, lambda m: ROUTE_FAST, lambda m: ROUTE_STRONG], enabled=True
+    )
+    assert router.route([HumanMessage(content="anything")]) == ROUTE_FAST
+
+
+def test_abstaining_heuristics_fall_back_to_default():
+    router = ModelRouter(heuristics=[lambda m: None], enabled=True, default=ROUTE_FAST)
+    assert router.route([HumanMessage(content="anything")]) == ROUTE_FAST
@@ -0,0 +1,58 @@
+import json
+
+from tools import output_budget
+from tools.output_budget import fit_to_budget, snippet
+
+
+def _size(payload):
+    return len(json.dumps(payload, ensure_ascii=False, separators=(",", ":")))
+
+
+def _repos(n):
+    return [{"name": f"user/repo-{i}", "description": "x" * 40} for i in range(n)]
+
+
+def test_payload_under_budget_is_returned_unchanged(monkeypatch):
+    monkeypatch.setitem(output_budget._TOOL_LIMITS, "tool", 10_000)
+    payload = {"status": "success", "count": 3, "repos": _repos(3)}
+    assert fit_to_budget("tool", payload, list_key="repos") is payload
+
+
+def test_trimmed_list_reports_returned_count_and_total(monkeypatch):
+    monkeypatch.setitem(output_budget._TOOL_LIMITS, "tool", 400)
+    payload = {"status": "success", "count": 20, "repos": _repos(20)}
+
+    fitted = fit_to_budget("tool", payload, list_key="repos")
+
+    assert _size(fitted) <= 400
+    assert fitted["truncated"] is True
+    assert fitted["count"] == len(fitted["repos"]) < 20
+    assert fitted["total"] == 20
+    assert fitted["omitted"] == 20 - fitted["count"]
+    # Ranked results: the first items are the ones kept
+    assert fitted["repos"] == payload["repos"][:fitted["count"]]
+    assert payload["count"] == 20 and len(payload["repos"]) == 20
+
+
+def test_existing_total_is_not_overwritten(monkeypatch):
+    monkeypatch.setitem(output_budget._TOOL_LIMITS, "tool", 400)
+    payload = {"status": "success", "count": 20, "total": 250, "repos": _repos(20)}
+
+    fitted = fit_to_budget("tool", payload, list_key="repos")
+
+    assert fitted["total"] == 250
+    assert fitted["count"] == len(fitted["repos"])
+
+
+def test_long_strings_are_shortened_as_last_resort(monkeypatch):
+    monkeypatch.setitem(output_budget._TOOL_LIMITS, "tool", 200)
+    fitted = fit_to_budget("tool", {"status": "success", "answer": "word " * 200})
+
+    assert _size(fitted) <= 200
+    assert fitted["truncated"] is True
+
+
+def test_snippet_prefers_sentence_then_word_boundaries():
+    assert snippet("First sentence here. Second one is longer.", 30) == "First sentence here."
+    assert snippet("alpha beta gamma delta", 13) == "alpha beta…"
+    assert snippet("  short   text ", 50) == "short text"
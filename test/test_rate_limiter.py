@@ -0,0 +1,91 @@
+import asyncio
+
+from langchain_core.messages import HumanMessage
+
+from core.rate_limiter import LLMRateLimiter, estimate_tokens
+
+
+def test_estimate_tokens_adds_reserve():
+    assert estimate_tokens([HumanMessage(content="x" * 400)], reserve=100) == 200
+
+
+def test_busy_thread_does_not_starve_others():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0, max_in_flight=1, enabled=True)
+    order = []
+
+    async def call(thread_id: str, index: int):
+        async with limiter.slot(thread_id):
+            order.append(f"{thread_id}{index}")
+            await asyncio.sleep(0)
+
+    async def main():
+        # Thread 'a' queues five calls before 'b' and 'c' queue one each
+        tasks = [asyncio.create_task(call("a", i)) for i in range(5)]
+        tasks += [asyncio.create_task(call("b", 0)), asyncio.create_task(call("c", 0))]
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    # a0 runs at once; after that the queues take turns instead of draining 'a' first
+    assert order == ["a0", "a1", "b0", "c0", "a2", "a3", "a4"]
+
+
+def test_max_in_flight_is_respected():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0, max_in_flight=2, enabled=True)
+    running = peak = 0
+
+    async def call(i: int):
+        nonlocal running, peak
+        async with limiter.slot(f"t{i}"):
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def main():
+        await asyncio.gather(*(call(i) for i in range(6)))
+
+    asyncio.run(main())
+    assert peak == 2
+    assert limiter.stats()["in_flight"] == 0
+
+
+def test_request_bucket_delays_calls_over_the_rate():
+    # 600 requests/min = one every 0.1 s once the initial burst is spent
+    limiter = LLMRateLimiter(requests_per_minute=600, tokens_per_minute=0, max_in_flight=0, enabled=True)
+    limiter._requests.level = 1
+
+    async def main():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        for _ in range(3):
+            async with limiter.slot("t"):
+                pass
+        return loop.time() - start
+
+    elapsed = asyncio.run(main())
+    assert 0.15 <= elapsed < 1.0
+    assert limiter.stats()["throttled"] == 2
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    limiter = LLMRateLimiter(requests_per_minute=0, tokens_per_minute=0, max_in_flight=1, enabled=True)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def holder():
+            async with limiter.slot("a"):
+                await release.wait()
+
+        held = asyncio.create_task(holder())
+        await asyncio.sleep(0)
+        waiting = asyncio.create_task(limiter.slot("b").__aenter__())
+        await asyncio.sleep(0)
+        assert limiter.queued == 1
+        waiting.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await held
+        return limiter.queued
+
+    assert asyncio.run(main()) == 0
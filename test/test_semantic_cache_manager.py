@@ -0,0 +1,119 @@
+import asyncio
+
+import numpy as np
+
+from core.semantic_cache_manager import SemanticCacheManager, entities
+
+
+class _TopicEmbedding:
+    """Embeds only the lower-case words, so 'weather in London' == 'weather in Paris'."""
+
+    vocabulary = ["weather", "in", "list", "my", "repos", "today", "what", "is", "the"]
+
+    def embed(self, texts):
+        for text in texts:
+            words = [w.strip("?.,!").lower() for w in text.split() if not w[:1].isupper()]
+            yield np.array([float(words.count(v)) for v in self.vocabulary] + [0.1], dtype=np.float32)
+
+
+def _cache(tmp_path, **overrides) -> SemanticCacheManager:
+    cache = SemanticCacheManager(enabled=True, db_folder=str(tmp_path))
+    cache._model = _TopicEmbedding()
+    for name, value in overrides.items():
+        setattr(cache, name, value)
+    asyncio.run(cache.initialize())
+    return cache
+
+
+def test_tool_free_answer_is_stored_and_served(tmp_path):
+    cache = _cache(tmp_path)
+
+    async def main():
+        await cache.store("list my repos", "You have 3 repos.")
+        return await cache.lookup("list my repos")
+
+    hit = asyncio.run(main())
+    assert hit["answer"] == "You have 3 repos."
+    cache.close()
+
+
+def test_turns_with_live_tools_are_not_stored(tmp_path):
+    cache = _cache(tmp_path)
+
+    async def main():
+        await cache.store("weather in London", "12°C and rain", tools_called=["get_weather"])
+        await cache.store("weather in London", "12°C and rain", tools_called=["search_web_tavily"])
+
+    asyncio.run(main())
+    assert cache.stats()["entries"] == 0
+    cache.close()
+
+
+def test_allowlisted_tools_are_stored(tmp_path):
+    cache = _cache(tmp_path, cacheable_tools=frozenset({"list_repositories"}))
+
+    asyncio.run(cache.store("list my repos", "3 repos", tools_called=["list_repositories"]))
+    assert cache.stats()["entries"] == 1
+    assert not cache.is_cacheable(["list_repositories", "get_weather"])
+    cache.close()
+
+
+def test_close_match_with_different_entity_is_a_miss(tmp_path):
+    cache = _cache(tmp_path)
+
+    async def main():
+        await cache.store("weather in London", "12°C")
+        return await cache.lookup("weather in Paris"), await cache.lookup("weather in London")
+
+    miss, hit = asyncio.run(main())
+    assert miss is None
+    assert hit["answer"] == "12°C"
+    assert cache.stats()["entity_mismatches"] == 1
+    cache.close()
+
+
+def test_entities_ignore_sentence_initial_capitals():
+    assert entities("What is the weather in London?") == {"london"}
+    assert entities("Top 5 repos. Show Mrityunjoy05/demo") == {"5", "mrityunjoy05/demo"}
+    assert entities("list my repos") == frozenset()
+
+
+def test_false_hit_reported_through_the_api_evicts_the_entry(tmp_path):
+    from starlette.testclient import TestClient
+
+    from api.app import create_app
+    from core.agent_manager import Agent_Manager
+
+    cache = _cache(tmp_path)
+
+    class _Manager:
+        semantic_cache = cache
+        report_semantic_false_hit = Agent_Manager.report_semantic_false_hit
+
+        def __init__(self):
+            self._semantic_hits = {}
+
+        async def initialize(self):
+            pass
+
+        async def close(self):
+            pass
+
+    async def serve():
+        await cache.store("list my repos", "You have 3 repos.")
+        return await cache.lookup("list my repos")
+
+    hit = asyncio.run(serve())
+    manager = _Manager()
+    manager._semantic_hits["t1"] = hit["id"]
+
+    with TestClient(create_app(manager)) as client:
+        reported = client.post("/threads/t1/semantic-false-hit")
+        again = client.post("/threads/t1/semantic-false-hit")
+
+    assert reported.status_code == 200
+    assert again.status_code == 404
+    stats = cache.stats()
+    assert (stats["false_hits"], stats["entries"]) == (1, 0)
+    assert asyncio.run(cache.lookup("list my repos")) is None
+    cache.close()
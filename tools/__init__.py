@@ -1,7 +1,21 @@
-from tools.search_tool import search_web_tavily 
-from tools.weather import get_weather
+import importlib
+
+# Resolved on first access: the MCP servers import single tool modules and
+# must not pay for the others (and their HTTP clients) on every spawn.
+_EXPORTS = {
+    "search_web_tavily": "tools.search_tool",
+    "get_weather": "tools.weather",
+}
 
 __all__= [
     "search_web_tavily",
     "get_weather"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(_EXPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module 'tools' has no attribute {name!r}")
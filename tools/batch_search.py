@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any, Dict, List
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from config.settings import settings
+from tools.search_tool import get_search_results, compact_result
+from tools.output_budget import budget_json
+
+
+def _normalize_url(url: str) -> str:
+    """Collapses trivially different URLs (case, trailing slash, fragment, utm_* params)."""
+    parts = urlsplit(url.strip())
+    query = urlencode([
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith("utm_")
+    ])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+async def search_web_batch(queries: List[str], max_results: int = 10) -> str:
+    """
+    Searches the web for several queries at once using Tavily and returns one merged,
+    de-duplicated and ranked result list as JSON (per-query 'answers', ranked 'results'
+    with the queries each page 'matched'). Use this instead of calling search_web_tavily
+    several times when you need information on multiple topics.
+    Args:
+        queries: List of search strings (e.g. ['LangGraph release notes', 'MCP protocol spec']).
+        max_results: Max number of merged results to return (default 10).
+    """
+    unique_queries = list(dict.fromkeys(q.strip() for q in queries if q and q.strip()))
+    if not unique_queries:
+        return budget_json("search_web_batch", {"status": "error", "message": "No queries given."})
+    unique_queries = unique_queries[:settings.SEARCH_BATCH_MAX_QUERIES]
+
+    semaphore = asyncio.Semaphore(settings.SEARCH_BATCH_CONCURRENCY)
+
+    async def run(query: str):
+        async with semaphore:
+            return await get_search_results(query)
+
+    outcomes = await asyncio.gather(*(run(q) for q in unique_queries), return_exceptions=True)
+
+    answers = {}
+    errors = []
+    merged: Dict[str, Dict[str, Any]] = {}
+    for query, results in zip(unique_queries, outcomes):
+        if isinstance(results, Exception):
+            errors.append(f"{query}: {results}")
+            continue
+        if isinstance(results, dict) and results.get("answer"):
+            answers[query] = results["answer"]
+
+        res_list = results.get("results") if isinstance(results, dict) else results
+        for rank, result in enumerate(res_list or []):
+            url = result.get("url", "")
+            if not url:
+                continue
+            # Tavily relevance score when present, otherwise fall back to the result position
+            score = result.get("score")
+            if score is None:
+                score = 1 / (rank + 1)
+
+            key = _normalize_url(url)
+            entry = merged.get(key)
+            if entry is None:
+                merged[key] = {"result": result, "score": score, "queries": [query]}
+            else:
+                entry["queries"].append(query)
+                if score > entry["score"]:
+                    entry.update(result=result, score=score)
+
+    # A page that answers several of the queries ranks above an equally scored single hit
+    ranked = sorted(
+        merged.values(),
+        key=lambda e: e["score"] + 0.1 * (len(e["queries"]) - 1),
+        reverse=True
+    )[:max_results]
+
+    payload = {"status": "success", "queries": unique_queries}
+    if answers:
+        payload["answers"] = answers
+    payload["results"] = [
+        {**compact_result(entry["result"]), "matched": entry["queries"]}
+        for entry in ranked
+    ]
+    if errors:
+        payload["errors"] = errors
+
+    return budget_json("search_web_batch", payload, list_key="results")
@@ -0,0 +1,84 @@
+import asyncio
+from typing import List, Union
+
+import httpx
+from config.settings import settings
+from tools.weather import _normalize_city, get_weather_data, get_weather_by_ids
+from tools.output_budget import budget_json
+
+TABLE_COLUMNS = ["city", "country", "temperature", "conditions", "humidity"]
+
+
+async def get_weather_batch(cities: List[Union[str, int]]) -> str:
+    """
+    Fetches the current weather for several cities at once and returns a compact JSON table
+    ('columns' + one row per city).
+    Use this instead of calling get_weather once per city, e.g. to compare cities.
+
+    Args:
+        cities: City names (e.g. ['London', 'Paris', 'Tokyo']) and/or
+                numeric OpenWeather city ids (e.g. [2643743]).
+    """
+    # Each input becomes a lookup key; spellings of the same city ('new york' and
+    # 'New York ') and repeated ids share one key so they are fetched once
+    requested = []
+    for city in cities:
+        text = str(city).strip()
+        if text.isdigit():
+            requested.append((text, int(text)))
+        elif _normalize_city(text):
+            requested.append((text, _normalize_city(text)))
+
+    if not requested:
+        return budget_json("get_weather_batch", {"status": "error", "message": "No cities given."})
+
+    keys = list(dict.fromkeys(key for _, key in requested))
+    names = [key for key in keys if isinstance(key, str)]
+    ids = [key for key in keys if isinstance(key, int)]
+
+    semaphore = asyncio.Semaphore(settings.WEATHER_BATCH_CONCURRENCY)
+
+    async def run(name: str):
+        async with semaphore:
+            return await get_weather_data(name)
+
+    # Known ids go through OpenWeather's group endpoint; names are fetched concurrently
+    id_task = get_weather_by_ids(ids) if ids else None
+    outcomes = await asyncio.gather(
+        *(run(name) for name in names),
+        *([id_task] if id_task else []),
+        return_exceptions=True
+    )
+
+    results = dict(zip(names, outcomes))
+    if id_task:
+        by_id = outcomes[-1]
+        for city_id in ids:
+            if isinstance(by_id, Exception):
+                results[city_id] = by_id
+            else:
+                results[city_id] = by_id.get(city_id, LookupError("not found"))
+
+    # Map the shared results back onto every requested city, in request order
+    rows = []
+    errors = []
+    for text, key in requested:
+        outcome = results[key]
+        label = f"id {text}" if isinstance(key, int) else text
+        if isinstance(outcome, httpx.HTTPStatusError):
+            errors.append(f"{label}: Weather API error {outcome.response.status_code}")
+        elif isinstance(outcome, Exception):
+            errors.append(f"{label}: {outcome}")
+        else:
+            rows.append(outcome)
+
+    # Column names once + one positional row per city keeps the JSON compact
+    payload = {
+        "status": "success",
+        "columns": TABLE_COLUMNS,
+        "rows": [[row[col] for col in TABLE_COLUMNS] for row in rows]
+    }
+    if errors:
+        payload["errors"] = errors
+
+    return budget_json("get_weather_batch", payload, list_key="rows")
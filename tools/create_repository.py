@@ -1,5 +1,6 @@
 from client.github_manager import GithubObj 
 from github import GithubException
+from core.repository_index_manager import RepoIndex
 
 
 
@@ -30,6 +31,7 @@ async def create_repository(
             private=private,
             auto_init=auto_init
         )
+        RepoIndex.request_refresh()
         return {
             "status": "success",
             "name": repo.full_name,
@@ -1,5 +1,10 @@
+import logging
+
 from client.github_manager import GithubObj 
 from github import GithubException
+from core.repository_index_manager import RepoIndex
+
+logger = logging.getLogger(__name__)
 
 
 
@@ -27,10 +32,18 @@ async def delete_repository(
 
         full_name = repo.full_name
         repo.delete()
-        return {
-            "status": "success",
-            "deleted": full_name,
-            "message": "Repository permanently deleted"
-        }
     except GithubException as e:
-        return {"status": "error", "message": str(e)}
\ No newline at end of file
+        return {"status": "error", "message": str(e)}
+
+    # The repository is gone at this point: a stale index entry must not turn
+    # the result into a failure (the next full refresh prunes it anyway)
+    try:
+        await RepoIndex.remove(full_name)
+    except Exception as e:
+        logger.warning("Could not remove %s from the repository index: %s", full_name, e)
+
+    return {
+        "status": "success",
+        "deleted": full_name,
+        "message": "Repository permanently deleted"
+    }
\ No newline at end of file
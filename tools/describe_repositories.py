@@ -0,0 +1,69 @@
+from client.github_manager import GithubObj, GitHubGraphQLError
+from tools.github_graphql import resolve_fields, build_selection, split_repo_name, normalize_repository
+from typing import List, Optional
+import httpx
+from tools.output_budget import fit_to_budget
+
+
+async def describe_repositories(
+    repo_names: List[str],
+    fields: Optional[List[str]] = None
+) -> dict:
+    """
+    Describe many GitHub repositories at once using a single GraphQL query.
+
+    Args:
+        repo_names: List of repos as 'username/repo-name'
+                    OR just 'repo-name' (assumes authenticated user's repo)
+        fields: Fields to return for each repo (default: name, description, language,
+                stars, forks, private, url, updated_at). Also available: languages,
+                archived, fork, topics, open_issues, open_pull_requests,
+                default_branch, license, created_at, pushed_at
+
+    Returns:
+        Dict with status, count, list of repo details and the names that were not found
+    """
+    try:
+        if not repo_names:
+            return {"status": "error", "message": "repo_names must not be empty"}
+
+        selected = resolve_fields(fields)
+        selection = build_selection(selected)
+
+        # Bare repo names need the login of the authenticated user
+        default_owner = ""
+        if any("/" not in name for name in repo_names):
+            viewer = await GithubObj.graphql_query("query { viewer { login } }")
+            default_owner = viewer["viewer"]["login"]
+
+        # One aliased 'repository' field per repo -> one round-trip for all of them
+        targets = [split_repo_name(name, default_owner) for name in repo_names]
+        variable_defs = []
+        blocks = []
+        variables = {}
+        for i, (owner, name) in enumerate(targets):
+            variable_defs.append(f"$o{i}: String!, $n{i}: String!")
+            blocks.append(f"r{i}: repository(owner: $o{i}, name: $n{i}) {{ {selection} }}")
+            variables[f"o{i}"] = owner
+            variables[f"n{i}"] = name
+
+        query = f"query({', '.join(variable_defs)}) {{ {' '.join(blocks)} }}"
+        data = await GithubObj.graphql_query(query, variables, allow_partial=True)
+
+        repos = []
+        not_found = []
+        for i, (owner, name) in enumerate(targets):
+            node = data.get(f"r{i}")
+            if node is None:
+                not_found.append(f"{owner}/{name}")
+            else:
+                repos.append(normalize_repository(node, selected))
+
+        return fit_to_budget("describe_repositories", {
+            "status": "success",
+            "count": len(repos),
+            "repos": repos,
+            "not_found": not_found
+        }, list_key="repos")
+    except (GitHubGraphQLError, httpx.HTTPError, ValueError) as e:
+        return {"status": "error", "message": str(e)}
@@ -0,0 +1,102 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+# Friendly field name -> GraphQL selection on the Repository type.
+# Only the fields the caller asks for are put into the query.
+REPOSITORY_FIELDS: Dict[str, str] = {
+    "name": "nameWithOwner",
+    "description": "description",
+    "language": "primaryLanguage { name }",
+    "languages": "languages(first: 5, orderBy: {field: SIZE, direction: DESC}) { nodes { name } }",
+    "stars": "stargazerCount",
+    "forks": "forkCount",
+    "private": "isPrivate",
+    "archived": "isArchived",
+    "fork": "isFork",
+    "url": "url",
+    "topics": "repositoryTopics(first: 10) { nodes { topic { name } } }",
+    "open_issues": "issues(states: OPEN) { totalCount }",
+    "open_pull_requests": "pullRequests(states: OPEN) { totalCount }",
+    "default_branch": "defaultBranchRef { name }",
+    "license": "licenseInfo { spdxId }",
+    "created_at": "createdAt",
+    "updated_at": "updatedAt",
+    "pushed_at": "pushedAt",
+}
+
+DEFAULT_FIELDS: List[str] = [
+    "name", "description", "language", "stars", "forks", "private", "url", "updated_at"
+]
+
+# GitHub caps connection pages at 100 nodes.
+MAX_PAGE_SIZE = 100
+
+
+def resolve_fields(fields: Optional[List[str]]) -> List[str]:
+    """Validates requested field names, always keeping 'name' so results stay identifiable."""
+    if not fields:
+        return list(DEFAULT_FIELDS)
+
+    unknown = [f for f in fields if f not in REPOSITORY_FIELDS]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. "
+            f"Available: {', '.join(REPOSITORY_FIELDS)}"
+        )
+
+    resolved = ["name"] + [f for f in fields if f != "name"]
+    return list(dict.fromkeys(resolved))
+
+
+def build_selection(fields: List[str]) -> str:
+    return " ".join(REPOSITORY_FIELDS[f] for f in fields)
+
+
+def split_repo_name(repo_name: str, default_owner: str) -> Tuple[str, str]:
+    """'owner/repo' -> (owner, repo); bare 'repo' falls back to default_owner."""
+    if "/" in repo_name:
+        owner, name = repo_name.split("/", 1)
+        return owner.strip(), name.strip()
+    return default_owner, repo_name.strip()
+
+
+def normalize_repository(node: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    """Flattens a GraphQL Repository node into the same shape the REST tools return."""
+    result: Dict[str, Any] = {}
+    for field in fields:
+        if field == "name":
+            result["name"] = node.get("nameWithOwner")
+        elif field == "description":
+            result["description"] = node.get("description") or ""
+        elif field == "language":
+            result["language"] = (node.get("primaryLanguage") or {}).get("name") or ""
+        elif field == "languages":
+            result["languages"] = [n["name"] for n in (node.get("languages") or {}).get("nodes", [])]
+        elif field == "stars":
+            result["stars"] = node.get("stargazerCount", 0)
+        elif field == "forks":
+            result["forks"] = node.get("forkCount", 0)
+        elif field == "private":
+            result["private"] = node.get("isPrivate", False)
+        elif field == "archived":
+            result["archived"] = node.get("isArchived", False)
+        elif field == "fork":
+            result["fork"] = node.get("isFork", False)
+        elif field == "url":
+            result["url"] = node.get("url") or ""
+        elif field == "topics":
+            result["topics"] = [
+                n["topic"]["name"] for n in (node.get("repositoryTopics") or {}).get("nodes", [])
+            ]
+        elif field == "open_issues":
+            result["open_issues"] = (node.get("issues") or {}).get("totalCount", 0)
+        elif field == "open_pull_requests":
+            result["open_pull_requests"] = (node.get("pullRequests") or {}).get("totalCount", 0)
+        elif field == "default_branch":
+            result["default_branch"] = (node.get("defaultBranchRef") or {}).get("name") or ""
+        elif field == "license":
+            # Unlicensed repos have no licenseInfo (or a null spdxId): "" like the other strings
+            result["license"] = (node.get("licenseInfo") or {}).get("spdxId") or ""
+        elif field in ("created_at", "updated_at", "pushed_at"):
+            camel = {"created_at": "createdAt", "updated_at": "updatedAt", "pushed_at": "pushedAt"}[field]
+            result[field] = node.get(camel) or ""
+    return result
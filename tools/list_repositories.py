@@ -1,6 +1,7 @@
 from client.github_manager import GithubObj 
 from github import GithubException
 from typing import Optional
+from tools.output_budget import fit_to_budget
 
 
 async def list_repositories(
@@ -44,10 +45,10 @@ async def list_repositories(
                 "created_at": str(repo.created_at.date())
             })
 
-        return {
+        return fit_to_budget("list_repositories", {
             "status": "success",
             "count": len(repo_list),
             "repos": repo_list
-        }
+        }, list_key="repos")
     except GithubException as e:
         return {"status": "error", "message": str(e)}
\ No newline at end of file
@@ -0,0 +1,101 @@
+import json
+import re
+from typing import Any, Dict, Optional
+
+from config.settings import settings
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def _parse_limits(raw: str) -> Dict[str, int]:
+    """'search_web_tavily=3000, get_weather=400' -> {'search_web_tavily': 3000, 'get_weather': 400}"""
+    limits = {}
+    for item in raw.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            limits[name.strip()] = int(value)
+    return limits
+
+
+_TOOL_LIMITS = _parse_limits(settings.TOOL_OUTPUT_LIMITS)
+
+
+def limit_for(tool_name: str) -> int:
+    """Character budget for one tool's output (per-tool override or the global default)."""
+    return _TOOL_LIMITS.get(tool_name, settings.TOOL_OUTPUT_MAX_CHARS)
+
+
+def snippet(text: Optional[str], max_chars: Optional[int] = None) -> str:
+    """
+    Collapses whitespace and shortens text to at most max_chars, preferring to cut at
+    the end of a sentence, then at a word boundary.
+    """
+    max_chars = max_chars or settings.SEARCH_SNIPPET_CHARS
+    text = re.sub(r"\s+", " ", text or "").strip()
+    if len(text) <= max_chars:
+        return text
+
+    cut = text[:max_chars]
+    sentence_ends = [m.start() for m in _SENTENCE_END.finditer(cut + " ")]
+    if sentence_ends and sentence_ends[-1] >= max_chars // 2:
+        return cut[:sentence_ends[-1]]
+
+    word_cut = cut.rsplit(" ", 1)[0] if " " in cut else cut
+    return word_cut[:max_chars - 1] + "…"
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+def fit_to_budget(tool_name: str, payload: Dict[str, Any], list_key: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Trims a structured tool result so its JSON form fits the tool's character budget.
+
+    Items are dropped from the end of payload[list_key] (results are expected to be
+    ranked) and the payload gets 'truncated' / 'omitted' metadata so the model knows
+    more data exists and can ask for it explicitly. A 'count' field is updated to
+    the number of items actually returned, with the original number kept in
+    'total' (unless the payload already has its own 'total').
+    """
+    budget = limit_for(tool_name)
+    if len(_dumps(payload)) <= budget:
+        return payload
+
+    original = payload
+    items = list(original.get(list_key) or []) if list_key else []
+
+    def trimmed(kept: list, omitted: int) -> Dict[str, Any]:
+        result = dict(original)
+        if list_key and list_key in original:
+            result[list_key] = kept
+            if "count" in original:
+                result.setdefault("total", original["count"])
+                result["count"] = len(kept)
+        result["truncated"] = True
+        result["omitted"] = omitted
+        return result
+
+    omitted = 0
+    while items and len(_dumps(trimmed(items, omitted))) > budget:
+        items.pop()
+        omitted += 1
+    payload = trimmed(items, omitted)
+
+    # Last resort: shorten the longest string values until it fits
+    while len(_dumps(payload)) > budget:
+        longest_key = max(
+            (k for k, v in payload.items() if isinstance(v, str)),
+            key=lambda k: len(payload[k]),
+            default=None
+        )
+        if longest_key is None or len(payload[longest_key]) <= 20:
+            break
+        payload[longest_key] = snippet(payload[longest_key], len(payload[longest_key]) // 2)
+
+    return payload
+
+
+def budget_json(tool_name: str, payload: Dict[str, Any], list_key: Optional[str] = None) -> str:
+    """fit_to_budget + compact JSON serialisation for tools that return text."""
+    return _dumps(fit_to_budget(tool_name, payload, list_key))
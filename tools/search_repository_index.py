@@ -0,0 +1,62 @@
+from core.repository_index_manager import RepoIndex
+from client.github_manager import GitHubGraphQLError
+from typing import Optional
+import httpx
+from tools.output_budget import fit_to_budget
+
+
+async def search_repository_index(
+    query: Optional[str] = None,
+    language: Optional[str] = None,
+    min_stars: Optional[int] = None,
+    max_stars: Optional[int] = None,
+    topic: Optional[str] = None,
+    private: Optional[bool] = None,
+    include_archived: bool = True,
+    include_forks: bool = True,
+    sort_by: str = 'stars',
+    descending: bool = True,
+    limit: int = 20
+) -> dict:
+    """
+    Filter, sort and search the authenticated user's repositories from a local index.
+    Use this for questions like "which of my repos use Python and have more than 10 stars"
+    instead of listing every repository.
+
+    Args:
+        query: Text to match in repo name, description or topics
+        language: Programming language (e.g. 'Python')
+        min_stars: Minimum star count
+        max_stars: Maximum star count
+        topic: GitHub topic the repo must have
+        private: True = only private, False = only public, None = both
+        include_archived: Include archived repos
+        include_forks: Include forked repos
+        sort_by: 'stars', 'forks', 'name', 'updated_at', 'created_at', 'pushed_at'
+        descending: Sort order
+        limit: Max number of repos to return (default 20)
+
+    Returns:
+        Dict with status, count, total matches, index freshness and list of repos
+    """
+    try:
+        result = await RepoIndex.search(
+            query=query,
+            language=language,
+            min_stars=min_stars,
+            max_stars=max_stars,
+            topic=topic,
+            private=private,
+            include_archived=include_archived,
+            include_forks=include_forks,
+            sort_by=sort_by,
+            descending=descending,
+            limit=limit
+        )
+        return fit_to_budget("search_repository_index", {
+            "status": "success",
+            "count": len(result["repos"]),
+            **result
+        }, list_key="repos")
+    except (GitHubGraphQLError, httpx.HTTPError, ValueError) as e:
+        return {"status": "error", "message": str(e)}
@@ -1,45 +1,72 @@
-from langchain_tavily import TavilySearch
-import os
+import re
 from config.settings import settings
+from client.tavily_manager import TavilyObj
+from core.cache_manager import TTLCache
+from tools.output_budget import budget_json, snippet
+
+# Identical queries within the TTL are served from memory, or from the SQLite tier
+# (SEARCH_CACHE_NAME) that survives server restarts and is shared by every worker;
+# concurrent ones share a single Tavily request.
+_search_cache = TTLCache(
+    name="search_web_tavily",
+    ttl=settings.SEARCH_CACHE_TTL,
+    max_size=settings.SEARCH_CACHE_MAX_SIZE,
+    persist_name=settings.SEARCH_CACHE_NAME or None
+)
+
+
+def _normalize_query(query: str) -> str:
+    """'  What is  LangGraph? ' and 'what is langgraph' map to the same cache key."""
+    normalized = re.sub(r"\s+", " ", query).strip().lower()
+    return normalized.rstrip("?!. ")
+
+
+async def _fetch_results(query: str):
+    # Reuses the server-lifetime pooled client (see TavilyClientManager)
+    return await TavilyObj.search(query, max_results=settings.K_SEARCH, topic="general")
+
+
+async def get_search_results(query: str):
+    """Raw Tavily results for a query, served from the cache when possible."""
+    cache_key = f"{settings.K_SEARCH}:general:{_normalize_query(query)}"
+    return await _search_cache.get_or_set(cache_key, lambda: _fetch_results(query))
+
+
+def compact_result(result: dict) -> dict:
+    """Title, url, snippet and score of one Tavily hit; full page content is never returned."""
+    compact = {
+        "title": result.get("title", "No title"),
+        "url": result.get("url", ""),
+        "snippet": snippet(result.get("content")),
+    }
+    if result.get("score") is not None:
+        compact["score"] = round(result["score"], 3)
+    return compact
+
 
 async def search_web_tavily(query: str) -> str:
     """
     Searches the web using Tavily. Use this for real-time information.
+    Returns JSON with an optional 'answer' summary and ranked 'results' (title, url, snippet).
     Args:
         query: The search string.
     """
-    # Industry Practice: Set API keys via settings, but ensure environment is ready
-    os.environ["TAVILY_API_KEY"] = settings.TAVILY_API_KEY
-    
     try:
-        search = TavilySearch(
-            max_results=settings.K_SEARCH, # Use your settings variable
-            topic="general"
-        )
-        results = await search.ainvoke(query)
-    
-        if not results:
-            return "No search results found."
-        
-        formatted_parts = []
-        
-        # Add answer if available (Tavily AI summary)
-        if isinstance(results, dict) and results.get("answer"):
-            formatted_parts.append(f"Summary: {results['answer']}")
-        
-        # Add individual results
+        results = await get_search_results(query)
+
         # LangChain's TavilySearch usually returns a list or a dict with a 'results' key
         res_list = results.get("results") if isinstance(results, dict) else results
-        
-        if res_list and isinstance(res_list, list):
-            for i, result in enumerate(res_list[:5], 1):
-                title = result.get("title", "No title")
-                content = result.get("content", "No content")
-                url = result.get("url", "")
-                formatted_parts.append(f"[{i}] {title}\n{content}\nSource: {url}")
-        
-        return "\n\n".join(formatted_parts) if formatted_parts else "No results found."
-        
+
+        payload = {"status": "success", "query": query}
+
+        # Add answer if available (Tavily AI summary)
+        if isinstance(results, dict) and results.get("answer"):
+            payload["answer"] = results["answer"]
+
+        payload["results"] = [compact_result(r) for r in (res_list or [])[:5]]
+
+        return budget_json("search_web_tavily", payload, list_key="results")
+
     except Exception as e:
 
-        return f"Error searching Tavily: {str(e)}"
\ No newline at end of file
+        return budget_json("search_web_tavily", {"status": "error", "message": f"Error searching Tavily: {str(e)}"})
@@ -0,0 +1,94 @@
+from client.github_manager import GithubObj, GitHubGraphQLError
+from tools.github_graphql import resolve_fields, build_selection, normalize_repository, MAX_PAGE_SIZE
+from typing import List, Optional
+import httpx
+from tools.output_budget import fit_to_budget
+
+# GraphQL 'affiliations' values for the REST-style repo_type argument
+REPO_TYPE_AFFILIATIONS = {
+    "owner": "[OWNER]",
+    "member": "[ORGANIZATION_MEMBER, COLLABORATOR]",
+    "all": "[OWNER, ORGANIZATION_MEMBER, COLLABORATOR]",
+    "public": "[OWNER]",
+    "private": "[OWNER]",
+}
+
+
+async def summarize_repositories(
+    username: Optional[str] = None,
+    repo_type: str = 'owner',
+    limit: int = 50,
+    fields: Optional[List[str]] = None
+) -> dict:
+    """
+    Summarize many repositories of a user with their languages, stars etc. (GraphQL bulk interface).
+    Prefer this over list_repositories when you need details for lots of repos.
+
+    Args:
+        username: GitHub username (None = authenticated user)
+        repo_type: 'owner', 'all', 'member', 'public', 'private'
+        limit: Max number of repos to return (default 50)
+        fields: Fields to return for each repo (default: name, description, language,
+                stars, forks, private, url, updated_at). Also available: languages,
+                archived, fork, topics, open_issues, open_pull_requests,
+                default_branch, license, created_at, pushed_at
+
+    Returns:
+        Dict with status, count, total available and list of repo summaries
+    """
+    try:
+        if repo_type not in REPO_TYPE_AFFILIATIONS:
+            return {"status": "error", "message": f"Unknown repo_type '{repo_type}'"}
+
+        selected = resolve_fields(fields)
+        selection = build_selection(selected)
+
+        privacy = ""
+        if repo_type in ("public", "private"):
+            privacy = f", privacy: {repo_type.upper()}"
+
+        if username:
+            owner = "user(login: $login)"
+            arguments = f"ownerAffiliations: {REPO_TYPE_AFFILIATIONS[repo_type]}{privacy}"
+        else:
+            owner = "viewer"
+            affiliations = REPO_TYPE_AFFILIATIONS[repo_type]
+            arguments = f"affiliations: {affiliations}, ownerAffiliations: {affiliations}{privacy}"
+
+        query = (
+            f"query($first: Int!, $after: String{', $login: String!' if username else ''}) {{ "
+            f"{owner} {{ repositories(first: $first, after: $after, {arguments}, "
+            f"orderBy: {{field: UPDATED_AT, direction: DESC}}) {{ "
+            f"totalCount pageInfo {{ hasNextPage endCursor }} nodes {{ {selection} }} }} }} }}"
+        )
+
+        repos = []
+        total = 0
+        cursor = None
+        # One round-trip per 100 repos instead of one per REST page + per-repo lookups
+        while len(repos) < limit:
+            variables = {"first": min(MAX_PAGE_SIZE, limit - len(repos)), "after": cursor}
+            if username:
+                variables["login"] = username
+
+            data = await GithubObj.graphql_query(query, variables)
+            owner_data = data.get("user" if username else "viewer")
+            if owner_data is None:
+                return {"status": "error", "message": f"User '{username}' not found"}
+
+            connection = owner_data["repositories"]
+            total = connection["totalCount"]
+            repos.extend(normalize_repository(node, selected) for node in connection["nodes"])
+
+            if not connection["pageInfo"]["hasNextPage"]:
+                break
+            cursor = connection["pageInfo"]["endCursor"]
+
+        return fit_to_budget("summarize_repositories", {
+            "status": "success",
+            "count": len(repos),
+            "total": total,
+            "repos": repos
+        }, list_key="repos")
+    except (GitHubGraphQLError, httpx.HTTPError, ValueError) as e:
+        return {"status": "error", "message": str(e)}
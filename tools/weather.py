@@ -1,49 +1,98 @@
-
 import sys
 from pathlib import Path
 
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
-import httpx 
+import re
+import httpx
+from typing import Dict, List
 from config.settings import settings
+from client.weather_manager import WeatherObj
+from core.cache_manager import TTLCache
+from tools.output_budget import budget_json
+
+# OpenWeather's /group endpoint accepts at most 20 city ids per request
+GROUP_MAX_IDS = 20
+
+# Weather changes on a ~10 minute scale, so repeated lookups for a city within the
+# TTL are served from memory (or the WEATHER_CACHE_NAME SQLite tier, shared across
+# restarts and workers) and concurrent ones share a single API request.
+_weather_cache = TTLCache(
+    name="get_weather",
+    ttl=settings.WEATHER_CACHE_TTL,
+    max_size=settings.WEATHER_CACHE_MAX_SIZE,
+    persist_name=settings.WEATHER_CACHE_NAME or None
+)
+
+
+def _normalize_city(city: str) -> str:
+    """' new  york , US ' and 'New York,us' map to the same cache key."""
+    parts = [re.sub(r"\s+", " ", part).strip() for part in city.split(",")]
+    return ",".join(part for part in parts if part).casefold()
+
+
+def _summarize(data: dict) -> dict:
+    return {
+        'city': data['name'],
+        'country': data['sys']['country'],
+        'temperature': f"{data['main']['temp']}°C",
+        'conditions': data['weather'][0]['description'],
+        'humidity': f"{data['main']['humidity']}%"
+    }
+
+
+async def _fetch_weather(city: str) -> dict:
+    # Uses the server-lifetime pooled client (see WeatherClientManager)
+    data = await WeatherObj.get("/weather", params={'q': city})
+    return _summarize(data)
+
+
+async def get_weather_data(city: str) -> dict:
+    """Current weather for a city as a dict, served from the cache when possible."""
+    key = _normalize_city(city)
+    return await _weather_cache.get_or_set(key, lambda: _fetch_weather(key))
+
+
+async def get_weather_by_ids(city_ids: List[int]) -> Dict[int, dict]:
+    """
+    Current weather for OpenWeather city ids. Cached ids are served from the cache and
+    the rest are fetched through the group endpoint (up to 20 ids per request).
+    """
+    found: Dict[int, dict] = {}
+    missing = []
+    for city_id in dict.fromkeys(city_ids):
+        cached = _weather_cache.get(f"id:{city_id}")
+        if cached is not None:
+            found[city_id] = cached
+        else:
+            missing.append(city_id)
+
+    for start in range(0, len(missing), GROUP_MAX_IDS):
+        chunk = missing[start:start + GROUP_MAX_IDS]
+        data = await WeatherObj.get("/group", params={'id': ",".join(str(i) for i in chunk)})
+        for item in data.get("list", []):
+            summary = _summarize(item)
+            _weather_cache.set(f"id:{item['id']}", summary)
+            found[item["id"]] = summary
+
+    return found
+
 
 async def get_weather(city: str) -> str:
     """
     Fetches the current weather for a given city.
-    
+    Returns JSON with city, country, temperature, conditions and humidity.
+
     Args:
         city: The name of the city (e.g., 'London', 'Tokyo').
     """
-    api_key = settings.OPENWEATHER_API_KEY
-    base_url = "https://api.openweathermap.org/data/2.5/weather"
-    
-    # Using an AsyncClient is the standard way to handle async HTTP calls
-    async with httpx.AsyncClient() as client:
-        try:
-            params = {
-                'q': city,
-                'appid': api_key,
-                'units': 'metric'
-            }
-            
-            # Use 'await' so the event loop can do other work while waiting
-            response = await client.get(base_url, params=params, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Returning a clean string for the LLM to read
-            return str({
-                'city': data['name'],
-                'country': data['sys']['country'],
-                'temperature': f"{data['main']['temp']}°C",
-                'conditions': data['weather'][0]['description'],
-                'humidity': f"{data['main']['humidity']}%"
-            })
-            
-        except httpx.HTTPStatusError as e:
-            return f"Weather API error: {e.response.status_code} - {e.response.text}"
-        except Exception as e:
-            return f"Unexpected Error: {str(e)}"
-
+    try:
+        # Returning compact JSON for the LLM to read
+        return budget_json("get_weather", {"status": "success", **await get_weather_data(city)})
 
+    except httpx.HTTPStatusError as e:
+        message = f"Weather API error: {e.response.status_code} - {e.response.text}"
+    except Exception as e:
+        message = f"Unexpected Error: {str(e)}"
+    return budget_json("get_weather", {"status": "error", "message": message})